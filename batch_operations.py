@@ -0,0 +1,294 @@
+import streamlit as st
+import mysql.connector
+import pandas as pd
+import datetime
+import time
+import db
+import result_cache
+import patient_lookup
+import tables
+import validation
+
+
+# Optional settings for batch updates and deletes in .streamlit/secrets.toml:
+#   BATCH_CHUNK_SIZE         rows changed per transaction to start with (default 500)
+#   BATCH_MAX_CHUNK_SIZE     upper bound the chunk size may grow to (default 5000)
+#   BATCH_TXN_SECONDS        target duration of one transaction (default 0.5)
+def _setting(name, default):
+    return type(default)(st.secrets.get(name, default))
+
+
+# Comparison operators a filter may use
+OPERATORS = ["=", "!=", "<", "<=", ">", ">="]
+
+PREVIEW_ROWS = 50
+
+
+# Longest ID list accepted; larger changes are better expressed as a filter
+MAX_IDS = 100_000
+
+
+# Parse "1, 2, 10-20" into a sorted list of distinct IDs
+def parse_id_list(text):
+    ids = set()
+    for part in text.replace("\n", ",").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        low, _, high = part.partition("-")
+        if not low.strip().isdigit() or (high and not high.strip().isdigit()):
+            raise ValueError(f"'{part}' is not an ID or an ID range.")
+        low = int(low)
+        high = int(high) if high else low
+        if high < low:
+            raise ValueError(f"'{part}' is not a valid ID range.")
+        ids.update(range(low, min(high, low + MAX_IDS) + 1))
+        if len(ids) > MAX_IDS:
+            raise ValueError(f"At most {MAX_IDS:,} IDs can be listed; use a filter instead.")
+    if not ids:
+        raise ValueError("Please enter at least one ID.")
+    return sorted(ids)
+
+
+# Columns a filter or an update may refer to
+def filter_columns(table_name):
+    return [tables.PRIMARY_KEYS[table_name]] + tables.INSERT_COLUMNS[table_name]
+
+
+# Convert a value typed into a text box to the column's Python type
+def typed_value(column, text):
+    kind = tables.COLUMN_KINDS.get(column, "text")
+    if column in tables.PRIMARY_KEYS.values():
+        kind = "int"
+    text = text.strip()
+    if kind in ("int", "decimal"):
+        number = validation.to_number(kind, text)
+        if number is None:
+            raise ValueError(f"{column} must be a number.")
+        return number
+    if kind == "date":
+        return datetime.date.fromisoformat(text)
+    if kind == "time":
+        return datetime.time.fromisoformat(text)
+    if kind == "bool":
+        if text.lower() not in ("1", "0", "true", "false", "yes", "no"):
+            raise ValueError(f"{column} must be true or false.")
+        return text.lower() in ("1", "true", "yes")
+    return text
+
+
+# WHERE clause and parameters for a list of (column, operator, value) conditions,
+# all of which must hold. Columns and operators are checked against fixed lists,
+# values are always sent as parameters.
+def build_filter(table_name, conditions):
+    allowed = filter_columns(table_name)
+    clauses = []
+    params = []
+    for column, operator, value in conditions:
+        if column not in allowed or operator not in OPERATORS:
+            raise ValueError(f"Unsupported condition on {column}.")
+        clauses.append(f"{column} {operator} %s")
+        params.append(value)
+    if not clauses:
+        raise ValueError("Please add at least one condition.")
+    return " AND ".join(clauses), params
+
+
+def _id_filter(table_name, ids):
+    primary_key_column = tables.ROW_KEYS[table_name]
+    return f"{primary_key_column} IN ({', '.join(['%s'] * len(ids))})", list(ids)
+
+
+# Number of matching rows and the first PREVIEW_ROWS of them
+def preview(table_name, where, params):
+    primary_key_column = tables.PRIMARY_KEYS[table_name]
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE {where}", params)
+        count = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT * FROM {table_name} WHERE {where} "
+            f"ORDER BY {primary_key_column} LIMIT {PREVIEW_ROWS}",
+            params,
+        )
+        columns = [desc[0] for desc in cursor.description]
+        df = pd.DataFrame(cursor.fetchall(), columns=columns)
+    return count, df
+
+
+# Primary keys of the matching rows, read once so the change can be chunked by key
+def matching_ids(table_name, where, params):
+    primary_key_column = tables.PRIMARY_KEYS[table_name]
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        cursor.execute(
+            f"SELECT {primary_key_column} FROM {table_name} WHERE {where} "
+            f"ORDER BY {primary_key_column}",
+            params,
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+# Apply an UPDATE (assignments is a {column: value} dict) or a DELETE to the given
+# rows in chunked transactions, yielding (rows processed, rows affected) after every
+# commit. A filter (where, params) is applied again inside every chunk so rows
+# changed since the preview are left alone. The chunk size adapts so one
+# transaction, and the row locks it holds, stays close to BATCH_TXN_SECONDS.
+def run_in_chunks(table_name, ids, where=None, params=(), assignments=None):
+    chunk_size = _setting("BATCH_CHUNK_SIZE", 500)
+    max_chunk_size = _setting("BATCH_MAX_CHUNK_SIZE", 5000)
+    target_seconds = _setting("BATCH_TXN_SECONDS", 0.5)
+    if assignments:
+        set_clause = ", ".join(f"{column} = %s" for column in assignments)
+        statement = f"UPDATE {table_name} SET {set_clause} WHERE "
+        statement_params = list(assignments.values())
+    else:
+        statement = f"DELETE FROM {table_name} WHERE "
+        statement_params = []
+
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        position = 0
+        while position < len(ids):
+            chunk = ids[position : position + chunk_size]
+            id_where, id_params = _id_filter(table_name, chunk)
+            if where:
+                id_where, id_params = f"{id_where} AND ({where})", id_params + list(params)
+            start = time.perf_counter()
+            try:
+                mydb.start_transaction()
+                cursor.execute(statement + id_where, statement_params + id_params)
+                affected = cursor.rowcount
+                mydb.commit()
+            except mysql.connector.Error:
+                mydb.rollback()
+                raise
+            result_cache.bump_table_version(table_name)
+            patient_lookup.record_write(table_name, chunk, mydb)
+            elapsed = time.perf_counter() - start
+            position += len(chunk)
+            yield len(chunk), affected
+
+            if elapsed > target_seconds:
+                chunk_size = max(1, chunk_size // 2)
+            elif elapsed < target_seconds / 2:
+                chunk_size = min(max_chunk_size, chunk_size * 2)
+
+
+# BATCH UPDATE / DELETE page section ----------------------------------------------------------------
+# Selection controls; returns (mode, where, params) or None when nothing is selected yet
+def _selection(table_name, key):
+    primary_key_column = tables.PRIMARY_KEYS[table_name]
+    mode = st.radio("Select records by", ["ID list", "Filter"], horizontal=True, key=f"{key}_mode")
+    if mode == "ID list":
+        text = st.text_area(
+            f"{primary_key_column} values (comma separated, ranges like 10-20 allowed)",
+            key=f"{key}_ids",
+        )
+        if not text.strip():
+            return None
+        return (mode,) + _id_filter(table_name, parse_id_list(text))
+
+    count = int(
+        st.number_input("Conditions", min_value=1, max_value=5, value=1, key=f"{key}_count")
+    )
+    conditions = []
+    for i in range(count):
+        column_col, operator_col, value_col = st.columns([2, 1, 2])
+        column = column_col.selectbox(
+            "Column", filter_columns(table_name), key=f"{key}_column_{i}"
+        )
+        operator = operator_col.selectbox("Operator", OPERATORS, key=f"{key}_operator_{i}")
+        text = value_col.text_input("Value", key=f"{key}_value_{i}")
+        if not text.strip():
+            return None
+        conditions.append((column, operator, typed_value(column, text)))
+    return (mode,) + build_filter(table_name, conditions)
+
+
+def _run_with_progress(table_name, ids, where, params, assignments):
+    progress = st.progress(0.0, text="Working...")
+    start = time.perf_counter()
+    processed = 0
+    affected = 0
+    try:
+        for chunk_processed, chunk_affected in run_in_chunks(
+            table_name, ids, where, params, assignments
+        ):
+            processed += chunk_processed
+            affected += chunk_affected
+            rate = processed / max(time.perf_counter() - start, 1e-9)
+            progress.progress(
+                processed / len(ids),
+                text=f"{processed:,} / {len(ids):,} rows ({rate:,.0f} rows/s)",
+            )
+    except mysql.connector.Error as err:
+        st.error(f"Error after {affected:,} committed rows: {err}")
+        return
+    elapsed = time.perf_counter() - start
+    st.success(
+        f"{affected:,} rows changed in the {table_name} table in {elapsed:.1f} s "
+        f"({processed / max(elapsed, 1e-9):,.0f} rows/s)."
+    )
+
+
+def show_batch_operation(table_name, operation):
+    key = f"batch_{operation}_{table_name}"
+    st.markdown(f"### Batch {operation} records in the {table_name} table")
+    try:
+        selection = _selection(table_name, key)
+    except ValueError as err:
+        st.error(str(err))
+        return
+
+    assignments = None
+    if operation == "update":
+        column_col, value_col = st.columns(2)
+        column = column_col.selectbox(
+            "Column to set", tables.INSERT_COLUMNS[table_name], key=f"{key}_set_column"
+        )
+        text = value_col.text_input("New value", key=f"{key}_set_value")
+        if not text.strip():
+            return
+        try:
+            value = typed_value(column, text)
+        except ValueError as err:
+            st.error(str(err))
+            return
+        mode = validation.NORMALIZE.get((table_name, column))
+        if mode:
+            value = getattr(value, mode)()
+        error = validation.field_error(table_name, column, value)
+        if error:
+            st.error(error)
+            return
+        assignments = {column: value}
+
+    if selection is None:
+        return
+    mode, where, params = selection
+
+    try:
+        count, preview_df = preview(table_name, where, params)
+    except mysql.connector.Error as err:
+        st.error(f"Error: {err}")
+        return
+    st.write(f"**{count:,}** rows match; the first {min(count, PREVIEW_ROWS)} are shown.")
+    st.dataframe(preview_df)
+    if not count:
+        return
+    if operation == "delete":
+        cascades = tables.cascade_closure(table_name)[1:]
+        if cascades:
+            st.warning(
+                "Related rows in " + ", ".join(cascades) + " are deleted with them (ON DELETE CASCADE)."
+            )
+
+    confirmed = st.checkbox(f"I have reviewed the {count:,} affected rows", key=f"{key}_confirm")
+    if st.button(f"Run batch {operation}", disabled=not confirmed, key=f"{key}_run"):
+        try:
+            ids = matching_ids(table_name, where, params)
+        except mysql.connector.Error as err:
+            st.error(f"Error: {err}")
+            return
+        # An ID list needs no re-check; a filter is re-applied to every chunk
+        if mode == "ID list":
+            where, params = None, ()
+        _run_with_progress(table_name, ids, where, params, assignments)
@@ -0,0 +1,258 @@
+import argparse
+import datetime
+import json
+import os
+import threading
+import time
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+from benchmarks.common import make_pool
+from benchmarks.reports import percentile
+
+
+# Drive the app headlessly with Streamlit's AppTest, one AppTest per simulated browser
+# session, against a local MySQL instance. Every action is one script rerun; the
+# harness reports rerun latency, MySQL statements per rerun (from the server's global
+# Questions counter, so use a database nobody else is querying) and sustained
+# operations per second. Run from the repository root:
+#   python -m benchmarks.app_sessions --sessions 8 --seconds 30
+#   python -m benchmarks.app_sessions --scenarios create update --sessions 4
+# The create and update scenarios write only to patients of their own, with emails at
+# BENCH_DOMAIN: the update scenario inserts the patients it edits before it starts, and
+# every benchmark patient is removed at the end, so existing rows are never changed.
+MAIN_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "main.py")
+BENCH_DOMAIN = "bench.example.com"
+REPORT_CATEGORY = "Advanced Aggregate Functions"
+# Patients inserted for the update scenario to edit
+UPDATE_PATIENTS = 200
+
+
+def _widget(elements, label):
+    return next(element for element in elements if element.label == label)
+
+
+def _new_session(page):
+    at = AppTest.from_file(MAIN_SCRIPT, default_timeout=60)
+    for name in ("DB_HOST", "DB_USER", "DB_PASSWORD", "DB_NAME"):
+        at.secrets[name] = st.secrets[name]
+    at.run()
+    at.sidebar.selectbox[0].select(page).run()
+    return at
+
+
+def _crud_session(operation, table_name="Patient"):
+    at = _new_session("CRUD Operations")
+    at.sidebar.selectbox(key="selected_operation").select(operation).run()
+    at.sidebar.selectbox(key="selected_table").select(table_name).run()
+    return at
+
+
+# SCENARIOS: set up a session, then return it with a function running one action ------------------
+def rerun_crud(session, patient_ids):
+    at = _crud_session("Read records")
+    return at, lambda i: at.run()
+
+
+def rerun_reports(session, patient_ids):
+    at = _new_session("Complex Queries")
+    at.sidebar.selectbox[1].select(REPORT_CATEGORY).run()
+    return at, lambda i: at.run()
+
+
+def read(session, patient_ids):
+    at = _crud_session("Read records")
+
+    def action(i):
+        # Page forward through Patient, starting over every 20 pages or at the end
+        next_button = at.button(key="next_Patient")
+        if i % 20 == 0 or next_button.disabled:
+            at.button(key="first_Patient").click().run()
+        else:
+            next_button.click().run()
+
+    return at, action
+
+
+def create(session, patient_ids):
+    at = _crud_session("Create a new record")
+
+    def action(i):
+        _widget(at.text_input, "First Name").input("Bench")
+        _widget(at.text_input, "Last Name").input("Session")
+        _widget(at.text_input, "Address").input(f"{i} Benchmark Road")
+        _widget(at.text_input, "Phone (Format: 123-456-7890)").input(
+            f"{500 + session:03d}-{i // 10_000 % 1000:03d}-{i % 10_000:04d}"
+        )
+        _widget(at.text_input, "Email").input(f"s{session}n{i}@{BENCH_DOMAIN}")
+        _widget(at.button, "Create Record").click().run()
+
+    return at, action
+
+
+def update(session, patient_ids):
+    at = _crud_session("Update an existing record")
+
+    def action(i):
+        patient_id = patient_ids[(session * 7919 + i) % len(patient_ids)]
+        at.text_input[0].input(str(patient_id)).run()
+        _widget(at.text_input, "Address").input(f"{i} Benchmark Road")
+        _widget(at.button, "Update Record").click().run()
+
+    return at, action
+
+
+SCENARIOS = {
+    "rerun_crud": rerun_crud,
+    "rerun_reports": rerun_reports,
+    "read": read,
+    "create": create,
+    "update": update,
+}
+
+
+def _questions(conn):
+    with conn.cursor() as cursor:
+        cursor.execute("SHOW GLOBAL STATUS LIKE 'Questions'")
+        return int(cursor.fetchone()[1])
+
+
+# Insert the patients the update scenario edits; returns their IDs
+def _insert_update_patients(conn, count):
+    with conn.cursor() as cursor:
+        cursor.execute("SELECT MIN(Branch_ID) FROM Hospital_Branch")
+        branch_id = cursor.fetchone()[0]
+        if branch_id is None:
+            raise SystemExit("The Hospital_Branch table is empty; load some data first.")
+        rows = [
+            (
+                "Bench",
+                "Update",
+                "Other",
+                datetime.date(1980, 1, 1),
+                "1 Benchmark Road",
+                f"499-{n // 10_000 % 1000:03d}-{n % 10_000:04d}",
+                f"u{n}@{BENCH_DOMAIN}",
+                branch_id,
+            )
+            for n in range(count)
+        ]
+        conn.start_transaction()
+        cursor.executemany(
+            "INSERT INTO Patient (FirstName, LastName, Gender, DateOfBirth, Address, Phone, "
+            "Email, Branch_ID) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)",
+            rows,
+        )
+        conn.commit()
+        cursor.execute(
+            "SELECT PatientID FROM Patient WHERE Email LIKE %s ORDER BY PatientID",
+            (f"u%@{BENCH_DOMAIN}",),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+
+# Remove every patient the benchmark created, with their cascaded rows
+def _delete_bench_patients(conn):
+    conn.start_transaction()
+    with conn.cursor() as cursor:
+        cursor.execute("DELETE FROM Patient WHERE Email LIKE %s", (f"%@{BENCH_DOMAIN}",))
+    conn.commit()
+
+
+# Run one scenario in every session for the given seconds; returns the summary dict
+def run_scenario(name, sessions, seconds, conn, patient_ids):
+    sessions_and_actions = [SCENARIOS[name](session, patient_ids) for session in range(sessions)]
+    # The update scenario reruns once to load the record and once to save it
+    reruns_per_action = 2 if name == "update" else 1
+    latencies = [[] for _ in range(sessions)]
+    failures = [0] * sessions
+    barrier = threading.Barrier(sessions + 1)
+
+    def worker(session):
+        barrier.wait()
+        deadline = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            at, action = sessions_and_actions[session]
+            try:
+                action(i)
+                # The app reports most failures with st.error rather than an exception
+                failed = bool(at.exception) or bool(at.error)
+            except Exception:
+                failed = True
+            failures[session] += failed
+            latencies[session].append((time.perf_counter() - start) * 1000 / reruns_per_action)
+            i += 1
+
+    threads = [threading.Thread(target=worker, args=(session,)) for session in range(sessions)]
+    for thread in threads:
+        thread.start()
+    questions_before = _questions(conn)
+    start = time.perf_counter()
+    barrier.wait()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    # The second SHOW STATUS counts itself
+    statements = _questions(conn) - questions_before - 1
+
+    every = [latency for session_latencies in latencies for latency in session_latencies]
+    actions_run = len(every)
+    reruns = actions_run * reruns_per_action
+    return {
+        "sessions": sessions,
+        "actions": actions_run,
+        "failed_actions": sum(failures),
+        "rerun_p50_ms": round(percentile(every, 0.50), 1) if every else None,
+        "rerun_p95_ms": round(percentile(every, 0.95), 1) if every else None,
+        "statements_per_rerun": round(max(statements, 0) / max(reruns, 1), 2),
+        "actions_per_second": round(actions_run / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="CRUD throughput and rerun latency")
+    parser.add_argument("--sessions", type=int, default=4, help="concurrent browser sessions")
+    parser.add_argument("--seconds", type=float, default=20.0, help="duration of each scenario")
+    parser.add_argument(
+        "--scenarios", nargs="*", choices=list(SCENARIOS), default=list(SCENARIOS)
+    )
+    parser.add_argument("--output", help="also write the results to this JSON file")
+    args = parser.parse_args()
+
+    pool = make_pool()
+    conn = pool.acquire()
+    results = {}
+    writes = "create" in args.scenarios or "update" in args.scenarios
+    try:
+        patient_ids = []
+        # Leftovers of an interrupted run would collide with the new benchmark patients
+        if writes:
+            _delete_bench_patients(conn)
+        if "update" in args.scenarios:
+            patient_ids = _insert_update_patients(conn, UPDATE_PATIENTS)
+
+        for name in args.scenarios:
+            results[name] = run_scenario(name, args.sessions, args.seconds, conn, patient_ids)
+            summary = results[name]
+            print(
+                f"{name:>14}: {summary['actions_per_second']:8.1f} actions/s, "
+                f"rerun p50 {summary['rerun_p50_ms']} ms / p95 {summary['rerun_p95_ms']} ms, "
+                f"{summary['statements_per_rerun']} statements/rerun, "
+                f"{summary['failed_actions']} failed"
+            )
+    finally:
+        try:
+            if writes:
+                _delete_bench_patients(conn)
+        finally:
+            pool.release(conn)
+        pool.close_all()
+
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(results, handle, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,17 @@
+import streamlit as st
+import db
+
+
+# Connection pool for the command-line tools, using the app's .streamlit/secrets.toml;
+# database overrides DB_NAME, e.g. for a scratch copy of the schema
+def make_pool(size=1, database=None):
+    return db.ConnectionPool(
+        size=size,
+        checkout_timeout=10.0,
+        ping_on_borrow=False,
+        recycle_seconds=3600.0,
+        host=st.secrets["DB_HOST"],
+        user=st.secrets["DB_USER"],
+        password=st.secrets["DB_PASSWORD"],
+        database=database or st.secrets["DB_NAME"],
+    )
@@ -0,0 +1,432 @@
+import argparse
+import csv
+import datetime
+import decimal
+import os
+import random
+import time
+from benchmarks.common import make_pool
+import validation
+
+
+# Deterministic synthetic data at production volumes. Every table is filled with
+# referentially consistent rows derived from the patient count and a seed, so the
+# same arguments always produce the same database. Run from the repository root:
+#   python -m benchmarks.generate_data --patients 1000000 --seed 42 --truncate
+# or write CSV files and a LOAD DATA script instead of inserting:
+#   python -m benchmarks.generate_data --patients 10000000 --csv data/
+# The schema (schema.sql) limits the data to two branches, ten departments per
+# branch and 255 doctors and nurses (TINYINT UNSIGNED keys); everything else scales.
+
+FIRST_NAMES = [
+    "Ava", "Liam", "Noah", "Emma", "Olivia", "Mia", "Lucas", "Amelia", "Ethan", "Sofia",
+    "Mason", "Isla", "Logan", "Chloe", "Elijah", "Grace", "James", "Zoe", "Henry", "Nora",
+    "Leo", "Ruby", "Jack", "Ivy", "Owen", "Alice", "Caleb", "Hazel", "Ezra", "Lucy",
+]
+LAST_NAMES = [
+    "Smith", "Johnson", "Brown", "Garcia", "Miller", "Davis", "Wilson", "Moore", "Clark",
+    "Lewis", "Walker", "Hall", "Young", "King", "Wright", "Scott", "Green", "Baker", "Adams",
+    "Nelson", "Hill", "Campbell", "Mitchell", "Roberts", "Carter", "Phillips", "Evans",
+    "Turner", "Torres", "Parker", "O'Neil", "Smith-Jones",
+]
+STREETS = ["Main St", "Elm St", "Oak Avenue", "Maple Drive", "Cedar Lane", "Pine Road", "Lake View"]
+DEPARTMENTS = [
+    "CARDIOLOGY", "DERMATOLOGY", "EAR, NOSE & THROAT", "GASTROENTEROLOGY", "NEUROLOGY",
+    "NEPHROLOGY", "OBSTETRICS & GYNAECOLOGY", "OPHTHALMOLOGY", "ORTHOPAEDIC", "UROLOGY",
+]
+LOCATIONS = ["Main Building", "East Wing", "West Block", "North Block", "South Wing"]
+ROOM_TYPES = ["General", "Private", "ICU", "Maternity", "Pediatric", "Surgical"]
+REASONS = [
+    "Routine check-up", "Follow-up", "Consultation", "Lab Results Review", "New Symptoms",
+    "Check-up for hypertension", "Consultation for back pain", "Annual physical",
+]
+DIAGNOSES = [
+    ("Hypertension", "Lifestyle changes and medication"),
+    ("Type 2 diabetes", "Metformin and diet plan"),
+    ("Migraine", "Pain management and rest"),
+    ("Acute bronchitis", "Rest and fluids"),
+    ("Eczema", "Topical corticosteroids"),
+    ("Kidney stones", "Hydration and pain relief"),
+    ("Fractured wrist", "Cast for six weeks"),
+    ("Cataract", "Cataract surgery"),
+    ("Gastritis", "Proton pump inhibitor"),
+    ("Urinary tract infection", "Antibiotics"),
+]
+
+BRANCHES = [
+    (1, "Vertical", "123 Main St, Springfield", "123-456-7890", "Illinois", "62701"),
+    (2, "Horizontal", "456 Elm St, Springfield", "987-654-3210", "Illinois", "62702"),
+]
+
+# Dates of the generated activity (appointments, records, stays, bills)
+START_DATE = datetime.date(2022, 1, 1)
+DAYS = 4 * 365
+
+# Tables in load order (parents first), with their columns
+COLUMNS = {
+    "Hospital_Branch": [
+        "Branch_ID", "Branch_Name", "Branch_Address", "Branch_Phone_Number", "State", "Zip_Code"
+    ],
+    "Department": ["DepartmentID", "DepartmentName", "Location", "Branch_ID"],
+    "Patient": [
+        "PatientID", "FirstName", "LastName", "Gender", "DateOfBirth", "Address", "Phone",
+        "Email", "Branch_ID",
+    ],
+    "Doctor": ["DoctorID", "FirstName", "LastName", "Phone", "Email", "DepartmentID", "Branch_ID"],
+    "Nurse": ["NurseID", "FirstName", "LastName", "Phone", "Email", "Branch_ID"],
+    "Room": ["RoomID", "RoomNumber", "RoomType", "Availability", "Branch_ID"],
+    "Appointment": [
+        "AppointmentID", "PatientID", "DoctorID", "AppointmentDate", "AppointmentTime",
+        "ReasonForVisit", "Branch_ID",
+    ],
+    "MedicalRecord": [
+        "RecordID", "PatientID", "DoctorID", "Diagnosis", "Treatment", "CreateDate", "Branch_ID"
+    ],
+    "HospitalStay": [
+        "StayID", "PatientID", "RoomID", "AdmitDate", "DischargeDate", "AssignedNurseID",
+        "Branch_ID",
+    ],
+    "Billing": ["BillID", "PatientID", "TotalAmount", "PaymentDate", "PaymentMethod", "Branch_ID"],
+    "PatientHistory": [
+        "HistoryID", "PatientID", "FirstName", "LastName", "Gender", "DateOfBirth", "Address",
+        "Phone", "Email", "Branch_ID", "ChangeDate",
+    ],
+}
+
+
+# Row counts of the small tables for a patient count
+def scale(patients):
+    return {
+        "patients": patients,
+        "doctors": min(255, max(15, patients // 500)),
+        "nurses": min(255, max(15, patients // 500)),
+        "rooms": max(20, patients // 100),
+    }
+
+
+# Unique phone number for the n-th person of a table; prefix keeps tables apart
+def _phone(prefix, n):
+    return f"{prefix + n // 10_000_000:03d}-{n // 10_000 % 1000:03d}-{n % 10_000:04d}"
+
+
+def _email(first, last, n, domain):
+    local = "".join(char for char in f"{first[0]}{last}".lower() if char.isalpha())
+    return f"{local}{n}@{domain}"
+
+
+def _day(offset):
+    return START_DATE + datetime.timedelta(days=offset)
+
+
+# Every patient belongs to a branch derived from the ID, so child tables agree on it
+def patient_branch(patient_id):
+    return 2 if patient_id % 3 == 0 else 1
+
+
+# Each table draws from its own generator, so tables are reproducible independently
+def _rng(seed, table_name):
+    return random.Random(f"{seed}:{table_name}")
+
+
+def _departments():
+    # DepartmentID = branch offset + position in DEPARTMENTS, unique per branch
+    for branch_id in (1, 2):
+        for i, name in enumerate(DEPARTMENTS):
+            department_id = (branch_id - 1) * len(DEPARTMENTS) + i + 1
+            yield department_id, name, LOCATIONS[i % len(LOCATIONS)], branch_id
+
+
+def _department_branch(department_id):
+    return 1 if department_id <= len(DEPARTMENTS) else 2
+
+
+def _patients(seed, counts):
+    rng = _rng(seed, "Patient")
+    for patient_id in range(1, counts["patients"] + 1):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        yield (
+            patient_id,
+            first,
+            last,
+            rng.choices(validation.GENDERS, weights=[49, 49, 2])[0],
+            datetime.date(1930, 1, 1) + datetime.timedelta(days=rng.randrange(33_000)),
+            f"{rng.randrange(1, 99_999)} {rng.choice(STREETS)}",
+            _phone(200, patient_id),
+            _email(first, last, patient_id, "patients.example.com"),
+            patient_branch(patient_id),
+        )
+
+
+def _doctors(seed, counts):
+    rng = _rng(seed, "Doctor")
+    for doctor_id in range(1, counts["doctors"] + 1):
+        first = rng.choice(FIRST_NAMES).upper()
+        last = rng.choice(LAST_NAMES).upper()
+        department_id = rng.randrange(1, 2 * len(DEPARTMENTS) + 1)
+        yield (
+            doctor_id,
+            first,
+            last,
+            _phone(100, doctor_id),
+            _email(first, last, doctor_id, "doctors.example.com"),
+            department_id,
+            _department_branch(department_id),
+        )
+
+
+def _nurses(seed, counts):
+    rng = _rng(seed, "Nurse")
+    for nurse_id in range(1, counts["nurses"] + 1):
+        first = rng.choice(FIRST_NAMES)
+        last = rng.choice(LAST_NAMES)
+        yield (
+            nurse_id,
+            first,
+            last,
+            _phone(150, nurse_id),
+            _email(first, last, nurse_id, "nurses.example.com"),
+            1 if nurse_id % 2 else 2,
+        )
+
+
+def _rooms(seed, counts):
+    rng = _rng(seed, "Room")
+    for room_id in range(1, counts["rooms"] + 1):
+        branch_id = 1 if room_id % 2 else 2
+        yield (
+            room_id,
+            f"{'VH'[branch_id - 1]}{room_id:07d}",
+            rng.choice(ROOM_TYPES),
+            rng.random() < 0.7,
+            branch_id,
+        )
+
+
+# IDs of the doctors, nurses and rooms of each branch, for the per-patient tables
+def _by_branch(rows, branch_index):
+    ids = {1: [], 2: []}
+    for row in rows:
+        ids[row[branch_index]].append(row[0])
+    return ids
+
+
+# Distinct day offsets for one patient's rows, so per-patient unique keys hold
+def _days(rng, count):
+    return sorted(rng.sample(range(DAYS), count))
+
+
+def _appointments(seed, counts):
+    rng = _rng(seed, "Appointment")
+    doctors = _by_branch(_doctors(seed, counts), 6)
+    appointment_id = 0
+    for patient_id in range(1, counts["patients"] + 1):
+        branch_doctors = doctors[patient_branch(patient_id)] or doctors[1] + doctors[2]
+        for offset in _days(rng, rng.randrange(0, 7)):
+            appointment_id += 1
+            yield (
+                appointment_id,
+                patient_id,
+                rng.choice(branch_doctors),
+                _day(offset),
+                datetime.time(8 + rng.randrange(10), rng.choice([0, 15, 30, 45])),
+                rng.choice(REASONS),
+                patient_branch(patient_id),
+            )
+
+
+def _medical_records(seed, counts):
+    rng = _rng(seed, "MedicalRecord")
+    doctors = _by_branch(_doctors(seed, counts), 6)
+    record_id = 0
+    for patient_id in range(1, counts["patients"] + 1):
+        branch_doctors = doctors[patient_branch(patient_id)] or doctors[1] + doctors[2]
+        for offset in _days(rng, rng.randrange(0, 4)):
+            record_id += 1
+            diagnosis, treatment = rng.choice(DIAGNOSES)
+            yield (
+                record_id,
+                patient_id,
+                rng.choice(branch_doctors),
+                diagnosis,
+                treatment,
+                datetime.datetime.combine(_day(offset), datetime.time(rng.randrange(8, 18))),
+                patient_branch(patient_id),
+            )
+
+
+def _hospital_stays(seed, counts):
+    rng = _rng(seed, "HospitalStay")
+    rooms = _by_branch(_rooms(seed, counts), 4)
+    nurses = _by_branch(_nurses(seed, counts), 5)
+    stay_id = 0
+    for patient_id in range(1, counts["patients"] + 1):
+        if rng.random() >= 0.2:
+            continue
+        branch_id = patient_branch(patient_id)
+        for offset in _days(rng, rng.randrange(1, 3)):
+            stay_id += 1
+            yield (
+                stay_id,
+                patient_id,
+                rng.choice(rooms[branch_id]),
+                _day(offset),
+                _day(offset + rng.randrange(0, 15)),
+                rng.choice(nurses[branch_id]),
+                branch_id,
+            )
+
+
+def _billing(seed, counts):
+    rng = _rng(seed, "Billing")
+    bill_id = 0
+    for patient_id in range(1, counts["patients"] + 1):
+        for offset in _days(rng, rng.randrange(0, 4)):
+            bill_id += 1
+            yield (
+                bill_id,
+                patient_id,
+                decimal.Decimal(rng.randrange(2_000, 500_000)) / 100,
+                _day(offset),
+                # The seed's methods in about the seed's even mix, so debit card discounts apply
+                rng.choice(validation.PAYMENT_METHODS),
+                patient_branch(patient_id),
+            )
+
+
+# Earlier versions of about one patient in ten, as the Patient update trigger records them
+def _patient_history(seed, counts):
+    rng = _rng(seed, "PatientHistory")
+    history_id = 0
+    for patient in _patients(seed, counts):
+        if rng.random() >= 0.1:
+            continue
+        patient_id = patient[0]
+        for offset in _days(rng, rng.randrange(1, 3)):
+            history_id += 1
+            address = f"{rng.randrange(1, 99_999)} {rng.choice(STREETS)}"
+            yield (history_id, patient_id) + patient[1:5] + (address,) + patient[6:9] + (
+                datetime.datetime.combine(_day(offset), datetime.time(12)),
+            )
+
+
+GENERATORS = {
+    "Hospital_Branch": lambda seed, counts: iter(BRANCHES),
+    "Department": lambda seed, counts: _departments(),
+    "Patient": _patients,
+    "Doctor": _doctors,
+    "Nurse": _nurses,
+    "Room": _rooms,
+    "Appointment": _appointments,
+    "MedicalRecord": _medical_records,
+    "HospitalStay": _hospital_stays,
+    "Billing": _billing,
+    "PatientHistory": _patient_history,
+}
+
+
+def _batches(rows, batch_size):
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+# Insert every table with multi-row INSERTs (one executemany per batch) and
+# per-batch commits; key checks are off during the load since the data is consistent
+def load_mysql(seed, counts, batch_size, truncate):
+    pool = make_pool()
+    conn = pool.acquire()
+    try:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM Patient")
+            if cursor.fetchone()[0] and not truncate:
+                raise SystemExit("The database already holds data; pass --truncate to replace it.")
+            cursor.execute("SET SESSION foreign_key_checks = 0")
+            cursor.execute("SET SESSION unique_checks = 0")
+            for table_name in COLUMNS:
+                cursor.execute(f"TRUNCATE TABLE {table_name}")
+
+            for table_name, columns in COLUMNS.items():
+                query = (
+                    f"INSERT INTO {table_name} ({', '.join(columns)}) "
+                    f"VALUES ({', '.join(['%s'] * len(columns))})"
+                )
+                start = time.perf_counter()
+                rows = 0
+                for batch in _batches(GENERATORS[table_name](seed, counts), batch_size):
+                    conn.start_transaction()
+                    cursor.executemany(query, batch)
+                    conn.commit()
+                    rows += len(batch)
+                elapsed = time.perf_counter() - start
+                print(f"{table_name:>16}: {rows:12,} rows in {elapsed:7.1f} s")
+
+            cursor.execute("SET SESSION foreign_key_checks = 1")
+            cursor.execute("SET SESSION unique_checks = 1")
+    finally:
+        pool.release(conn, discard=True)
+        pool.close_all()
+
+
+def _csv_value(value):
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+# Write one CSV file per table plus load.sql, a LOAD DATA script for the mysql client, the
+# fastest way to load large scales: cd DIR && mysql --local-infile=1 HospitalManagement < load.sql
+def write_csv(seed, counts, directory):
+    os.makedirs(directory, exist_ok=True)
+    statements = [
+        "SET foreign_key_checks = 0;",
+        "SET unique_checks = 0;",
+    ]
+    for table_name, columns in COLUMNS.items():
+        path = os.path.join(directory, f"{table_name}.csv")
+        start = time.perf_counter()
+        rows = 0
+        with open(path, "w", newline="", encoding="utf-8") as handle:
+            writer = csv.writer(handle)
+            for row in GENERATORS[table_name](seed, counts):
+                writer.writerow([_csv_value(value) for value in row])
+                rows += 1
+        print(f"{table_name:>16}: {rows:12,} rows in {time.perf_counter() - start:7.1f} s")
+        statements.append(f"TRUNCATE TABLE {table_name};")
+        statements.append(
+            f"LOAD DATA LOCAL INFILE '{table_name}.csv' INTO TABLE {table_name} "
+            "FIELDS TERMINATED BY ',' OPTIONALLY ENCLOSED BY '\"' LINES TERMINATED BY '\\r\\n' "
+            f"({', '.join(columns)});"
+        )
+    statements += ["SET unique_checks = 1;", "SET foreign_key_checks = 1;"]
+    with open(os.path.join(directory, "load.sql"), "w", encoding="utf-8") as handle:
+        handle.write("\n".join(statements) + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate synthetic hospital data")
+    parser.add_argument("--patients", type=int, default=10_000, help="patients to generate")
+    parser.add_argument("--seed", type=int, default=42, help="random seed; same seed, same data")
+    parser.add_argument("--batch-size", type=int, default=5000, help="rows per INSERT transaction")
+    parser.add_argument("--truncate", action="store_true", help="replace the data already loaded")
+    parser.add_argument("--csv", metavar="DIR", help="write CSV files and load.sql instead")
+    args = parser.parse_args()
+
+    counts = scale(args.patients)
+    print(
+        f"Generating {counts['patients']:,} patients, {counts['doctors']} doctors, "
+        f"{counts['nurses']} nurses and {counts['rooms']:,} rooms (seed {args.seed})"
+    )
+    if args.csv:
+        write_csv(args.seed, counts, args.csv)
+    else:
+        load_mysql(args.seed, counts, args.batch_size, args.truncate)
+
+
+if __name__ == "__main__":
+    main()
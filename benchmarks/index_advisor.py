@@ -0,0 +1,500 @@
+import argparse
+import json
+import os
+import re
+import sys
+import mysql.connector
+import streamlit as st
+from benchmarks.common import make_pool
+from benchmarks.reports import benchmark_queries, run_query
+import cascade_delete
+import db
+import explain
+import schema_migrations
+import tables
+
+
+# Index advisor over the app's actual workload: every catalog report (with its default
+# parameters), the views of queries.sql and the statements the CRUD page runs are
+# EXPLAINed, and every table access that scans a whole table or index, or needs a
+# filesort or a temporary table, becomes a composite index proposal: equality columns
+# first, then one range column (or, without one, the GROUP BY / ORDER BY columns),
+# made covering when the few other columns the query reads fit. Proposals already
+# served by a live index are dropped, and each one gets an estimated size and the
+# write overhead it adds. Run from the repository root:
+#   python -m benchmarks.index_advisor
+#   python -m benchmarks.index_advisor --scratch --apply 1 3 --runs 20
+#   python -m benchmarks.index_advisor --apply 1 --write-migration
+# --scratch copies every table (not the views) into a scratch database, benchmarks the
+# queries a proposal helps there, adds the proposed indexes and benchmarks them again.
+# --write-migration writes the chosen proposals as the next file in migrations/.
+MAX_INDEX_COLUMNS = 5
+# Widest text column put in a proposal, in characters
+MAX_TEXT_LENGTH = 255
+# Rows sampled to estimate the average width of a variable-length column
+WIDTH_SAMPLE_ROWS = 10_000
+# InnoDB record header and offsets per index entry, and the fill of a B-tree grown by
+# random inserts; both only feed the size estimate
+RECORD_OVERHEAD = 7
+INDEX_FILL = 0.69
+
+_FIXED_WIDTHS = {
+    "tinyint": 1, "smallint": 2, "mediumint": 3, "int": 4, "bigint": 8, "float": 4, "double": 8,
+    "date": 3, "time": 3, "datetime": 5, "timestamp": 4, "year": 1, "enum": 2, "bit": 1,
+}
+_VARIABLE_TYPES = ("char", "varchar", "binary", "varbinary")
+
+_TABLE_REFERENCE = re.compile(r"\b(?:FROM|JOIN|UPDATE)\s+`?(\w+)`?(?:\s+(?:AS\s+)?`?(\w+)`?)?", re.I)
+_NOT_ALIASES = {
+    "where", "on", "using", "join", "inner", "left", "right", "cross", "natural", "straight_join",
+    "group", "order", "limit", "having", "union", "window", "set", "for", "lock",
+}
+# `schema`.`alias`.`column` <operator> as EXPLAIN prints attached conditions; a column
+# wrapped in a function is not followed by an operator and so is left out
+_COMPARISON = re.compile(
+    r"`\w+`\.`(\w+)`\.`(\w+)`\s*(<=>|<>|!=|>=|<=|=|<|>|between|in|like)\s*('%)?", re.I
+)
+_JOINED_COLUMN = re.compile(r"(?<![<>!])=\s*`\w+`\.`(\w+)`\.`(\w+)`")
+_GROUP_ORDER = re.compile(
+    r"\b(?:GROUP|ORDER)\s+BY\s+(.+?)(?=\b(?:LIMIT|HAVING|ORDER|WINDOW)\b|\)|;|$)", re.I | re.S
+)
+_SORT_ITEM = re.compile(r"(?:(\w+)\.)?(\w+)(?:\s+(?:ASC|DESC))?", re.I)
+
+
+def _is_select(sql):
+    return sql.lstrip().upper().startswith(("SELECT", "WITH"))
+
+
+# (name, sql, params) of the statements the CRUD page runs, with 1 as every ID
+def crud_statements():
+    statements = []
+    for table_name, primary_key in tables.PRIMARY_KEYS.items():
+        statements += [
+            (
+                f"CRUD: read {table_name} by ID",
+                f"SELECT * FROM {table_name} WHERE {primary_key} = %s",
+                (1,),
+            ),
+            (
+                f"CRUD: next page of {table_name}",
+                f"SELECT * FROM {table_name} WHERE {primary_key} > %s ORDER BY {primary_key} ASC LIMIT %s",
+                (1, 51),
+            ),
+            (
+                f"CRUD: update {table_name}",
+                f"UPDATE {table_name} SET {primary_key} = {primary_key} WHERE {primary_key} = %s",
+                (1,),
+            ),
+            (
+                f"CRUD: delete {table_name}",
+                f"DELETE FROM {table_name} WHERE {primary_key} = %s",
+                (1,),
+            ),
+        ]
+        if cascade_delete.has_cascades(table_name):
+            for child, (sql, count) in cascade_delete.count_queries(table_name).items():
+                if child != table_name:
+                    statements.append(
+                        (f"CRUD: cascade plan {table_name} -> {child}", sql, (1,) * count)
+                    )
+    return statements
+
+
+# Reports and queries.sql views (procedures and functions cannot be EXPLAINed), then CRUD
+def workload():
+    queries = [(name, sql, params) for name, sql, params in benchmark_queries() if _is_select(sql)]
+    return queries + crud_statements()
+
+
+# Columns of every table as {lower-cased table: {lower-cased column: info dict}}
+def table_columns(cursor):
+    cursor.execute(
+        "SELECT TABLE_NAME, COLUMN_NAME, DATA_TYPE, CHARACTER_MAXIMUM_LENGTH, NUMERIC_PRECISION, "
+        "COLUMN_KEY FROM information_schema.COLUMNS WHERE TABLE_SCHEMA = DATABASE() "
+        "ORDER BY TABLE_NAME, ORDINAL_POSITION"
+    )
+    columns = {}
+    for table_name, column, data_type, length, precision, column_key in cursor.fetchall():
+        columns.setdefault(table_name.lower(), {})[column.lower()] = {
+            "name": column,
+            "type": data_type.lower(),
+            "length": length,
+            "precision": precision,
+            "primary": column_key == "PRI",
+        }
+    return columns
+
+
+def _indexable(info):
+    if info["type"] in _VARIABLE_TYPES:
+        return (info["length"] or 0) <= MAX_TEXT_LENGTH
+    return info["type"] in _FIXED_WIDTHS or info["type"] == "decimal"
+
+
+# {alias or table name (lower-cased): table} for the tables a statement reads
+def _aliases(sql):
+    known = {table_name.lower(): table_name for table_name in tables.ALL_TABLES}
+    aliases = {}
+    for table_name, alias in _TABLE_REFERENCE.findall(sql):
+        table_name = known.get(table_name.lower())
+        if not table_name:
+            continue
+        aliases[table_name.lower()] = table_name
+        if alias and alias.lower() not in _NOT_ALIASES:
+            aliases[alias.lower()] = table_name
+    return aliases
+
+
+# Columns of alias compared for equality and by range in an attached condition
+def _predicate_columns(condition, alias):
+    equality, ranges = [], []
+    for ref_alias, column, operator, leading_wildcard in _COMPARISON.findall(condition):
+        if ref_alias.lower() != alias:
+            continue
+        operator = operator.lower()
+        if operator in ("=", "<=>", "in"):
+            equality.append(column.lower())
+        elif operator == "like":
+            if not leading_wildcard:
+                ranges.append(column.lower())
+        elif operator not in ("<>", "!="):
+            ranges.append(column.lower())
+    for ref_alias, column in _JOINED_COLUMN.findall(condition):
+        if ref_alias.lower() == alias:
+            equality.append(column.lower())
+    return equality, ranges
+
+
+# Plain columns of alias in the GROUP BY and ORDER BY clauses; unqualified names
+# count only when the statement reads a single table
+def _order_columns(sql, alias, single_table):
+    columns = []
+    for clause in _GROUP_ORDER.findall(sql):
+        for item in clause.split(","):
+            match = _SORT_ITEM.fullmatch(item.strip())
+            if not match:
+                continue
+            qualifier, column = match.groups()
+            if (qualifier and qualifier.lower() == alias) or (not qualifier and single_table):
+                columns.append(column.lower())
+    return columns
+
+
+# Index columns proposed for one flagged table access; returns (columns, covering)
+def _index_columns(sql, access, columns, single_table):
+    alias = access["Table"].lower()
+    equality, ranges = _predicate_columns(access["Condition"] or "", alias)
+    ordering = []
+    if "filesort" in access["Flags"] or "temporary table" in access["Flags"]:
+        ordering = _order_columns(sql, alias, single_table)
+
+    # Secondary indexes end with the primary key already, so it is never listed
+    def usable(column):
+        info = columns.get(column)
+        return info is not None and _indexable(info) and not info["primary"]
+
+    chosen = []
+    for column in equality + (ranges[:1] or ordering):
+        if usable(column) and column not in chosen:
+            chosen.append(column)
+    chosen = chosen[:MAX_INDEX_COLUMNS]
+    if not chosen:
+        return [], False
+
+    used = [column.lower() for column in (access["Used columns"] or "").split(", ") if column]
+    extra = [
+        column for column in dict.fromkeys(used)
+        if column not in chosen and not columns.get(column, {}).get("primary")
+    ]
+    covering = not extra or (
+        len(chosen) + len(extra) <= MAX_INDEX_COLUMNS and all(usable(column) for column in extra)
+    )
+    if covering:
+        chosen += extra
+    return [columns[column]["name"] for column in chosen], covering
+
+
+# Whether a live index starts with the proposed columns
+def _covered(live, table_name, columns):
+    wanted = [column.lower() for column in columns]
+    return any(
+        index_columns[: len(wanted)] == wanted
+        for (live_table, _), index_columns in live.items()
+        if live_table == table_name.lower()
+    )
+
+
+# Fold every proposal that is a prefix of a longer one on the same table into it
+def _merge_prefixes(proposals):
+    kept = []
+    for proposal in sorted(proposals, key=lambda item: -len(item["columns"])):
+        longer = next(
+            (
+                item for item in kept
+                if item["table"] == proposal["table"]
+                and item["columns"][: len(proposal["columns"])] == proposal["columns"]
+            ),
+            None,
+        )
+        if longer is None:
+            kept.append(proposal)
+            continue
+        longer["flags"] = list(dict.fromkeys(longer["flags"] + proposal["flags"]))
+        longer["queries"] = list(dict.fromkeys(longer["queries"] + proposal["queries"]))
+    return sorted(kept, key=lambda item: (-len(item["queries"]), item["table"]))
+
+
+# Bytes one column takes in an index entry; variable-length columns are sampled
+def _column_width(cursor, table_name, info):
+    if "width" not in info:
+        if info["type"] in _FIXED_WIDTHS:
+            info["width"] = _FIXED_WIDTHS[info["type"]]
+        elif info["type"] == "decimal":
+            info["width"] = (info["precision"] or 10) // 2 + 1
+        else:
+            cursor.execute(
+                f"SELECT AVG(LENGTH({info['name']})) FROM "
+                f"(SELECT {info['name']} FROM {table_name} LIMIT {WIDTH_SAMPLE_ROWS}) AS sample"
+            )
+            info["width"] = float(cursor.fetchone()[0] or 0) + 1
+    return info["width"]
+
+
+# Estimated size and write overhead of one proposal
+def _estimate(cursor, proposal, columns_by_table, live):
+    table_name = proposal["table"]
+    cursor.execute(
+        "SELECT TABLE_ROWS FROM information_schema.TABLES "
+        "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s",
+        (table_name,),
+    )
+    row = cursor.fetchone()
+    table_rows = int(row[0] or 0) if row else 0
+    columns = columns_by_table[table_name.lower()]
+    entry_columns = [column.lower() for column in proposal["columns"]]
+    entry_columns += [column for column, info in columns.items() if info["primary"]]
+    entry_bytes = RECORD_OVERHEAD + sum(
+        _column_width(cursor, table_name, columns[column]) for column in entry_columns
+    )
+    trees = max(len({index for live_table, index in live if live_table == table_name.lower()}), 1)
+    editable = [
+        column for column in proposal["columns"] if column in tables.INSERT_COLUMNS.get(table_name, [])
+    ]
+    overhead = f"{trees} -> {trees + 1} B-trees per INSERT and DELETE (+{100 / trees:.0f}%)"
+    if editable:
+        overhead += f"; also every UPDATE changing {', '.join(editable)}"
+    return {
+        "table_rows": table_rows,
+        "estimated_mb": round(table_rows * entry_bytes / INDEX_FILL / 2**20, 2),
+        "write_overhead": overhead,
+    }
+
+
+# EXPLAIN the workload on an open cursor and return the list of proposal dicts
+def advise(cursor, statements=None):
+    columns = table_columns(cursor)
+    live = schema_migrations.live_indexes(cursor)
+    found = {}
+    for name, sql, params in statements or workload():
+        try:
+            plan = explain.explain_plan(cursor, sql, params)
+        except mysql.connector.Error as err:
+            print(f"{name}: EXPLAIN failed ({err})", file=sys.stderr)
+            continue
+        aliases = _aliases(sql)
+        single_table = len(set(aliases.values())) == 1
+        for access in explain.plan_tables(plan):
+            table_name = aliases.get(access["Table"].lower())
+            if not access["Flags"] or not table_name or table_name.lower() not in columns:
+                continue
+            index_columns, covering = _index_columns(
+                sql, access, columns[table_name.lower()], single_table
+            )
+            if not index_columns or _covered(live, table_name, index_columns):
+                continue
+            proposal = found.setdefault(
+                (table_name, tuple(index_columns)),
+                {
+                    "table": table_name,
+                    "columns": index_columns,
+                    "covering": covering,
+                    "flags": [],
+                    "queries": [],
+                },
+            )
+            for flag in access["Flags"].split(", "):
+                if flag not in proposal["flags"]:
+                    proposal["flags"].append(flag)
+            if name not in proposal["queries"]:
+                proposal["queries"].append(name)
+
+    proposals = _merge_prefixes(list(found.values()))
+    for proposal in proposals:
+        index_name = f"idx_adv_{proposal['table']}_{'_'.join(proposal['columns'])}".lower()[:64]
+        proposal["statement"] = (
+            f"CREATE INDEX {index_name} ON {proposal['table']}({', '.join(proposal['columns'])})"
+        )
+        proposal["index"] = index_name
+        proposal.update(_estimate(cursor, proposal, columns, live))
+    return proposals
+
+
+# SCRATCH COPY ------------------------------------------------------------------------------------------
+# Recreate scratch as a copy of every table of source (without foreign keys, triggers or views)
+def copy_to_scratch(conn, source, scratch):
+    with conn.cursor() as cursor:
+        cursor.execute(f"DROP DATABASE IF EXISTS `{scratch}`")
+        cursor.execute(f"CREATE DATABASE `{scratch}`")
+        for table_name in tables.ALL_TABLES:
+            cursor.execute(f"CREATE TABLE `{scratch}`.{table_name} LIKE `{source}`.{table_name}")
+            cursor.execute(f"INSERT INTO `{scratch}`.{table_name} SELECT * FROM `{source}`.{table_name}")
+            conn.commit()
+            print(f"Copied {table_name}", file=sys.stderr)
+
+
+# Size of an index as InnoDB's persistent statistics report it, or None without access to them
+def _index_size_mb(cursor, database, table_name, index_name):
+    try:
+        cursor.execute(f"ANALYZE TABLE {table_name}")
+        cursor.fetchall()
+        cursor.execute(
+            "SELECT stat_value * @@innodb_page_size FROM mysql.innodb_index_stats "
+            "WHERE database_name = %s AND table_name = %s AND index_name = %s AND stat_name = 'size'",
+            (database, table_name, index_name),
+        )
+        row = cursor.fetchone()
+    except mysql.connector.Error:
+        return None
+    return round(row[0] / 2**20, 2) if row else None
+
+
+def _benchmark(conn, statements, runs, overhead):
+    results = {}
+    for name, sql, params in statements:
+        try:
+            results[name] = run_query(conn, sql, params, runs, overhead)
+        except mysql.connector.Error as err:
+            results[name] = {"error": str(err)}
+    return results
+
+
+# Benchmark the SELECTs the chosen proposals help on the scratch copy, add the indexes
+# and benchmark again; returns {"before", "after", "index_mb"}
+def rebenchmark(pool, scratch, proposals, runs):
+    names = {name for proposal in proposals for name in proposal["queries"]}
+    statements = [item for item in workload() if item[0] in names and _is_select(item[1])]
+    conn = pool.acquire()
+    try:
+        with conn.cursor() as cursor:
+            before = db.session_rows_read(cursor)
+            overhead = db.session_rows_read(cursor) - before
+        results = {"before": _benchmark(conn, statements, runs, overhead), "index_mb": {}}
+        with conn.cursor() as cursor:
+            for proposal in proposals:
+                cursor.execute(proposal["statement"])
+                results["index_mb"][proposal["index"]] = _index_size_mb(
+                    cursor, scratch, proposal["table"], proposal["index"]
+                )
+        results["after"] = _benchmark(conn, statements, runs, overhead)
+    finally:
+        pool.release(conn, discard=True)
+    return results
+
+
+# Write proposals as the next migration file; returns its path
+def write_migration(proposals):
+    versions = [migration["version"] for migration in schema_migrations.load_migrations()]
+    version = max(versions, default=0) + 1
+    path = os.path.join(schema_migrations.MIGRATIONS_DIR, f"{version:04d}_advisor_indexes.sql")
+    lines = ["-- Indexes proposed by benchmarks.index_advisor.", ""]
+    for proposal in proposals:
+        queries = proposal["queries"]
+        lines.append(f"-- {'; '.join(queries[:3])}{' and more' if len(queries) > 3 else ''}")
+        lines.append(
+            f"-- Fixes {', '.join(proposal['flags'])}; about {proposal['estimated_mb']} MB; "
+            f"{proposal['write_overhead']}"
+        )
+        lines.append(f"{proposal['statement']};")
+        lines.append("")
+    with open(path, "w", encoding="utf-8", newline="\r\n") as handle:
+        handle.write("\n".join(lines))
+    return path
+
+
+def _print_proposals(proposals):
+    for number, proposal in enumerate(proposals, start=1):
+        print(f"{number:>3}. {proposal['statement']}{' (covering)' if proposal['covering'] else ''}")
+        print(f"     fixes: {', '.join(proposal['flags'])}")
+        print(
+            f"     size: about {proposal['estimated_mb']} MB for "
+            f"{proposal['table_rows']:,} rows; writes: {proposal['write_overhead']}"
+        )
+        for name in proposal["queries"]:
+            print(f"     - {name}")
+
+
+def _print_comparison(results):
+    for name, old in results["before"].items():
+        new = results["after"][name]
+        if "error" in old or "error" in new:
+            print(f"{name[:60]:<60} error: {old.get('error') or new.get('error')}")
+            continue
+        print(
+            f"{name[:60]:<60} p50 {old['p50_ms']:>9} -> {new['p50_ms']:<9} ms  "
+            f"rows examined {old['rows_examined']:,} -> {new['rows_examined']:,}"
+        )
+    for index_name, size in results["index_mb"].items():
+        print(f"{index_name}: {'unknown' if size is None else f'{size} MB'} on disk")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index advisor for the report and CRUD workload")
+    parser.add_argument(
+        "--apply", type=int, nargs="*", metavar="N", help="proposal numbers to use (default all)"
+    )
+    parser.add_argument("--scratch", action="store_true", help="re-benchmark on a scratch copy")
+    parser.add_argument("--scratch-db", help="scratch database name (default DB_NAME_advisor)")
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per query on the scratch copy")
+    parser.add_argument("--write-migration", action="store_true", help="write a migration file")
+    parser.add_argument("--output", help="also write the proposals and results to this JSON file")
+    args = parser.parse_args()
+
+    source = st.secrets["DB_NAME"]
+    scratch = args.scratch_db or f"{source}_advisor"
+    if args.scratch and scratch == source:
+        raise SystemExit("The scratch database must not be the application database.")
+
+    pool = make_pool()
+    conn = pool.acquire()
+    try:
+        with conn.cursor() as cursor:
+            proposals = advise(cursor)
+    finally:
+        pool.release(conn)
+    _print_proposals(proposals)
+    chosen = proposals
+    if args.apply:
+        chosen = [proposals[number - 1] for number in args.apply if 0 < number <= len(proposals)]
+    output = {"proposals": proposals}
+
+    if args.scratch and chosen:
+        conn = pool.acquire()
+        try:
+            copy_to_scratch(conn, source, scratch)
+        finally:
+            pool.release(conn)
+        pool.close_all()
+        pool = make_pool(database=scratch)
+        output["scratch"] = rebenchmark(pool, scratch, chosen, args.runs)
+        _print_comparison(output["scratch"])
+    pool.close_all()
+
+    if args.write_migration and chosen:
+        print(f"Migration written to {write_migration(chosen)}")
+    if args.output:
+        with open(args.output, "w") as handle:
+            json.dump(output, handle, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
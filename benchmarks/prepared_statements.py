@@ -0,0 +1,80 @@
+import argparse
+import time
+from benchmarks.common import make_pool
+
+
+# Compare statements per second of the text protocol against cached server-side
+# prepared statements, using the UPDATE Patient template of the CRUD page.
+# Run from the repository root, with credentials in .streamlit/secrets.toml:
+#   python -m benchmarks.prepared_statements --statements 5000
+# Every update writes a patient's own values back inside a transaction that is
+# rolled back, so the data is left unchanged.
+UPDATE_PATIENT = """
+    UPDATE Patient
+    SET FirstName = %s, LastName = %s, Gender = %s, DateOfBirth = %s, 
+        Address = %s, Phone = %s, Email = %s, Branch_ID = %s
+    WHERE PatientID = %s
+"""
+
+
+def load_patients(conn, limit):
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT FirstName, LastName, Gender, DateOfBirth, Address, Phone, Email, Branch_ID, "
+            "PatientID FROM Patient ORDER BY PatientID LIMIT %s",
+            (limit,),
+        )
+        return cursor.fetchall()
+
+
+# Run the update for each parameter tuple and return statements per second
+def run(conn, execute, params_list, statements):
+    conn.start_transaction()
+    try:
+        start = time.perf_counter()
+        for i in range(statements):
+            execute(UPDATE_PATIENT, params_list[i % len(params_list)])
+        elapsed = time.perf_counter() - start
+    finally:
+        conn.rollback()
+    return statements / elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Text protocol vs prepared statements")
+    parser.add_argument("--statements", type=int, default=2000, help="statements per run")
+    parser.add_argument("--patients", type=int, default=100, help="distinct rows to update")
+    parser.add_argument("--rounds", type=int, default=3, help="runs per protocol; best is kept")
+    args = parser.parse_args()
+
+    pool = make_pool()
+    conn = pool.acquire()
+    try:
+        params_list = load_patients(conn, args.patients)
+        if not params_list:
+            raise SystemExit("The Patient table is empty; load some data first.")
+
+        text_cursor = conn.cursor()
+        statements = pool.statement_cache(conn)
+        results = {"text protocol": 0.0, "prepared statements": 0.0}
+        for _ in range(args.rounds):
+            results["text protocol"] = max(
+                results["text protocol"],
+                run(conn, text_cursor.execute, params_list, args.statements),
+            )
+            results["prepared statements"] = max(
+                results["prepared statements"],
+                run(conn, statements.execute, params_list, args.statements),
+            )
+        text_cursor.close()
+    finally:
+        pool.release(conn)
+        pool.close_all()
+
+    for protocol, per_second in results.items():
+        print(f"{protocol:>20}: {per_second:10,.0f} statements/s")
+    print(f"{'speedup':>20}: {results['prepared statements'] / results['text protocol']:10.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+import argparse
+import datetime
+import json
+import math
+import sys
+import time
+import mysql.connector
+from benchmarks.common import make_pool
+from benchmarks import generate_data
+import db
+from report_catalog import catalog
+
+
+# Latency benchmark of every catalog report and of the views, procedures and functions
+# of queries.sql. Each query runs --runs times after a warm-up run on one connection,
+# bypassing the app's result cache; p50/p95 latency, rows examined by the server and
+# result size are written to a JSON file. Run from the repository root:
+#   python -m benchmarks.reports --runs 20 --output results/10k.json
+#   python -m benchmarks.reports --scales 10000 1000000 --generate --output results/run.json
+#   python -m benchmarks.reports --compare results/before.json results/after.json
+# --generate reloads the database with benchmarks.generate_data before each scale.
+
+# queries.sql objects; ApplyDebitCardDiscount is left out because it updates Billing
+QUERIES_SQL = {
+    "View_PatientDetailsInVerticalBranch": "SELECT * FROM View_PatientDetailsInVerticalBranch",
+    "View_DepartmentsWithMostDoctors": "SELECT * FROM View_DepartmentsWithMostDoctors",
+    "View_DoctorsInDermatology": "SELECT * FROM View_DoctorsInDermatology",
+    "View_DoctorWithMostAppointments": "SELECT * FROM View_DoctorWithMostAppointments",
+    "View_BusiestBranch": "SELECT * FROM View_BusiestBranch",
+    "GetDoctorsByDepartment": "CALL GetDoctorsByDepartment('CARDIOLOGY')",
+    "GetTopPayingPatientLastMonth": "CALL GetTopPayingPatientLastMonth()",
+    "CalculateTotalHospitalStay": "CALL CalculateTotalHospitalStay()",
+    "CountAvailableRoomsPerBranch": "CALL CountAvailableRoomsPerBranch()",
+    "TotalBilledAmount": "SELECT TotalBilledAmount(1)",
+    "CalculateRoomOccupancyRate": "SELECT CalculateRoomOccupancyRate(1), CalculateRoomOccupancyRate(2)",
+}
+
+
+# (name, sql, params) of every benchmarked query
+def benchmark_queries():
+    queries = [
+        (title, report["sql"], catalog.default_params(title) or None)
+        for title, report in catalog.reports.items()
+    ]
+    queries += [(f"queries.sql: {name}", sql, None) for name, sql in QUERIES_SQL.items()]
+    return queries
+
+
+# Nearest-rank percentile of a list of numbers
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[max(math.ceil(fraction * len(ordered)) - 1, 0)]
+
+
+# Execute one query and read every result set; returns (rows, result bytes)
+def _execute(cursor, sql, params):
+    cursor.execute(sql, params)
+    rows = 0
+    size = 0
+    while True:
+        if cursor.with_rows:
+            for row in cursor.fetchall():
+                rows += 1
+                size += sum(len(str(value).encode()) for value in row if value is not None)
+        if not cursor.nextset():
+            return rows, size
+
+
+def run_query(conn, sql, params, runs, overhead):
+    latencies = []
+    with conn.cursor() as cursor:
+        _execute(cursor, sql, params)
+        for _ in range(runs):
+            before = db.session_rows_read(cursor)
+            start = time.perf_counter()
+            rows, size = _execute(cursor, sql, params)
+            latencies.append((time.perf_counter() - start) * 1000)
+            rows_examined = db.session_rows_read(cursor) - before - overhead
+    return {
+        "p50_ms": round(percentile(latencies, 0.50), 3),
+        "p95_ms": round(percentile(latencies, 0.95), 3),
+        "mean_ms": round(sum(latencies) / len(latencies), 3),
+        "max_ms": round(max(latencies), 3),
+        "rows": rows,
+        "result_bytes": size,
+        "rows_examined": max(rows_examined, 0),
+    }
+
+
+def run_scale(pool, runs, only=None):
+    results = {}
+    conn = pool.acquire()
+    try:
+        with conn.cursor() as cursor:
+            # Reading the counters touches a few rows itself; measure that once
+            before = db.session_rows_read(cursor)
+            overhead = db.session_rows_read(cursor) - before
+        for name, sql, params in benchmark_queries():
+            if only and not any(word.lower() in name.lower() for word in only):
+                continue
+            try:
+                results[name] = run_query(conn, sql, params, runs, overhead)
+            except mysql.connector.Error as err:
+                results[name] = {"error": str(err)}
+            print(f"{name[:70]:<70} {results[name].get('p50_ms', 'error'):>10}", file=sys.stderr)
+    finally:
+        pool.release(conn, discard=True)
+    return results
+
+
+# Queries whose p95 grew by more than threshold (a ratio) and min_ms between two runs,
+# or that fail in the second run, per scale present in both; returns a list of dicts
+def compare(before, after, threshold, min_ms):
+    regressions = []
+    for scale, results in after["results"].items():
+        for name, new in results.items():
+            old = before["results"].get(scale, {}).get(name)
+            if not old or "p95_ms" not in old:
+                continue
+            # A query that ran before and fails now is a regression too
+            if "error" in new:
+                regressions.append(
+                    {"scale": scale, "query": name, "before_p95_ms": old["p95_ms"], "error": new["error"]}
+                )
+                continue
+            if new["p95_ms"] > old["p95_ms"] * threshold and new["p95_ms"] - old["p95_ms"] > min_ms:
+                regressions.append(
+                    {
+                        "scale": scale,
+                        "query": name,
+                        "before_p95_ms": old["p95_ms"],
+                        "after_p95_ms": new["p95_ms"],
+                        "ratio": round(new["p95_ms"] / max(old["p95_ms"], 1e-9), 2),
+                    }
+                )
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Report latency benchmark")
+    parser.add_argument("--runs", type=int, default=10, help="timed runs per query")
+    parser.add_argument(
+        "--scales", type=int, nargs="*", default=[], help="patient counts to benchmark"
+    )
+    parser.add_argument("--generate", action="store_true", help="load each scale first")
+    parser.add_argument("--seed", type=int, default=42, help="seed for --generate")
+    parser.add_argument("--only", nargs="*", help="only queries whose name contains a word")
+    parser.add_argument("--output", default="report_benchmark.json", help="JSON results file")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"), help="compare two runs")
+    parser.add_argument("--threshold", type=float, default=1.2, help="p95 ratio that is a regression")
+    parser.add_argument("--min-ms", type=float, default=2.0, help="ignore p95 changes below this")
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as handle:
+            before = json.load(handle)
+        with open(args.compare[1]) as handle:
+            after = json.load(handle)
+        regressions = compare(before, after, args.threshold, args.min_ms)
+        for item in regressions:
+            if "error" in item:
+                print(f"[{item['scale']}] {item['query']}: now fails ({item['error']})")
+                continue
+            print(
+                f"[{item['scale']}] {item['query']}: p95 {item['before_p95_ms']} ms -> "
+                f"{item['after_p95_ms']} ms ({item['ratio']}x)"
+            )
+        print(f"{len(regressions)} regression(s)")
+        sys.exit(1 if regressions else 0)
+
+    pool = make_pool()
+    output = {
+        "started": datetime.datetime.now().isoformat(timespec="seconds"),
+        "runs": args.runs,
+        "seed": args.seed if args.generate else None,
+        "results": {},
+    }
+    try:
+        for scale in args.scales or [None]:
+            if scale is not None and args.generate:
+                generate_data.load_mysql(
+                    args.seed, generate_data.scale(scale), batch_size=5000, truncate=True
+                )
+            conn = pool.acquire()
+            try:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT COUNT(*) FROM Patient")
+                    patients = cursor.fetchone()[0]
+            finally:
+                pool.release(conn)
+            print(f"Benchmarking with {patients:,} patients", file=sys.stderr)
+            output["results"][str(patients)] = run_scale(pool, args.runs, args.only)
+    finally:
+        pool.close_all()
+
+    with open(args.output, "w") as handle:
+        json.dump(output, handle, indent=2)
+    print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+import streamlit as st
+import mysql.connector
+import pandas as pd
+import time
+import db
+import result_cache
+import tables
+import validation
+
+
+# Optional BULK_BATCH_SIZE setting in .streamlit/secrets.toml: rows inserted per
+# transaction by the bulk import (default 1000)
+def default_batch_size():
+    return int(st.secrets.get("BULK_BATCH_SIZE", 1000))
+
+
+# Load an uploaded CSV or Parquet file. CSV cells are kept as text and typed per column later.
+def read_upload(uploaded_file):
+    if uploaded_file.name.lower().endswith(".parquet"):
+        return pd.read_parquet(uploaded_file)
+    return pd.read_csv(uploaded_file, dtype=str, keep_default_na=False)
+
+
+# Type and validate every row of the file in one vectorized pass. Returns (rows, rejects):
+# rows are (row number, values in INSERT column order) pairs, rejects are {"Row", "Reason"} dicts.
+def prepare_rows(table_name, df):
+    columns = tables.INSERT_COLUMNS[table_name]
+    missing = [column for column in columns if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing column(s): {', '.join(missing)}")
+
+    df = df.reset_index(drop=True)
+    typed, errors = validation.coerce_frame(table_name, df)
+    # Rules only run on rows whose values could be typed
+    typed_ok = errors == ""
+    errors[typed_ok] = validation.validate_frame(table_name, typed[typed_ok])
+
+    valid = errors == ""
+    row_numbers = (df.index + 1).tolist()
+    rows = list(
+        zip(
+            [n for n, ok in zip(row_numbers, valid) if ok],
+            zip(*(typed.loc[valid, column].tolist() for column in columns)),
+        )
+    )
+    rejects = [
+        {"Row": row_number, "Reason": reason}
+        for row_number, reason in zip(df.index[~valid] + 1, errors[~valid])
+    ]
+    return rows, rejects
+
+
+def insert_query(table_name):
+    columns = tables.INSERT_COLUMNS[table_name]
+    return (
+        f"INSERT INTO {table_name} ({', '.join(columns)}) "
+        f"VALUES ({', '.join(['%s'] * len(columns))})"
+    )
+
+
+# Insert rows with one executemany() (a single multi-row INSERT) per batch_size
+# transaction, yielding (inserted, rejects) after every batch. A batch that fails
+# is replayed row by row in a new transaction so only the offending rows are rejected.
+def insert_rows(table_name, rows, batch_size):
+    query = insert_query(table_name)
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            rejects = []
+            try:
+                mydb.start_transaction()
+                cursor.executemany(query, [values for _, values in batch])
+                mydb.commit()
+                inserted = len(batch)
+            except mysql.connector.Error:
+                mydb.rollback()
+                inserted = 0
+                mydb.start_transaction()
+                for row_number, values in batch:
+                    try:
+                        cursor.execute(query, values)
+                        inserted += 1
+                    except mysql.connector.Error as err:
+                        rejects.append({"Row": row_number, "Reason": err.msg})
+                mydb.commit()
+            yield inserted, rejects
+
+
+# Insert every row in one transaction with a single multi-row INSERT, or none of them.
+# When the statement fails, each row is retried under a savepoint of a transaction
+# that is then rolled back, so every row a constraint rejects is reported by number.
+# Returns (inserted, rejects).
+def insert_all_or_none(table_name, rows):
+    query = insert_query(table_name)
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        try:
+            mydb.start_transaction()
+            cursor.executemany(query, [values for _, values in rows])
+            mydb.commit()
+            return len(rows), []
+        except mysql.connector.Error as err:
+            mydb.rollback()
+            statement_error = err.msg
+
+        rejects = []
+        mydb.start_transaction()
+        try:
+            for row_number, values in rows:
+                cursor.execute("SAVEPOINT grid_row")
+                try:
+                    cursor.execute(query, values)
+                except mysql.connector.Error as err:
+                    cursor.execute("ROLLBACK TO SAVEPOINT grid_row")
+                    rejects.append({"Row": row_number, "Reason": err.msg})
+        finally:
+            mydb.rollback()
+        if not rejects:
+            # The rows only fail together (e.g. a duplicate within the grid itself)
+            rejects.append({"Row": None, "Reason": statement_error})
+        return 0, rejects
+
+
+# Checkbox value of grid rows until it is changed, as in the single-record form
+BOOL_DEFAULT = True
+
+
+# Editor column for each kind of value, so the grid types cells as they are entered
+def _grid_column_config(table_name):
+    config = {}
+    for column in tables.INSERT_COLUMNS[table_name]:
+        kind = tables.COLUMN_KINDS.get(column, "text")
+        rule = validation.rule(table_name, column)
+        if rule is not None and rule.kind == "choice":
+            config[column] = st.column_config.SelectboxColumn(column, options=rule.choices)
+        elif kind == "int":
+            config[column] = st.column_config.NumberColumn(column, min_value=1, step=1)
+        elif kind == "decimal":
+            config[column] = st.column_config.NumberColumn(column, min_value=0, format="%.2f")
+        elif kind == "date":
+            config[column] = st.column_config.DateColumn(column)
+        elif kind == "time":
+            config[column] = st.column_config.TimeColumn(column)
+        elif kind == "bool":
+            config[column] = st.column_config.CheckboxColumn(column, default=BOOL_DEFAULT)
+        else:
+            config[column] = st.column_config.TextColumn(column)
+    return config
+
+
+# Blank grid rows; checkboxes start at BOOL_DEFAULT, since an untouched checkbox
+# shows a value and cannot be left empty
+def _empty_grid(table_name, rows):
+    dtypes = {"int": "Int64", "decimal": "float64", "bool": "boolean"}
+    grid = {}
+    for column in tables.INSERT_COLUMNS[table_name]:
+        kind = tables.COLUMN_KINDS.get(column)
+        value = BOOL_DEFAULT if kind == "bool" else None
+        grid[column] = pd.Series([value] * rows, dtype=dtypes.get(kind, object))
+    return pd.DataFrame(grid)
+
+
+# BATCH CREATE page section --------------------------------------------------------------------------
+def show_batch_create(table_name):
+    st.markdown(f"### Create several records in the {table_name} table")
+    st.write(
+        "Enter one record per row; add rows with the + below the grid. "
+        "All rows are validated together and saved in a single transaction."
+    )
+    edited = st.data_editor(
+        _empty_grid(table_name, 5),
+        column_config=_grid_column_config(table_name),
+        num_rows="dynamic",
+        hide_index=True,
+        key=f"batch_grid_{table_name}",
+    )
+    if not st.button("Create Records"):
+        return
+
+    # Rows left completely blank are ignored; checkboxes always hold a value, so they do not count
+    entered = [column for column in edited.columns if tables.COLUMN_KINDS.get(column) != "bool"]
+    edited = edited[edited[entered].notna().any(axis=1)].reset_index(drop=True)
+    if edited.empty:
+        st.error("Please enter at least one record.")
+        return
+
+    rows, rejects = prepare_rows(table_name, edited)
+    if rejects:
+        st.error(f"{len(rejects)} of {len(edited)} rows are not valid; nothing was saved.")
+        st.dataframe(pd.DataFrame(rejects))
+        return
+
+    try:
+        inserted, rejects = insert_all_or_none(table_name, rows)
+    except mysql.connector.Error as err:
+        st.error(f"Error: {err}")
+        return
+    if rejects:
+        st.error(f"{len(rejects)} of {len(rows)} rows were rejected; nothing was saved.")
+        st.dataframe(pd.DataFrame(rejects))
+        return
+
+    result_cache.bump_table_version(table_name)
+    st.success(f"{inserted} records successfully created in the {table_name} table.")
+
+
+# BULK IMPORT page section ---------------------------------------------------------------------------
+def show_bulk_import(table_name):
+    st.markdown(f"### Bulk import records into the {table_name} table")
+    columns = tables.INSERT_COLUMNS[table_name]
+    st.write("Upload a CSV or Parquet file with the columns " + ", ".join(f"`{c}`" for c in columns))
+
+    uploaded_file = st.file_uploader(
+        "File to import", type=["csv", "parquet"], key=f"bulk_file_{table_name}"
+    )
+    batch_size = int(
+        st.number_input(
+            "Rows per transaction", min_value=1, value=default_batch_size(), step=100
+        )
+    )
+    if uploaded_file is None:
+        return
+
+    try:
+        df = read_upload(uploaded_file)
+    except (ValueError, OSError) as err:
+        st.error(f"Could not read the file: {err}")
+        return
+    st.write(f"{len(df):,} rows in the file")
+    st.dataframe(df.head(20))
+
+    if not st.button("Import Records"):
+        return
+
+    start = time.perf_counter()
+    try:
+        rows, rejects = prepare_rows(table_name, df)
+    except ValueError as err:
+        st.error(f"Error: {err}")
+        return
+
+    progress = st.progress(0.0, text="Importing...")
+    inserted = 0
+    done = 0
+    try:
+        for batch_inserted, batch_rejects in insert_rows(table_name, rows, batch_size):
+            inserted += batch_inserted
+            rejects.extend(batch_rejects)
+            done += batch_inserted + len(batch_rejects)
+            rate = inserted / max(time.perf_counter() - start, 1e-9)
+            progress.progress(
+                done / len(rows), text=f"{done:,} / {len(rows):,} rows ({rate:,.0f} rows/s)"
+            )
+    except mysql.connector.Error as err:
+        st.error(f"Error: {err}")
+    finally:
+        if inserted:
+            result_cache.bump_table_version(table_name)
+    elapsed = time.perf_counter() - start
+
+    st.success(
+        f"Imported {inserted:,} of {len(df):,} rows in {elapsed:.1f} s "
+        f"({inserted / max(elapsed, 1e-9):,.0f} rows/s)."
+    )
+    if rejects:
+        rejects_df = pd.DataFrame(rejects).sort_values("Row", ignore_index=True)
+        st.warning(f"{len(rejects_df):,} rows were rejected.")
+        st.dataframe(rejects_df)
+        st.download_button(
+            "Download rejected rows",
+            rejects_df.to_csv(index=False),
+            file_name=f"{table_name}_rejects.csv",
+            mime="text/csv",
+        )
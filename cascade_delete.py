@@ -0,0 +1,186 @@
+import streamlit as st
+import mysql.connector
+import pandas as pd
+import time
+import db
+import result_cache
+import tables
+import batch_operations
+
+
+# Optional CASCADE_CHUNK_THRESHOLD setting in .streamlit/secrets.toml: cascaded rows
+# above which a delete runs child-first in chunks instead of as one statement (default 1000).
+# The chunks follow the BATCH_* settings of batch_operations, whose BATCH_TXN_SECONDS
+# is the lock-time budget of every committed chunk.
+def _setting(name, default):
+    return type(default)(st.secrets.get(name, default))
+
+
+# Whether deleting a row of table_name can remove rows of other tables
+def has_cascades(table_name):
+    return len(tables.cascade_closure(table_name)) > 1
+
+
+def _row_key(table_name):
+    return tables.ROW_KEYS[table_name]
+
+
+# Longest foreign key path from table_name to every table its deletes cascade to;
+# deleting in decreasing depth removes every child before any of its parents
+def _depths(table_name):
+    closure = tables.cascade_closure(table_name)
+    depths = {table_name: 0}
+    changed = True
+    while changed:
+        changed = False
+        for child, _, parent in tables.FOREIGN_KEYS:
+            if parent in depths and child in closure:
+                depth = depths[parent] + 1
+                if depths.get(child, -1) < depth:
+                    depths[child] = depth
+                    changed = True
+    return depths
+
+
+# WHERE clauses selecting the rows of every cascaded table that go when one row of
+# table_name is deleted, one per foreign key path from table_name: a row goes if any
+# of them matches. Every clause tests one indexed foreign key column against the key
+# of a parent row that goes. Returns {table: [(where, number of record_id parameters)]}.
+def cascade_paths(table_name):
+    depths = _depths(table_name)
+    paths = {table_name: [(f"{_row_key(table_name)} = %s", 1)]}
+    for child in sorted(depths, key=depths.get)[1:]:
+        paths[child] = []
+        for fk_child, column, parent in tables.FOREIGN_KEYS:
+            if fk_child == child and parent in paths:
+                for parent_where, count in paths[parent]:
+                    if parent == table_name:
+                        paths[child].append((f"{column} = %s", count))
+                    else:
+                        paths[child].append(
+                            (
+                                f"{column} IN (SELECT {_row_key(parent)} FROM {parent} "
+                                f"WHERE {parent_where})",
+                                count,
+                            )
+                        )
+    return paths
+
+
+# The paths of every table as one WHERE clause, for statements that also filter by key.
+# Returns {table: (where, number of record_id parameters)}.
+def cascade_predicates(table_name):
+    return {
+        table: (
+            " OR ".join(f"({where})" for where, _ in table_paths),
+            sum(count for _, count in table_paths),
+        )
+        for table, table_paths in cascade_paths(table_name).items()
+    }
+
+
+# SELECT of the keys of the rows of table matched by its paths. OR'd paths keep MySQL
+# from using their indexes, so each path is its own SELECT and UNION drops the rows
+# reached by several. Returns (sql, number of record_id parameters).
+def _keys_query(table, table_paths):
+    selects = [f"SELECT {_row_key(table)} FROM {table} WHERE {where}" for where, _ in table_paths]
+    return " UNION ".join(selects), sum(count for _, count in table_paths)
+
+
+# COUNT(*) query of the rows of every table that go when one row of table_name is
+# deleted. Returns {table: (sql, number of record_id parameters)}.
+def count_queries(table_name):
+    queries = {}
+    for table, table_paths in cascade_paths(table_name).items():
+        if len(table_paths) == 1:
+            where, count = table_paths[0]
+            queries[table] = (f"SELECT COUNT(*) FROM {table} WHERE {where}", count)
+        else:
+            sql, count = _keys_query(table, table_paths)
+            queries[table] = (f"SELECT COUNT(*) FROM ({sql}) AS cascaded", count)
+    return queries
+
+
+# Rows removed per table by deleting record_id from table_name, children first
+# (the record itself last). Returns a list of {"Table", "Rows"} dicts, shared across
+# sessions until a write to one of the cascaded tables.
+def plan(table_name, record_id):
+    def load():
+        depths = _depths(table_name)
+        queries = count_queries(table_name)
+        steps = []
+        with db.get_connection() as mydb, mydb.cursor() as cursor:
+            for table in sorted(depths, key=depths.get, reverse=True):
+                sql, count = queries[table]
+                cursor.execute(sql, [record_id] * count)
+                steps.append({"Table": table, "Rows": cursor.fetchone()[0]})
+        return steps
+
+    return result_cache.cached_read(
+        ("cascade_plan", table_name, str(record_id)), tables.cascade_closure(table_name), load
+    )
+
+
+# Delete record_id and everything cascading from it, one table at a time from the
+# deepest children up, in chunked transactions. Yields (table, rows deleted) after
+# every committed chunk.
+def delete_in_chunks(table_name, record_id, steps):
+    paths = cascade_paths(table_name)
+    predicates = cascade_predicates(table_name)
+    for step in steps:
+        if not step["Rows"]:
+            continue
+        table = step["Table"]
+        where, count = predicates[table]
+        params = [record_id] * count
+        keys_sql, keys_count = _keys_query(table, paths[table])
+        with db.get_connection() as mydb, mydb.cursor() as cursor:
+            cursor.execute(f"{keys_sql} ORDER BY {_row_key(table)}", [record_id] * keys_count)
+            ids = [row[0] for row in cursor.fetchall()]
+        for _, deleted in batch_operations.run_in_chunks(table, ids, where, params):
+            yield table, deleted
+
+
+# CASCADE DELETE page section -----------------------------------------------------------------------
+# Show what deleting the record removes; returns the plan, or None when there is nothing to delete
+def show_plan(table_name, record_id):
+    try:
+        steps = plan(table_name, record_id)
+    except mysql.connector.Error as err:
+        st.error(f"Error: {err}")
+        return None
+    if not steps[-1]["Rows"]:
+        st.warning(f"No record found with ID {record_id} in the {table_name} table.")
+        return None
+    cascaded = sum(step["Rows"] for step in steps[:-1])
+    if cascaded:
+        st.warning(f"Deleting this record also deletes {cascaded:,} related rows:")
+        st.dataframe(pd.DataFrame(steps[:-1]), hide_index=True)
+    return steps
+
+
+# Delete a planned record: small cascades in one statement, large ones child-first in chunks
+def delete_with_plan(table_name, record_id, steps, delete_record):
+    total = sum(step["Rows"] for step in steps)
+    if total - 1 <= _setting("CASCADE_CHUNK_THRESHOLD", 1000):
+        delete_record(table_name, record_id)
+        return
+
+    progress = st.progress(0.0, text="Deleting...")
+    start = time.perf_counter()
+    deleted = 0
+    try:
+        for table, chunk_deleted in delete_in_chunks(table_name, record_id, steps):
+            deleted += chunk_deleted
+            rate = deleted / max(time.perf_counter() - start, 1e-9)
+            progress.progress(
+                min(deleted / total, 1.0),
+                text=f"{table}: {deleted:,} / {total:,} rows ({rate:,.0f} rows/s)",
+            )
+    except mysql.connector.Error as err:
+        st.error(f"Error after {deleted:,} deleted rows: {err}")
+        return
+    st.success(
+        f"Record with ID {record_id} and {deleted - 1:,} related rows deleted "
+        f"in {time.perf_counter() - start:.1f} s."
+    )
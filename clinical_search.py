@@ -0,0 +1,281 @@
+import streamlit as st
+import mysql.connector
+import pandas as pd
+import bisect
+import math
+import re
+import threading
+import time
+import db
+import result_cache
+
+
+# Clinical search over MedicalRecord Diagnosis and Treatment. Searches run against the
+# FULLTEXT index of migrations/0002_clinical_fulltext.sql when the server has it, and
+# otherwise against an in-app inverted index built from the table, kept per process and
+# rebuilt after writes to MedicalRecord. Every word matches as a prefix ("allerg" finds
+# Allergic and Allergy), results are ranked by relevance and read one page at a time.
+# Unlike a LIKE '%term%' search, only the start of a word matches: "ergy" does not
+# find Allergy.
+# Optional CLINICAL_SEARCH_MAX_ROWS setting in .streamlit/secrets.toml: largest
+# MedicalRecord table the in-app index is built for (default 1,000,000).
+def _setting(name, default):
+    return type(default)(st.secrets.get(name, default))
+
+
+PAGE_SIZE = 25
+# Shorter words are not indexed by InnoDB full-text search (innodb_ft_min_token_size)
+MIN_TERM_LENGTH = 3
+FULLTEXT_COLUMNS = "m.Diagnosis, m.Treatment"
+
+_WORD = re.compile(r"\w+")
+
+
+# Search words of a query, lower-cased, without repeats or words too short to index
+def search_terms(text):
+    words = [word for word in _WORD.findall(text.lower()) if len(word) >= MIN_TERM_LENGTH]
+    return list(dict.fromkeys(words))
+
+
+# Whether MedicalRecord has the FULLTEXT index; checked again every few minutes so a
+# migration applied while the app runs is picked up
+@st.cache_resource(show_spinner=False, ttl=300)
+def has_fulltext_index():
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.STATISTICS WHERE TABLE_SCHEMA = DATABASE() "
+            "AND TABLE_NAME = 'MedicalRecord' AND INDEX_TYPE = 'FULLTEXT'"
+        )
+        return cursor.fetchone()[0] > 0
+
+
+# Rows of the given records with the patient's name, in the order of record_ids
+def _fetch_records(record_ids, scores):
+    columns = ["RecordID", "PatientID", "Patient", "Diagnosis", "Treatment", "CreateDate", "Score"]
+    if not record_ids:
+        return pd.DataFrame(columns=columns)
+    placeholders = ", ".join(["%s"] * len(record_ids))
+    df = db.read_dataframe(
+        f"""
+            SELECT m.RecordID, m.PatientID, CONCAT(p.FirstName, ' ', p.LastName) AS Patient,
+                m.Diagnosis, m.Treatment, m.CreateDate
+            FROM MedicalRecord m JOIN Patient p ON p.PatientID = m.PatientID
+            WHERE m.RecordID IN ({placeholders})
+        """,
+        tuple(record_ids),
+    )
+    df["Score"] = df["RecordID"].map(dict(zip(record_ids, scores)))
+    return df.set_index("RecordID").reindex(record_ids).reset_index()[columns]
+
+
+# FULLTEXT SEARCH ------------------------------------------------------------------------------------
+# Boolean-mode expression: every word as a prefix, required when match_all is set
+def _boolean_query(terms, match_all):
+    return " ".join(f"{'+' if match_all else ''}{term}*" for term in terms)
+
+
+# One page of ranked matches and the total number of matches, from the FULLTEXT index
+def _search_fulltext(terms, match_all, page, page_size):
+    expression = _boolean_query(terms, match_all)
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        cursor.execute(
+            f"SELECT COUNT(*) FROM MedicalRecord m "
+            f"WHERE MATCH({FULLTEXT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)",
+            (expression,),
+        )
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"""
+                SELECT m.RecordID, MATCH({FULLTEXT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE) AS Score
+                FROM MedicalRecord m
+                WHERE MATCH({FULLTEXT_COLUMNS}) AGAINST (%s IN BOOLEAN MODE)
+                ORDER BY Score DESC, m.RecordID
+                LIMIT %s OFFSET %s
+            """,
+            (expression, expression, page_size, page * page_size),
+        )
+        ranked = cursor.fetchall()
+    return [row[0] for row in ranked], [round(float(row[1]), 4) for row in ranked], total
+
+
+# IN-APP INDEX ---------------------------------------------------------------------------------------
+# Inverted index of the words of Diagnosis and Treatment: word -> {RecordID: occurrences}.
+# A sorted word list finds every word starting with a search term by bisection.
+class ClinicalIndex:
+    def __init__(self):
+        self.postings = {}
+        self.words = []
+        self.records = 0
+
+    def add(self, record_id, text):
+        self.records += 1
+        for word in _WORD.findall(text.lower()):
+            if len(word) >= MIN_TERM_LENGTH:
+                counts = self.postings.setdefault(word, {})
+                counts[record_id] = counts.get(record_id, 0) + 1
+
+    # Sort the word list once every record has been added
+    def finish(self):
+        self.words = sorted(self.postings)
+
+    # {RecordID: occurrences} of every indexed word starting with term
+    def _prefix_matches(self, term):
+        matches = {}
+        start = bisect.bisect_left(self.words, term)
+        for word in self.words[start:]:
+            if not word.startswith(term):
+                break
+            for record_id, count in self.postings[word].items():
+                matches[record_id] = matches.get(record_id, 0) + count
+        return matches
+
+    # [(RecordID, score)] best first; each term adds tf / (tf + 1.2) weighted by how
+    # rare the term is, a simplified BM25
+    def search(self, terms, match_all):
+        scores = {}
+        matched_terms = {}
+        for term in terms:
+            matches = self._prefix_matches(term)
+            if not matches:
+                continue
+            weight = math.log(1 + (self.records - len(matches) + 0.5) / (len(matches) + 0.5))
+            for record_id, count in matches.items():
+                scores[record_id] = scores.get(record_id, 0.0) + weight * count / (count + 1.2)
+                matched_terms[record_id] = matched_terms.get(record_id, 0) + 1
+        if match_all:
+            scores = {
+                record_id: score
+                for record_id, score in scores.items()
+                if matched_terms[record_id] == len(terms)
+            }
+        return sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+
+
+# Holder of the process's in-app index and the MedicalRecord cache version it was built at
+@st.cache_resource(show_spinner=False)
+def _index_holder():
+    return {"index": None, "version": None, "lock": threading.Lock()}
+
+
+# Read MedicalRecord in chunks into a new ClinicalIndex
+def build_index():
+    index = ClinicalIndex()
+    query = "SELECT RecordID, Diagnosis, Treatment FROM MedicalRecord ORDER BY RecordID"
+    for _, rows in db.iter_query_chunks(query):
+        for record_id, diagnosis, treatment in rows:
+            index.add(record_id, f"{diagnosis} {treatment}")
+    index.finish()
+    return index
+
+
+# The in-app index, rebuilt first when MedicalRecord was written since it was built
+def fallback_index():
+    holder = _index_holder()
+    version = result_cache.get_cache().version("MedicalRecord")
+    with holder["lock"]:
+        if holder["index"] is None or holder["version"] != version:
+            holder["index"] = build_index()
+            holder["version"] = version
+        return holder["index"]
+
+
+# Whether MedicalRecord has outgrown the in-app index; the row estimate is read again
+# every few minutes rather than on every search
+@st.cache_resource(show_spinner=False, ttl=300)
+def _too_large_for_index():
+    with db.get_connection() as mydb, mydb.cursor() as cursor:
+        cursor.execute(
+            "SELECT TABLE_ROWS FROM information_schema.TABLES "
+            "WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = 'MedicalRecord'"
+        )
+        row = cursor.fetchone()
+    return bool(row) and (row[0] or 0) > _setting("CLINICAL_SEARCH_MAX_ROWS", 1_000_000)
+
+
+def _search_fallback(terms, match_all, page, page_size):
+    ranked = fallback_index().search(terms, match_all)
+    page_items = ranked[page * page_size : (page + 1) * page_size]
+    return (
+        [record_id for record_id, _ in page_items],
+        [round(score, 4) for _, score in page_items],
+        len(ranked),
+    )
+
+
+# One page of matches for a search text. Returns a dict with the page DataFrame, the
+# total number of matches and the engine used ("fulltext" or "in-app index").
+def search(text, match_all=True, page=0, page_size=PAGE_SIZE):
+    terms = search_terms(text)
+    if not terms:
+        return {"df": _fetch_records([], []), "total": 0, "engine": None}
+    if has_fulltext_index():
+        engine, run = "fulltext", _search_fulltext
+    elif _too_large_for_index():
+        raise ValueError(
+            "MedicalRecord is too large for the in-app search index; "
+            "apply the FULLTEXT migration with `python -m schema_migrations`."
+        )
+    else:
+        engine, run = "in-app index", _search_fallback
+
+    def load():
+        record_ids, scores, total = run(terms, match_all, page, page_size)
+        return {"df": _fetch_records(record_ids, scores), "total": total, "engine": engine}
+
+    # Pages are shared across sessions until a write to the searched tables
+    return result_cache.cached_read(
+        ("clinical_search", tuple(terms), match_all, page, page_size),
+        ["MedicalRecord", "Patient"],
+        load,
+    )
+
+
+# CLINICAL SEARCH page section ----------------------------------------------------------------------
+def show_clinical_search(key="clinical_search"):
+    text = st.text_input(
+        "Search diagnoses and treatments:",
+        key=f"{key}_text",
+        placeholder="e.g. allerg asthma",
+        help='Words match from their start: "allerg" finds Allergy, "ergy" does not.',
+    )
+    match_all = st.radio(
+        "Match:", ["All words", "Any word"], horizontal=True, key=f"{key}_mode"
+    ) == "All words"
+    if not text.strip():
+        return
+
+    # Start from the first page whenever the search changes
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_last") != (text, match_all):
+        st.session_state[f"{key}_last"] = (text, match_all)
+        st.session_state[page_key] = 0
+    page = st.session_state[page_key]
+
+    start = time.perf_counter()
+    try:
+        result = search(text, match_all, page)
+    except ValueError as err:
+        st.warning(str(err))
+        return
+    except mysql.connector.Error as err:
+        st.error(f"Error: {err}")
+        return
+    elapsed = time.perf_counter() - start
+
+    if not result["total"]:
+        st.info("No medical records match this search.")
+        return
+    st.dataframe(result["df"], hide_index=True)
+    pages = math.ceil(result["total"] / PAGE_SIZE)
+    st.caption(
+        f"Page {page + 1} of {pages}, {result['total']:,} matching records, "
+        f"searched with the {result['engine']} in {elapsed * 1000:.0f} ms"
+    )
+
+    prev_col, next_col = st.columns(2)
+    if prev_col.button("Previous", key=f"{key}_prev", disabled=page == 0):
+        st.session_state[page_key] = page - 1
+        st.rerun()
+    if next_col.button("Next", key=f"{key}_next", disabled=page + 1 >= pages):
+        st.session_state[page_key] = page + 1
+        st.rerun()
@@ -1,16 +1,20 @@
 import streamlit as st
 import mysql.connector
-import re  # For email and phone validation
 import pandas as pd
 import datetime
 import decimal
 from streamlit_lottie import st_lottie
 import json
-
-db_host = st.secrets["DB_HOST"]
-db_user = st.secrets["DB_USER"]
-db_password = st.secrets["DB_PASSWORD"]
-db_name = st.secrets["DB_NAME"]
+import db
+import result_cache
+import tables
+import batch_operations
+import bulk_import
+import cascade_delete
+import clinical_search
+import patient_lookup
+import export
+import validation
 
 # Function to load a Lottie animation from a file
 def load_lottie_file(filepath: str):
@@ -23,186 +27,188 @@ lottie_animation_4 = load_lottie_file(r"img/department.json")
 
 # CREATE A RECORD --------------------------------------------------------------------------------------
 def create_record_in_db(table_name, data):
+    # Same field rules as the update form and the bulk import
+    errors = validation.validate_record(table_name, data)
+    if errors:
+        for message in errors:
+            st.error(message)
+        return
     try:
-        # Connect to MySQL database
-        mydb = mysql.connector.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            database=db_name
-        )
-        cursor = mydb.cursor()
-        # Insert statement for the "Patient" table
-        if table_name == "Patient":
-            query = """
-                INSERT INTO Patient (FirstName, LastName, Gender, DateOfBirth, Address, Phone, Email, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["FirstName"],
-                    data["LastName"],
-                    data["Gender"],
-                    data["DateOfBirth"],
-                    data["Address"],
-                    data["Phone"],
-                    data["Email"],
-                    data["Branch_ID"],
-                ),
-            )
+        # The fixed templates below run as server-side prepared statements
+        with db.get_connection() as mydb, db.prepared_cursor(mydb) as cursor:
+            # Insert statement for the "Patient" table
+            if table_name == "Patient":
+                query = """
+                    INSERT INTO Patient (FirstName, LastName, Gender, DateOfBirth, Address, Phone, Email, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["FirstName"],
+                        data["LastName"],
+                        data["Gender"],
+                        data["DateOfBirth"],
+                        data["Address"],
+                        data["Phone"],
+                        data["Email"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "Hospital_Branch" table
-        elif table_name == "Hospital_Branch":
-            query = """
-                INSERT INTO Hospital_Branch (Branch_Name, Branch_Address, Branch_Phone_Number, State, Zip_Code)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["Branch_Name"],
-                    data["Branch_Address"],
-                    data["Branch_Phone_Number"],
-                    data["State"],
-                    data["Zip_Code"],
-                ),
-            )
+            # Insert statement for the "Hospital_Branch" table
+            elif table_name == "Hospital_Branch":
+                query = """
+                    INSERT INTO Hospital_Branch (Branch_Name, Branch_Address, Branch_Phone_Number, State, Zip_Code)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["Branch_Name"],
+                        data["Branch_Address"],
+                        data["Branch_Phone_Number"],
+                        data["State"],
+                        data["Zip_Code"],
+                    ),
+                )
 
-        # Insert statement for the "Department" table
-        elif table_name == "Department":
-            query = """
-                INSERT INTO Department (DepartmentName, Location, Branch_ID)
-                VALUES (%s, %s, %s)
-            """
-            cursor.execute(
-                query, (data["DepartmentName"], data["Location"], data["Branch_ID"])
-            )
+            # Insert statement for the "Department" table
+            elif table_name == "Department":
+                query = """
+                    INSERT INTO Department (DepartmentName, Location, Branch_ID)
+                    VALUES (%s, %s, %s)
+                """
+                cursor.execute(
+                    query, (data["DepartmentName"], data["Location"], data["Branch_ID"])
+                )
 
-        # Insert statement for the "Doctor" table
-        elif table_name == "Doctor":
-            query = """
-                INSERT INTO Doctor (FirstName, LastName, Phone, Email, DepartmentID, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["FirstName"],
-                    data["LastName"],
-                    data["Phone"],
-                    data["Email"],
-                    data["DepartmentID"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "Doctor" table
+            elif table_name == "Doctor":
+                query = """
+                    INSERT INTO Doctor (FirstName, LastName, Phone, Email, DepartmentID, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["FirstName"],
+                        data["LastName"],
+                        data["Phone"],
+                        data["Email"],
+                        data["DepartmentID"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "Nurse" table
-        elif table_name == "Nurse":
-            query = """
-                INSERT INTO Nurse (FirstName, LastName, Phone, Email, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["FirstName"],
-                    data["LastName"],
-                    data["Phone"],
-                    data["Email"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "Nurse" table
+            elif table_name == "Nurse":
+                query = """
+                    INSERT INTO Nurse (FirstName, LastName, Phone, Email, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["FirstName"],
+                        data["LastName"],
+                        data["Phone"],
+                        data["Email"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "Appointment" table
-        elif table_name == "Appointment":
-            query = """
-                INSERT INTO Appointment (PatientID, DoctorID, AppointmentDate, AppointmentTime, ReasonForVisit, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["PatientID"],
-                    data["DoctorID"],
-                    data["AppointmentDate"],
-                    data["AppointmentTime"],
-                    data["ReasonForVisit"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "Appointment" table
+            elif table_name == "Appointment":
+                query = """
+                    INSERT INTO Appointment (PatientID, DoctorID, AppointmentDate, AppointmentTime, ReasonForVisit, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["PatientID"],
+                        data["DoctorID"],
+                        data["AppointmentDate"],
+                        data["AppointmentTime"],
+                        data["ReasonForVisit"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "MedicalRecord" table
-        elif table_name == "MedicalRecord":
-            query = """
-                INSERT INTO MedicalRecord (PatientID, DoctorID, Diagnosis, Treatment, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["PatientID"],
-                    data["DoctorID"],
-                    data["Diagnosis"],
-                    data["Treatment"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "MedicalRecord" table
+            elif table_name == "MedicalRecord":
+                query = """
+                    INSERT INTO MedicalRecord (PatientID, DoctorID, Diagnosis, Treatment, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["PatientID"],
+                        data["DoctorID"],
+                        data["Diagnosis"],
+                        data["Treatment"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "Room" table
-        elif table_name == "Room":
-            query = """
-                INSERT INTO Room (RoomNumber, RoomType, Availability, Branch_ID)
-                VALUES (%s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["RoomNumber"],
-                    data["RoomType"],
-                    data["Availability"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "Room" table
+            elif table_name == "Room":
+                query = """
+                    INSERT INTO Room (RoomNumber, RoomType, Availability, Branch_ID)
+                    VALUES (%s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["RoomNumber"],
+                        data["RoomType"],
+                        data["Availability"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "HospitalStay" table
-        elif table_name == "HospitalStay":
-            query = """
-                INSERT INTO HospitalStay (PatientID, RoomID, AdmitDate, DischargeDate, AssignedNurseID, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["PatientID"],
-                    data["RoomID"],
-                    data["AdmitDate"],
-                    data["DischargeDate"],
-                    data["AssignedNurseID"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "HospitalStay" table
+            elif table_name == "HospitalStay":
+                query = """
+                    INSERT INTO HospitalStay (PatientID, RoomID, AdmitDate, DischargeDate, AssignedNurseID, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["PatientID"],
+                        data["RoomID"],
+                        data["AdmitDate"],
+                        data["DischargeDate"],
+                        data["AssignedNurseID"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Insert statement for the "Billing" table
-        elif table_name == "Billing":
-            query = """
-                INSERT INTO Billing (PatientID, TotalAmount, PaymentDate, PaymentMethod, Branch_ID)
-                VALUES (%s, %s, %s, %s, %s)
-            """
-            cursor.execute(
-                query,
-                (
-                    data["PatientID"],
-                    data["TotalAmount"],
-                    data["PaymentDate"],
-                    data["PaymentMethod"],
-                    data["Branch_ID"],
-                ),
-            )
+            # Insert statement for the "Billing" table
+            elif table_name == "Billing":
+                query = """
+                    INSERT INTO Billing (PatientID, TotalAmount, PaymentDate, PaymentMethod, Branch_ID)
+                    VALUES (%s, %s, %s, %s, %s)
+                """
+                cursor.execute(
+                    query,
+                    (
+                        data["PatientID"],
+                        data["TotalAmount"],
+                        data["PaymentDate"],
+                        data["PaymentMethod"],
+                        data["Branch_ID"],
+                    ),
+                )
 
-        # Commit the transaction
-        mydb.commit()
-        st.success(f"Record successfully created in the {table_name} table.")
+            # Commit the transaction
+            mydb.commit()
+            result_cache.bump_table_version(table_name)
+            patient_lookup.record_write(table_name, [cursor.lastrowid], mydb)
+            st.success(f"Record successfully created in the {table_name} table.")
     except mysql.connector.Error as err:
         # Provide more detailed error messages for specific errors
         if err.errno == 1062:
@@ -215,356 +221,421 @@ def create_record_in_db(table_name, data):
             )
         else:
             st.error(f"Error: {err}")
-    finally:
-        if mydb.is_connected():
-            cursor.close()
-            mydb.close()
 
 
 # READ records ----------------------------------------------------------------------------------------
+# Fetch one page of a table by seeking on its primary key, so only page_size rows are ever loaded
+def fetch_table_page(table_name, page_size, direction="first", key=None):
+    primary_key_column = tables.PRIMARY_KEYS[table_name]
+    if direction == "next":
+        where, order = f"WHERE {primary_key_column} > %s", "ASC"
+    elif direction == "prev":
+        where, order = f"WHERE {primary_key_column} < %s", "DESC"
+    elif direction == "jump":
+        where, order = f"WHERE {primary_key_column} >= %s", "ASC"
+    elif direction == "last":
+        where, order = "", "DESC"
+    else:
+        where, order = "", "ASC"
+
+    # Ask for one extra row to learn whether another page exists in this direction
+    query = f"SELECT * FROM {table_name} {where} ORDER BY {primary_key_column} {order} LIMIT %s"
+    params = (key, page_size + 1) if where else (page_size + 1,)
+
+    def load():
+        df = db.read_dataframe(query, params)
+        has_more = len(df) > page_size
+        df = df.iloc[:page_size]
+        if order == "DESC":
+            df = df.iloc[::-1]
+        return df.reset_index(drop=True), has_more
+
+    # Pages are shared across sessions until a write to the table invalidates them
+    return result_cache.cached_read(
+        ("table_page", table_name, page_size, direction, key), [table_name], load
+    )
+
+
+# Cheap row count estimate from InnoDB statistics instead of COUNT(*) over the whole table
+def estimate_row_count(table_name):
+    query = """
+        SELECT TABLE_ROWS FROM information_schema.TABLES
+        WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = %s
+    """
+    def load():
+        with db.get_connection() as mydb, mydb.cursor() as cursor:
+            cursor.execute(query, (table_name,))
+            row = cursor.fetchone()
+        return row[0] if row and row[0] is not None else 0
+
+    return result_cache.cached_read(("row_estimate", table_name), [table_name], load)
+
+
 def read_table_from_db(table_name):
-    try:
-        # Connect to MySQL database
-        mydb = mysql.connector.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            database=db_name
+    primary_key_column = tables.PRIMARY_KEYS[table_name]
+
+    # Keep the current page position per table across reruns
+    state_key = f"browse_{table_name}"
+    if state_key not in st.session_state:
+        st.session_state[state_key] = {
+            "direction": "first",
+            "key": None,
+            "first_id": None,
+            "last_id": None,
+            "has_prev": False,
+            "has_next": False,
+        }
+    browse = st.session_state[state_key]
+
+    # Page size and navigation controls
+    size_col, jump_col, go_col = st.columns([1, 2, 1])
+    with size_col:
+        page_size = st.selectbox(
+            "Rows per page", [25, 50, 100, 250, 500], index=1, key=f"page_size_{table_name}"
         )
-        cursor = mydb.cursor()
-        # SQL query to read the entire table
-        query = f"SELECT * FROM {table_name}"
-        cursor.execute(query)
+    with jump_col:
+        jump_id = st.text_input(f"Jump to {primary_key_column}", key=f"jump_{table_name}")
+    with go_col:
+        st.write("")
+        jump_clicked = st.button("Go", key=f"go_{table_name}")
+
+    # The page buttons are drawn after the fetch below, so they are enabled by this page's
+    # has_prev / has_next; their callbacks move the position before the next run fetches
+    def move(direction, boundary=None):
+        browse.update(direction=direction, key=browse[boundary] if boundary else None)
+
+    first_col, prev_col, next_col, last_col = st.columns(4)
+    if jump_clicked:
+        if jump_id.isdigit():
+            browse.update(direction="jump", key=int(jump_id))
+        else:
+            st.error(f"{primary_key_column} must be a positive number.")
 
-        # Fetch all rows and column names
-        rows = cursor.fetchall()
-        columns = [desc[0] for desc in cursor.description]
+    try:
+        df, has_more = fetch_table_page(
+            table_name, page_size, browse["direction"], browse["key"]
+        )
+        # Stepping back past the first row lands on the first page
+        if browse["direction"] == "prev" and not has_more:
+            browse.update(direction="first", key=None)
+            df, has_more = fetch_table_page(table_name, page_size)
 
-        # Create a DataFrame for better display in Streamlit
-        df = pd.DataFrame(rows, columns=columns)
+        if browse["direction"] in ("prev", "last"):
+            browse["has_prev"], browse["has_next"] = has_more, browse["direction"] == "prev"
+        else:
+            browse["has_prev"], browse["has_next"] = browse["direction"] != "first", has_more
+
+        if not df.empty:
+            browse["first_id"] = int(df[primary_key_column].iloc[0])
+            browse["last_id"] = int(df[primary_key_column].iloc[-1])
+
+        first_col.button("First", key=f"first_{table_name}", on_click=move, args=("first",))
+        prev_col.button(
+            "Previous",
+            key=f"prev_{table_name}",
+            disabled=not browse["has_prev"],
+            on_click=move,
+            args=("prev", "first_id"),
+        )
+        next_col.button(
+            "Next",
+            key=f"next_{table_name}",
+            disabled=not browse["has_next"],
+            on_click=move,
+            args=("next", "last_id"),
+        )
+        last_col.button("Last", key=f"last_{table_name}", on_click=move, args=("last",))
 
         # Display the data
         st.write(f"Displaying data from {table_name} table:")
         st.dataframe(df)
+        if not df.empty:
+            st.caption(
+                f"{primary_key_column} {browse['first_id']} to {browse['last_id']} "
+                f"of about {estimate_row_count(table_name):,} rows"
+            )
+        else:
+            st.info(f"No records found in the {table_name} table for this page.")
+
+        # Export the whole table, streamed from MySQL in chunks when the download is clicked
+        export.show_export(
+            f"SELECT * FROM {table_name} ORDER BY {primary_key_column}",
+            name=table_name,
+            key=f"export_{table_name}",
+        )
 
     except mysql.connector.Error as err:
         st.error(f"Error: {err}")
 
-    finally:
-        if mydb.is_connected():
-            cursor.close()
-            mydb.close()
-
 
 # UPDATE a record ------------------------------------------------------------------------------------
 def get_record_data(table_name, primary_key_column, record_id):
     try:
-        # Connect to the MySQL database
-        mydb = mysql.connector.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            database=db_name
-        )
-        cursor = mydb.cursor(
-            dictionary=True
-        )  # Use dictionary=True to get column names with values
-
-        # Create a dynamic query to fetch the record data
-        query = f"SELECT * FROM {table_name} WHERE {primary_key_column} = %s"
-        cursor.execute(query, (record_id,))
-        record_data = cursor.fetchone()
+        # Use dictionary=True to get column names with values
+        with db.get_connection() as mydb, mydb.cursor(dictionary=True) as cursor:
+            # Create a dynamic query to fetch the record data
+            query = f"SELECT * FROM {table_name} WHERE {primary_key_column} = %s"
+            cursor.execute(query, (record_id,))
+            record_data = cursor.fetchone()
 
-        return record_data
+            return record_data
 
     except mysql.connector.Error as err:
         st.error(f"Error: {err}")
         return None
-    finally:
-        if mydb.is_connected():
-            cursor.close()
-            mydb.close()
 
 
 def update_record_in_db(table_name, record_id, updated_data):
     if table_name == "Please choose a table":
         st_lottie(lottie_animation_4, height=300, width=300)
         return  # Exit the function early if the table is not selected
+    # Same field rules as the create form and the bulk import
+    errors = validation.validate_record(table_name, updated_data)
+    if errors:
+        for message in errors:
+            st.error(message)
+        return
     try:
-        # Connect to MySQL database
-        mydb = mysql.connector.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            database=db_name
-        )
-        cursor = mydb.cursor()
-
-        # Update statement for the "Patient" table
-        if table_name == "Patient":
-            query = """
-                UPDATE Patient
-                SET FirstName = %s, LastName = %s, Gender = %s, DateOfBirth = %s, 
-                    Address = %s, Phone = %s, Email = %s, Branch_ID = %s
-                WHERE PatientID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["FirstName"],
-                    updated_data["LastName"],
-                    updated_data["Gender"],
-                    updated_data["DateOfBirth"],
-                    updated_data["Address"],
-                    updated_data["Phone"],
-                    updated_data["Email"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+        # The fixed templates below run as server-side prepared statements
+        with db.get_connection() as mydb, db.prepared_cursor(mydb) as cursor:
+            # Update statement for the "Patient" table
+            if table_name == "Patient":
+                query = """
+                    UPDATE Patient
+                    SET FirstName = %s, LastName = %s, Gender = %s, DateOfBirth = %s, 
+                        Address = %s, Phone = %s, Email = %s, Branch_ID = %s
+                    WHERE PatientID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["FirstName"],
+                        updated_data["LastName"],
+                        updated_data["Gender"],
+                        updated_data["DateOfBirth"],
+                        updated_data["Address"],
+                        updated_data["Phone"],
+                        updated_data["Email"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Doctor" table
-        elif table_name == "Doctor":
-            query = """
-                UPDATE Doctor
-                SET FirstName = %s, LastName = %s, Phone = %s, Email = %s, DepartmentID = %s, Branch_ID = %s
-                WHERE DoctorID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["FirstName"],
-                    updated_data["LastName"],
-                    updated_data["Phone"],
-                    updated_data["Email"],
-                    updated_data["DepartmentID"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Doctor" table
+            elif table_name == "Doctor":
+                query = """
+                    UPDATE Doctor
+                    SET FirstName = %s, LastName = %s, Phone = %s, Email = %s, DepartmentID = %s, Branch_ID = %s
+                    WHERE DoctorID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["FirstName"],
+                        updated_data["LastName"],
+                        updated_data["Phone"],
+                        updated_data["Email"],
+                        updated_data["DepartmentID"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Appointment" table
-        elif table_name == "Appointment":
-            query = """
-                UPDATE Appointment
-                SET PatientID = %s, DoctorID = %s, AppointmentDate = %s, AppointmentTime = %s, ReasonForVisit = %s, Branch_ID = %s
-                WHERE AppointmentID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["PatientID"],
-                    updated_data["DoctorID"],
-                    updated_data["AppointmentDate"],
-                    updated_data["AppointmentTime"],
-                    updated_data["ReasonForVisit"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Appointment" table
+            elif table_name == "Appointment":
+                query = """
+                    UPDATE Appointment
+                    SET PatientID = %s, DoctorID = %s, AppointmentDate = %s, AppointmentTime = %s, ReasonForVisit = %s, Branch_ID = %s
+                    WHERE AppointmentID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["PatientID"],
+                        updated_data["DoctorID"],
+                        updated_data["AppointmentDate"],
+                        updated_data["AppointmentTime"],
+                        updated_data["ReasonForVisit"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Hospital_Branch" table
-        elif table_name == "Hospital_Branch":
-            query = """
-                UPDATE Hospital_Branch
-                SET Branch_Name = %s, Branch_Address = %s, Branch_Phone_Number = %s, State = %s, Zip_Code = %s
-                WHERE Branch_ID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["Branch_Name"],
-                    updated_data["Branch_Address"],
-                    updated_data["Branch_Phone_Number"],
-                    updated_data["State"],
-                    updated_data["Zip_Code"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Hospital_Branch" table
+            elif table_name == "Hospital_Branch":
+                query = """
+                    UPDATE Hospital_Branch
+                    SET Branch_Name = %s, Branch_Address = %s, Branch_Phone_Number = %s, State = %s, Zip_Code = %s
+                    WHERE Branch_ID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["Branch_Name"],
+                        updated_data["Branch_Address"],
+                        updated_data["Branch_Phone_Number"],
+                        updated_data["State"],
+                        updated_data["Zip_Code"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Department" table
-        elif table_name == "Department":
-            query = """
-                UPDATE Department
-                SET DepartmentName = %s, Location = %s, Branch_ID = %s
-                WHERE DepartmentID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["DepartmentName"],
-                    updated_data["Location"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Department" table
+            elif table_name == "Department":
+                query = """
+                    UPDATE Department
+                    SET DepartmentName = %s, Location = %s, Branch_ID = %s
+                    WHERE DepartmentID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["DepartmentName"],
+                        updated_data["Location"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Nurse" table
-        elif table_name == "Nurse":
-            query = """
-                UPDATE Nurse
-                SET FirstName = %s, LastName = %s, Phone = %s, Email = %s, Branch_ID = %s
-                WHERE NurseID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["FirstName"],
-                    updated_data["LastName"],
-                    updated_data["Phone"],
-                    updated_data["Email"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Nurse" table
+            elif table_name == "Nurse":
+                query = """
+                    UPDATE Nurse
+                    SET FirstName = %s, LastName = %s, Phone = %s, Email = %s, Branch_ID = %s
+                    WHERE NurseID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["FirstName"],
+                        updated_data["LastName"],
+                        updated_data["Phone"],
+                        updated_data["Email"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "MedicalRecord" table
-        elif table_name == "MedicalRecord":
-            query = """
-                UPDATE MedicalRecord
-                SET PatientID = %s, DoctorID = %s, Diagnosis = %s, Treatment = %s, Branch_ID = %s
-                WHERE RecordID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["PatientID"],
-                    updated_data["DoctorID"],
-                    updated_data["Diagnosis"],
-                    updated_data["Treatment"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "MedicalRecord" table
+            elif table_name == "MedicalRecord":
+                query = """
+                    UPDATE MedicalRecord
+                    SET PatientID = %s, DoctorID = %s, Diagnosis = %s, Treatment = %s, Branch_ID = %s
+                    WHERE RecordID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["PatientID"],
+                        updated_data["DoctorID"],
+                        updated_data["Diagnosis"],
+                        updated_data["Treatment"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Room" table
-        elif table_name == "Room":
-            query = """
-                UPDATE Room
-                SET RoomNumber = %s, RoomType = %s, Availability = %s, Branch_ID = %s
-                WHERE RoomID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["RoomNumber"],
-                    updated_data["RoomType"],
-                    updated_data["Availability"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Room" table
+            elif table_name == "Room":
+                query = """
+                    UPDATE Room
+                    SET RoomNumber = %s, RoomType = %s, Availability = %s, Branch_ID = %s
+                    WHERE RoomID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["RoomNumber"],
+                        updated_data["RoomType"],
+                        updated_data["Availability"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "HospitalStay" table
-        elif table_name == "HospitalStay":
-            query = """
-                UPDATE HospitalStay
-                SET PatientID = %s, RoomID = %s, AdmitDate = %s, DischargeDate = %s, AssignedNurseID = %s, Branch_ID = %s
-                WHERE StayID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["PatientID"],
-                    updated_data["RoomID"],
-                    updated_data["AdmitDate"],
-                    updated_data["DischargeDate"],
-                    updated_data["AssignedNurseID"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "HospitalStay" table
+            elif table_name == "HospitalStay":
+                query = """
+                    UPDATE HospitalStay
+                    SET PatientID = %s, RoomID = %s, AdmitDate = %s, DischargeDate = %s, AssignedNurseID = %s, Branch_ID = %s
+                    WHERE StayID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["PatientID"],
+                        updated_data["RoomID"],
+                        updated_data["AdmitDate"],
+                        updated_data["DischargeDate"],
+                        updated_data["AssignedNurseID"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Update statement for the "Billing" table
-        elif table_name == "Billing":
-            query = """
-                UPDATE Billing
-                SET PatientID = %s, TotalAmount = %s, PaymentDate = %s, PaymentMethod = %s, Branch_ID = %s
-                WHERE BillID = %s
-            """
-            cursor.execute(
-                query,
-                (
-                    updated_data["PatientID"],
-                    updated_data["TotalAmount"],
-                    updated_data["PaymentDate"],
-                    updated_data["PaymentMethod"],
-                    updated_data["Branch_ID"],
-                    record_id,
-                ),
-            )
+            # Update statement for the "Billing" table
+            elif table_name == "Billing":
+                query = """
+                    UPDATE Billing
+                    SET PatientID = %s, TotalAmount = %s, PaymentDate = %s, PaymentMethod = %s, Branch_ID = %s
+                    WHERE BillID = %s
+                """
+                cursor.execute(
+                    query,
+                    (
+                        updated_data["PatientID"],
+                        updated_data["TotalAmount"],
+                        updated_data["PaymentDate"],
+                        updated_data["PaymentMethod"],
+                        updated_data["Branch_ID"],
+                        record_id,
+                    ),
+                )
 
-        # Commit the transaction
-        mydb.commit()
-        st.success(f"Record in the {table_name} table successfully updated.")
+            # Commit the transaction
+            mydb.commit()
+            result_cache.bump_table_version(table_name)
+            patient_lookup.record_write(table_name, [record_id], mydb)
+            st.success(f"Record in the {table_name} table successfully updated.")
     except mysql.connector.Error as err:
         st.error(f"Error: {err}")
-    finally:
-        if mydb.is_connected():
-            cursor.close()
-            mydb.close()
 
 
 # DELETE a record ------------------------------------------------------------------------------------
 def delete_record_in_db(table_name, record_id):
     try:
-        # Connect to MySQL database
-        mydb = mysql.connector.connect(
-            host=db_host,
-            user=db_user,
-            password=db_password,
-            database=db_name
-        )
-        cursor = mydb.cursor()
-
-        # Define the primary keys for different tables
-        primary_keys = {
-            "Doctor": "DoctorID",
-            "Patient": "PatientID",
-            "Appointment": "AppointmentID",
-            "Hospital_Branch": "Branch_ID",
-            "Department": "DepartmentID",
-            "Nurse": "NurseID",
-            "MedicalRecord": "RecordID",
-            "Room": "RoomID",
-            "HospitalStay": "StayID",
-            "Billing": "BillID",
-        }
-
-        # Ensure the table has a defined primary key
-        if table_name in primary_keys:
-            primary_key_column = primary_keys[table_name]
-
-            # Create the delete query
-            query = f"DELETE FROM {table_name} WHERE {primary_key_column} = %s"
-            cursor.execute(query, (record_id,))
-
-            # Commit the transaction
-            mydb.commit()
+        with db.get_connection() as mydb, mydb.cursor() as cursor:
+            # Ensure the table has a defined primary key
+            if table_name in tables.PRIMARY_KEYS:
+                primary_key_column = tables.PRIMARY_KEYS[table_name]
+
+                # Create the delete query
+                query = f"DELETE FROM {table_name} WHERE {primary_key_column} = %s"
+                cursor.execute(query, (record_id,))
+
+                # Commit the transaction
+                mydb.commit()
+
+                # Check if any rows were affected (to verify deletion)
+                if cursor.rowcount > 0:
+                    result_cache.bump_table_version(table_name)
+                    patient_lookup.record_write(table_name, [record_id], mydb)
+                    st.success(
+                        f"Record with ID {record_id} successfully deleted from the {table_name} table."
+                    )
+                else:
+                    st.warning(
+                        f"No record found with ID {record_id} in the {table_name} table."
+                    )
 
-            # Check if any rows were affected (to verify deletion)
-            if cursor.rowcount > 0:
-                st.success(
-                    f"Record with ID {record_id} successfully deleted from the {table_name} table."
-                )
             else:
-                st.warning(
-                    f"No record found with ID {record_id} in the {table_name} table."
+                st.error(
+                    "Invalid table selected or table does not have a defined primary key."
                 )
 
-        else:
-            st.error(
-                "Invalid table selected or table does not have a defined primary key."
-            )
-
     except mysql.connector.Error as err:
         st.error(f"Error: {err}")
 
-    finally:
-        if mydb.is_connected():
-            cursor.close()
-            mydb.close()
-
 
 # -----------------------------------------------------------------------------------------------------
 
@@ -613,9 +684,13 @@ def show_crud_operations():
     crud_operations = [
         "Please choose an operation",
         "Create a new record",
+        "Create several records",
         "Read records",
         "Update an existing record",
         "Delete a record",
+        "Bulk import records",
+        "Batch update records",
+        "Batch delete records",
     ]
 
     # Use st.session_state to keep track of the selected operation
@@ -628,7 +703,7 @@ def show_crud_operations():
 
     # Sidebar 2: Table Selection
     st.sidebar.markdown("## Select Table")
-    tables = [
+    table_options = [
         "Please choose a table",
         "Patient",
         "Doctor",
@@ -649,7 +724,7 @@ def show_crud_operations():
     # Use st.session_state to keep track of the selected table
     selected_table = st.sidebar.selectbox(
         "Choose a table to operate on:",
-        tables,
+        table_options,
         key="selected_table",
     )
 
@@ -672,29 +747,28 @@ def show_crud_operations():
         elif selected_table == "Patient":
             st.markdown(f"### Create a new record in the {selected_table} table")
             first_name = st.text_input("First Name").capitalize()
-            valid_first_name = first_name.isalpha()
+            valid_first_name = validation.is_valid("Patient", "FirstName", first_name)
             if not valid_first_name:
-                st.error("First name must contain only alphabetic characters.")
+                st.error(validation.message("Patient", "FirstName"))
 
             last_name = st.text_input("Last Name").capitalize()
-            valid_last_name = last_name.isalpha()
+            valid_last_name = validation.is_valid("Patient", "LastName", last_name)
             if not valid_last_name:
-                st.error("Last name must contain only alphabetic characters.")
+                st.error(validation.message("Patient", "LastName"))
 
             gender = st.selectbox("Gender", ["Male", "Female", "Other"])
             date_of_birth = st.date_input("Date of Birth")
             address = st.text_input("Address")
 
             phone = st.text_input("Phone (Format: 123-456-7890)")
-            phone_pattern = r"^\d{3}-\d{3}-\d{4}$"
-            valid_phone = re.match(phone_pattern, phone) is not None
+            valid_phone = validation.is_valid("Patient", "Phone", phone)
             if not valid_phone:
-                st.error("Phone number must be in the format: 123-456-7890.")
+                st.error(validation.message("Patient", "Phone"))
 
             email = st.text_input("Email")
-            valid_email = re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
+            valid_email = validation.is_valid("Patient", "Email", email)
             if not valid_email:
-                st.error("Invalid email format.")
+                st.error(validation.message("Patient", "Email"))
 
             branch_id = st.number_input(
                 "Branch ID (1 or 2)", min_value=1, max_value=2, step=1
@@ -723,32 +797,33 @@ def show_crud_operations():
         elif selected_table == "Hospital_Branch":
             st.markdown(f"### Create a new record in the {selected_table} table")
             branch_name = st.text_input("Branch Name")
-            valid_branch_name = bool(re.match(r"^[a-zA-Z\s]+$", branch_name))
+            valid_branch_name = validation.is_valid(
+                "Hospital_Branch", "Branch_Name", branch_name
+            )
             if not valid_branch_name and branch_name:
-                st.error(
-                    "Branch name must contain only alphabetic characters and spaces."
-                )
+                st.error(validation.message("Hospital_Branch", "Branch_Name"))
 
             branch_address = st.text_input("Branch Address")
             branch_phone_number = st.text_input(
                 "Branch Phone Number (Format: 123-456-7891)"
             )
-            phone_pattern = r"^\d{3}-\d{3}-\d{4}$"
-            valid_branch_phone_number = (
-                re.match(phone_pattern, branch_phone_number) is not None
+            valid_branch_phone_number = validation.is_valid(
+                "Hospital_Branch", "Branch_Phone_Number", branch_phone_number
             )
             if not valid_branch_phone_number and branch_phone_number:
-                st.error("Phone number must be in the format: 123-456-7891.")
+                st.error(validation.message("Hospital_Branch", "Branch_Phone_Number"))
 
             state = st.text_input("State")
-            valid_state = state.isalpha() if state else False
+            valid_state = validation.is_valid("Hospital_Branch", "State", state)
             if not valid_state and state:
-                st.error("State must contain only alphabetic characters.")
+                st.error(validation.message("Hospital_Branch", "State"))
 
             zip_code = st.text_input("Zip Code")
-            valid_zip_code = zip_code.isdigit() if zip_code else False
+            valid_zip_code = validation.is_valid(
+                "Hospital_Branch", "Zip_Code", zip_code
+            )
             if not valid_zip_code and zip_code:
-                st.error("Zip code must be numeric.")
+                st.error(validation.message("Hospital_Branch", "Zip_Code"))
 
             if (
                 st.button("Create Record")
@@ -770,14 +845,16 @@ def show_crud_operations():
         elif selected_table == "Department":
             st.markdown(f"### Create a new record in the {selected_table} table")
             department_name = st.text_input("Department Name").upper()
-            valid_department_name = bool(re.match(r"^[A-Z\s]+$", department_name))
+            valid_department_name = validation.is_valid(
+                "Department", "DepartmentName", department_name
+            )
             if not valid_department_name and department_name:
-                st.error("Department name must contain only alphabetic characters.")
+                st.error(validation.message("Department", "DepartmentName"))
 
             location = st.text_input("Location")
-            valid_location = location.isalpha() if location else False
+            valid_location = validation.is_valid("Department", "Location", location)
             if not valid_location and location:
-                st.error("Location must contain only alphabetic characters.")
+                st.error(validation.message("Department", "Location"))
 
             branch_id = st.number_input(
                 "Branch ID (1 or 2)", min_value=1, max_value=2, step=1
@@ -799,33 +876,34 @@ def show_crud_operations():
                 first_name = st.text_input("First Name")
                 if first_name:
                     first_name = first_name.capitalize()
-                valid_first_name = first_name.isalpha() if first_name else False
+                valid_first_name = validation.is_valid(
+                    "Doctor", "FirstName", first_name
+                )
                 if not valid_first_name and first_name:
-                    st.error("First name must contain only alphabetic characters.")
+                    st.error(validation.message("Doctor", "FirstName"))
 
             # Container for Last Name
             with st.container():
                 last_name = st.text_input("Last Name")
                 if last_name:
                     last_name = last_name.capitalize()
-                valid_last_name = last_name.isalpha() if last_name else False
+                valid_last_name = validation.is_valid("Doctor", "LastName", last_name)
                 if not valid_last_name and last_name:
-                    st.error("Last name must contain only alphabetic characters.")
+                    st.error(validation.message("Doctor", "LastName"))
 
             # Container for Phone Number with validation
             with st.container():
                 phone = st.text_input("Phone (Format: 123-456-7890)")
-                phone_pattern = r"^\d{3}-\d{3}-\d{4}$"
-                valid_phone = re.match(phone_pattern, phone) is not None
+                valid_phone = validation.is_valid("Doctor", "Phone", phone)
                 if not valid_phone and phone:
-                    st.error("Phone number must be in the format: 123-456-7890.")
+                    st.error(validation.message("Doctor", "Phone"))
 
             # Container for Email with validation
             with st.container():
                 email = st.text_input("Email")
-                valid_email = re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
+                valid_email = validation.is_valid("Doctor", "Email", email)
                 if not valid_email and email:
-                    st.error("Invalid email format.")
+                    st.error(validation.message("Doctor", "Email"))
 
             # Container for Department ID (1 to 10)
             with st.container():
@@ -866,33 +944,32 @@ def show_crud_operations():
                 first_name = st.text_input("First Name")
                 if first_name:
                     first_name = first_name.capitalize()
-                valid_first_name = first_name.isalpha() if first_name else False
+                valid_first_name = validation.is_valid("Nurse", "FirstName", first_name)
                 if not valid_first_name and first_name:
-                    st.error("First name must contain only alphabetic characters.")
+                    st.error(validation.message("Nurse", "FirstName"))
 
             # Container for Last Name
             with st.container():
                 last_name = st.text_input("Last Name")
                 if last_name:
                     last_name = last_name.capitalize()
-                valid_last_name = last_name.isalpha() if last_name else False
+                valid_last_name = validation.is_valid("Nurse", "LastName", last_name)
                 if not valid_last_name and last_name:
-                    st.error("Last name must contain only alphabetic characters.")
+                    st.error(validation.message("Nurse", "LastName"))
 
             # Container for Phone Number with validation
             with st.container():
                 phone = st.text_input("Phone (Format: 123-456-7890)")
-                phone_pattern = r"^\d{3}-\d{3}-\d{4}$"
-                valid_phone = re.match(phone_pattern, phone) is not None
+                valid_phone = validation.is_valid("Nurse", "Phone", phone)
                 if not valid_phone and phone:
-                    st.error("Phone number must be in the format: 123-456-7890.")
+                    st.error(validation.message("Nurse", "Phone"))
 
             # Container for Email with validation
             with st.container():
                 email = st.text_input("Email")
-                valid_email = re.match(r"[^@]+@[^@]+\.[^@]+", email) is not None
+                valid_email = validation.is_valid("Nurse", "Email", email)
                 if not valid_email and email:
-                    st.error("Invalid email format.")
+                    st.error(validation.message("Nurse", "Email"))
 
             # Container for Branch ID (1 or 2)
             with st.container():
@@ -924,16 +1001,20 @@ def show_crud_operations():
             # Container for Patient ID with validation
             with st.container():
                 patient_id = st.text_input("Patient ID")
-                valid_patient_id = patient_id.isdigit() and int(patient_id) > 0
+                valid_patient_id = validation.is_valid(
+                    "Appointment", "PatientID", patient_id
+                )
                 if not valid_patient_id and patient_id:
-                    st.error("Patient ID must be a positive number.")
+                    st.error(validation.message("Appointment", "PatientID"))
 
             # Container for Doctor ID with validation
             with st.container():
                 doctor_id = st.text_input("Doctor ID")
-                valid_doctor_id = doctor_id.isdigit() and int(doctor_id) > 0
+                valid_doctor_id = validation.is_valid(
+                    "Appointment", "DoctorID", doctor_id
+                )
                 if not valid_doctor_id and doctor_id:
-                    st.error("Doctor ID must be a positive number.")
+                    st.error(validation.message("Appointment", "DoctorID"))
 
             # Container for Appointment Date
             with st.container():
@@ -947,8 +1028,10 @@ def show_crud_operations():
             with st.container():
                 reason_for_visit = st.text_area("Reason for Visit")
                 if not reason_for_visit.strip():
-                    st.error("Reason for visit cannot be empty.")
-                valid_reason = bool(reason_for_visit.strip())
+                    st.error(validation.message("Appointment", "ReasonForVisit"))
+                valid_reason = validation.is_valid(
+                    "Appointment", "ReasonForVisit", reason_for_visit
+                )
 
             # Container for Branch ID (1 or 2)
             with st.container():
@@ -980,30 +1063,38 @@ def show_crud_operations():
             # Container for Patient ID with validation
             with st.container():
                 patient_id = st.text_input("Patient ID")
-                valid_patient_id = patient_id.isdigit() and int(patient_id) > 0
+                valid_patient_id = validation.is_valid(
+                    "MedicalRecord", "PatientID", patient_id
+                )
                 if not valid_patient_id and patient_id:
-                    st.error("Patient ID must be a positive number.")
+                    st.error(validation.message("MedicalRecord", "PatientID"))
 
             # Container for Doctor ID with validation
             with st.container():
                 doctor_id = st.text_input("Doctor ID")
-                valid_doctor_id = doctor_id.isdigit() and int(doctor_id) > 0
+                valid_doctor_id = validation.is_valid(
+                    "MedicalRecord", "DoctorID", doctor_id
+                )
                 if not valid_doctor_id and doctor_id:
-                    st.error("Doctor ID must be a positive number.")
+                    st.error(validation.message("MedicalRecord", "DoctorID"))
 
             # Container for Diagnosis
             with st.container():
                 diagnosis = st.text_area("Diagnosis")
                 if not diagnosis.strip():
-                    st.error("Diagnosis cannot be empty.")
-                valid_diagnosis = bool(diagnosis.strip())
+                    st.error(validation.message("MedicalRecord", "Diagnosis"))
+                valid_diagnosis = validation.is_valid(
+                    "MedicalRecord", "Diagnosis", diagnosis
+                )
 
             # Container for Treatment
             with st.container():
                 treatment = st.text_area("Treatment")
                 if not treatment.strip():
-                    st.error("Treatment cannot be empty.")
-                valid_treatment = bool(treatment.strip())
+                    st.error(validation.message("MedicalRecord", "Treatment"))
+                valid_treatment = validation.is_valid(
+                    "MedicalRecord", "Treatment", treatment
+                )
 
             # Container for Branch ID (1 or 2)
             with st.container():
@@ -1035,16 +1126,18 @@ def show_crud_operations():
             # Container for Room Number
             with st.container():
                 room_number = st.text_input("Room Number")
-                valid_room_number = bool(room_number.strip())
+                valid_room_number = validation.is_valid(
+                    "Room", "RoomNumber", room_number
+                )
                 if not valid_room_number:
-                    st.error("Room number cannot be empty.")
+                    st.error(validation.message("Room", "RoomNumber"))
 
             # Container for Room Type
             with st.container():
                 room_type = st.text_input("Room Type")
-                valid_room_type = room_type.isalpha() if room_type else False
+                valid_room_type = validation.is_valid("Room", "RoomType", room_type)
                 if not valid_room_type:
-                    st.error("Room type must contain only alphabetic characters.")
+                    st.error(validation.message("Room", "RoomType"))
 
             # Container for Availability
             with st.container():
@@ -1072,16 +1165,18 @@ def show_crud_operations():
             # Container for Patient ID with validation
             with st.container():
                 patient_id = st.text_input("Patient ID")
-                valid_patient_id = patient_id.isdigit() and int(patient_id) > 0
+                valid_patient_id = validation.is_valid(
+                    "HospitalStay", "PatientID", patient_id
+                )
                 if not valid_patient_id and patient_id:
-                    st.error("Patient ID must be a positive number.")
+                    st.error(validation.message("HospitalStay", "PatientID"))
 
             # Container for Room ID with validation
             with st.container():
                 room_id = st.text_input("Room ID")
-                valid_room_id = room_id.isdigit() and int(room_id) > 0
+                valid_room_id = validation.is_valid("HospitalStay", "RoomID", room_id)
                 if not valid_room_id and room_id:
-                    st.error("Room ID must be a positive number.")
+                    st.error(validation.message("HospitalStay", "RoomID"))
 
             # Container for Admit Date
             with st.container():
@@ -1097,11 +1192,11 @@ def show_crud_operations():
             # Container for Assigned Nurse ID with validation
             with st.container():
                 assigned_nurse_id = st.text_input("Assigned Nurse ID")
-                valid_nurse_id = (
-                    assigned_nurse_id.isdigit() and int(assigned_nurse_id) > 0
+                valid_nurse_id = validation.is_valid(
+                    "HospitalStay", "AssignedNurseID", assigned_nurse_id
                 )
                 if not valid_nurse_id and assigned_nurse_id:
-                    st.error("Assigned Nurse ID must be a positive number.")
+                    st.error(validation.message("HospitalStay", "AssignedNurseID"))
 
             # Container for Branch ID
             with st.container():
@@ -1134,18 +1229,22 @@ def show_crud_operations():
             # Container for Patient ID with validation
             with st.container():
                 patient_id = st.text_input("Patient ID")
-                valid_patient_id = patient_id.isdigit() and int(patient_id) > 0
+                valid_patient_id = validation.is_valid(
+                    "Billing", "PatientID", patient_id
+                )
                 if not valid_patient_id and patient_id:
-                    st.error("Patient ID must be a positive number.")
+                    st.error(validation.message("Billing", "PatientID"))
 
             # Container for Total Amount with validation
             with st.container():
                 total_amount = st.text_input("Total Amount")
                 try:
                     total_amount = float(total_amount)
-                    valid_total_amount = total_amount > 0
+                    valid_total_amount = validation.is_valid(
+                        "Billing", "TotalAmount", total_amount
+                    )
                     if not valid_total_amount:
-                        st.error("Total amount must be a positive number.")
+                        st.error(validation.message("Billing", "TotalAmount"))
                 except ValueError:
                     valid_total_amount = False
                     if total_amount:
@@ -1157,15 +1256,10 @@ def show_crud_operations():
 
             # Container for Payment Method (Dropdown with four options)
             with st.container():
-                payment_method = st.selectbox(
-                    "Payment Method", ["Cash", "Credit", "Debit", "Insurance"]
+                payment_method = st.selectbox("Payment Method", validation.PAYMENT_METHODS)
+                valid_payment_method = validation.is_valid(
+                    "Billing", "PaymentMethod", payment_method
                 )
-                valid_payment_method = payment_method in [
-                    "Cash",
-                    "Credit",
-                    "Debit",
-                    "Insurance",
-                ]
 
             # Container for Branch ID
             with st.container():
@@ -1190,12 +1284,22 @@ def show_crud_operations():
                 # Call the function to create the record in the database
                 create_record_in_db(selected_table, data)
 
+    # CREATE several records at once from an editable grid ------------------------------------------
+    elif selected_operation == "Create several records":
+        if selected_table == "Please choose a table":
+            return
+        else:
+            bulk_import.show_batch_create(selected_table)
+
     # READ records-----------------------------------------------------------------------------
     elif selected_operation == "Read records":
         if selected_table == "Please choose a table":
             return
         else:
             st.markdown(f"### Displaying records from the {selected_table} table")
+            if selected_table == "MedicalRecord":
+                with st.expander("Clinical search", expanded=True):
+                    clinical_search.show_clinical_search(key="crud_clinical_search")
             read_table_from_db(selected_table)
 
     # UPDATE a record---------------------------------------------------------------------------
@@ -1207,25 +1311,16 @@ def show_crud_operations():
 
             # Specify the ID of the record to update
             record_id = st.text_input(
-                f"Enter the ID of the {selected_table} record to update"
+                f"Enter the ID of the {selected_table} record to update",
+                key="update_record_id",
             )
+            # Patients can be looked up by name, phone or email instead
+            if selected_table == "Patient":
+                with st.expander("Find the patient", expanded=not record_id):
+                    patient_lookup.show_patient_picker("update_record_id", key="update_lookup")
 
-            # Define primary keys for different tables
-            primary_keys = {
-                "Doctor": "DoctorID",
-                "Patient": "PatientID",
-                "Appointment": "AppointmentID",
-                "Hospital_Branch": "Branch_ID",
-                "Department": "DepartmentID",
-                "Nurse": "NurseID",
-                "MedicalRecord": "RecordID",
-                "Room": "RoomID",
-                "HospitalStay": "StayID",
-                "Billing": "BillID",
-            }
-
-            if selected_table in primary_keys and record_id:
-                primary_key_column = primary_keys[selected_table]
+            if selected_table in tables.PRIMARY_KEYS and record_id:
+                primary_key_column = tables.PRIMARY_KEYS[selected_table]
                 record_data = get_record_data(
                     selected_table, primary_key_column, record_id
                 )
@@ -1595,13 +1690,8 @@ def show_crud_operations():
                             value=pd.to_datetime(record_data["PaymentDate"]),
                         )
 
-                        # Define possible payment methods and get the current payment method
-                        payment_methods = [
-                            "Credit Card",
-                            "Debit Card",
-                            "Cash",
-                            "Insurance",
-                        ]
+                        # Possible payment methods and the current payment method
+                        payment_methods = validation.PAYMENT_METHODS
                         current_payment_method = record_data["PaymentMethod"]
 
                         # Use try...except to handle cases where current_payment_method is not in payment_methods
@@ -1646,12 +1736,40 @@ def show_crud_operations():
 
             # Specify the ID of the record to delete
             record_id = st.text_input(
-                f"Enter the ID of the {selected_table} record to delete"
+                f"Enter the ID of the {selected_table} record to delete",
+                key="delete_record_id",
             )
+            if selected_table == "Patient":
+                with st.expander("Find the patient", expanded=not record_id):
+                    patient_lookup.show_patient_picker("delete_record_id", key="delete_lookup")
+
+            # Deletes that cascade to other tables are planned and counted first
+            if cascade_delete.has_cascades(selected_table) and record_id.isdigit():
+                steps = cascade_delete.show_plan(selected_table, int(record_id))
+                if steps and st.button("Delete Record"):
+                    cascade_delete.delete_with_plan(
+                        selected_table, int(record_id), steps, delete_record_in_db
+                    )
 
             # Button to delete the record
-            if st.button("Delete Record"):
+            elif st.button("Delete Record"):
                 if record_id:
                     delete_record_in_db(selected_table, record_id)
                 else:
                     st.error("Please provide a valid record ID.")
+
+    # BULK IMPORT records from a file --------------------------------------------------------------
+    elif selected_operation == "Bulk import records":
+        if selected_table == "Please choose a table":
+            return
+        else:
+            bulk_import.show_bulk_import(selected_table)
+
+    # BATCH UPDATE or DELETE records by ID list or filter ---------------------------------------------
+    elif selected_operation in ("Batch update records", "Batch delete records"):
+        if selected_table == "Please choose a table":
+            return
+        else:
+            batch_operations.show_batch_operation(
+                selected_table, selected_operation.split()[1]
+            )
@@ -0,0 +1,465 @@
+import streamlit as st
+import mysql.connector
+import pandas as pd
+import pyarrow as pa
+from mysql.connector import errors
+import atexit
+import threading
+import time
+from collections import OrderedDict, deque
+from contextlib import closing, contextmanager
+
+
+# Optional pool settings in .streamlit/secrets.toml:
+#   DB_POOL_SIZE     maximum number of open connections (default 10)
+#   DB_POOL_TIMEOUT  seconds to wait for a free connection (default 10)
+#   DB_POOL_PING     ping idle connections before handing them out (default true)
+#   DB_POOL_RECYCLE  reconnect connections older than this many seconds (default 1800)
+#   DB_FETCH_CHUNK_SIZE   rows fetched per round trip when streaming results (default 5000)
+#   DB_DISPLAY_MAX_ROWS   rows rendered on screen for a streamed result (default 10000)
+#   DB_PREPARED_CACHE_SIZE  prepared statements kept open per connection (default 32)
+
+
+# Read an optional pool setting from st.secrets, falling back to a default
+def _setting(name, default):
+    value = st.secrets.get(name, default)
+    if isinstance(default, bool) and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return type(default)(value)
+
+
+# Process-wide pool of MySQL connections shared by every page and session
+class ConnectionPool:
+    def __init__(
+        self,
+        size,
+        checkout_timeout,
+        ping_on_borrow,
+        recycle_seconds,
+        prepared_cache_size=32,
+        **connect_args,
+    ):
+        self.size = size
+        self.checkout_timeout = checkout_timeout
+        self.ping_on_borrow = ping_on_borrow
+        self.recycle_seconds = recycle_seconds
+        self.prepared_cache_size = prepared_cache_size
+        self.connect_args = connect_args
+
+        self._lock = threading.Condition()
+        self._idle = deque()  # (connection, created_at) pairs ready to be borrowed
+        self._created_at = {}  # id(connection) -> creation time of borrowed connections
+        self._statements = {}  # id(connection) -> StatementCache of that connection
+        self._open = 0  # connections currently alive, idle or in use
+        self._in_use = 0
+        self._started = time.monotonic()
+        self._recent_creates = deque()  # creation timestamps for the last minute
+        self.total_created = 0
+        self.total_checkouts = 0
+        self.total_waits = 0
+        self.total_wait_seconds = 0.0
+        self.total_timeouts = 0
+        self.total_discarded = 0
+        self.total_prepares = 0
+        self.total_prepared_executions = 0
+
+    def _connect(self):
+        conn = mysql.connector.connect(**self.connect_args)
+        now = time.monotonic()
+        with self._lock:
+            self.total_created += 1
+            self._recent_creates.append(now)
+        return conn, now
+
+    def _discard(self, conn):
+        try:
+            conn.close()
+        except errors.Error:
+            pass
+        with self._lock:
+            # Prepared statements die with their connection; a replacement re-prepares
+            self._statements.pop(id(conn), None)
+            self.total_discarded += 1
+
+    # Prepared statement cache of a borrowed connection, created on first use
+    def statement_cache(self, conn):
+        with self._lock:
+            cache = self._statements.get(id(conn))
+            if cache is None:
+                cache = StatementCache(self, conn, self.prepared_cache_size)
+                self._statements[id(conn)] = cache
+            return cache
+
+    # Borrow a connection, waiting up to checkout_timeout seconds when the pool is exhausted
+    def acquire(self):
+        deadline = time.monotonic() + self.checkout_timeout
+        waited = False
+        wait_started = None
+        with self._lock:
+            while not self._idle and self._open >= self.size:
+                if not waited:
+                    waited = True
+                    wait_started = time.monotonic()
+                    self.total_waits += 1
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self.total_timeouts += 1
+                    self.total_wait_seconds += time.monotonic() - wait_started
+                    raise errors.PoolError(
+                        f"No free database connection after {self.checkout_timeout} seconds "
+                        f"(pool size {self.size})."
+                    )
+                self._lock.wait(remaining)
+            if waited:
+                self.total_wait_seconds += time.monotonic() - wait_started
+
+            entry = self._idle.pop() if self._idle else None
+            # Reserve the slot before leaving the lock so concurrent callers respect the size
+            self._open += 0 if entry else 1
+            self._in_use += 1
+            self.total_checkouts += 1
+
+        try:
+            if entry is None:
+                conn, created_at = self._connect()
+            else:
+                conn, created_at = entry
+                if time.monotonic() - created_at > self.recycle_seconds:
+                    self._discard(conn)
+                    conn, created_at = self._connect()
+                elif self.ping_on_borrow:
+                    try:
+                        conn.ping(reconnect=False)
+                    except errors.Error:
+                        self._discard(conn)
+                        conn, created_at = self._connect()
+        except Exception:
+            with self._lock:
+                self._open -= 1
+                self._in_use -= 1
+                self._lock.notify()
+            raise
+
+        with self._lock:
+            self._created_at[id(conn)] = created_at
+        return conn
+
+    # Return a borrowed connection; unfinished transactions are rolled back first.
+    # discard=True closes it instead, e.g. when an unbuffered result was left half-read.
+    def release(self, conn, discard=False):
+        healthy = not discard
+        try:
+            if healthy and conn.in_transaction:
+                conn.rollback()
+        except errors.Error:
+            healthy = False
+
+        if not healthy:
+            self._discard(conn)
+        with self._lock:
+            created_at = self._created_at.pop(id(conn), time.monotonic())
+            self._in_use -= 1
+            if healthy:
+                self._idle.append((conn, created_at))
+            else:
+                self._open -= 1
+            self._lock.notify()
+
+    def close_all(self):
+        with self._lock:
+            idle = list(self._idle)
+            self._idle.clear()
+            self._open -= len(idle)
+        for conn, _ in idle:
+            self._discard(conn)
+
+    def stats(self):
+        with self._lock:
+            now = time.monotonic()
+            while self._recent_creates and now - self._recent_creates[0] > 60:
+                self._recent_creates.popleft()
+            return {
+                "size": self.size,
+                "open": self._open,
+                "in_use": self._in_use,
+                "idle": len(self._idle),
+                "checkouts": self.total_checkouts,
+                "waits": self.total_waits,
+                "avg_wait_ms": (
+                    1000 * self.total_wait_seconds / self.total_waits if self.total_waits else 0.0
+                ),
+                "timeouts": self.total_timeouts,
+                "created": self.total_created,
+                "created_last_minute": len(self._recent_creates),
+                "created_per_minute": 60 * self.total_created / max(now - self._started, 1.0),
+                "discarded": self.total_discarded,
+                "prepares": self.total_prepares,
+                "prepared_executions": self.total_prepared_executions,
+            }
+
+
+# Create the shared pool on first use so importing a page never touches MySQL.
+# st.cache_resource keeps a single pool per process across reruns and sessions,
+# and its idle connections are closed when the server shuts down.
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    pool = ConnectionPool(
+        size=_setting("DB_POOL_SIZE", 10),
+        checkout_timeout=_setting("DB_POOL_TIMEOUT", 10.0),
+        ping_on_borrow=_setting("DB_POOL_PING", True),
+        recycle_seconds=_setting("DB_POOL_RECYCLE", 1800.0),
+        prepared_cache_size=_setting("DB_PREPARED_CACHE_SIZE", 32),
+        host=st.secrets["DB_HOST"],
+        user=st.secrets["DB_USER"],
+        password=st.secrets["DB_PASSWORD"],
+        database=st.secrets["DB_NAME"],
+    )
+    atexit.register(pool.close_all)
+    return pool
+
+
+# Process-wide count of script reruns, used to show that reruns do not open connections
+@st.cache_resource(show_spinner=False)
+def _rerun_counter():
+    return {"reruns": 0, "lock": threading.Lock()}
+
+
+def record_rerun():
+    counter = _rerun_counter()
+    with counter["lock"]:
+        counter["reruns"] += 1
+
+
+def rerun_count():
+    return _rerun_counter()["reruns"]
+
+
+# Borrow a pooled connection for the duration of a with-block
+@contextmanager
+def get_connection():
+    pool = get_pool()
+    conn = pool.acquire()
+    try:
+        yield conn
+    finally:
+        pool.release(conn)
+
+
+# Sidebar panel with live pool metrics
+def show_pool_stats():
+    stats = get_pool().stats()
+    with st.sidebar.expander("Connection pool"):
+        st.write(f"In use: **{stats['in_use']}** / {stats['size']} (idle {stats['idle']})")
+        st.write(f"Checkouts: {stats['checkouts']}")
+        st.write(f"Waits: {stats['waits']} (avg {stats['avg_wait_ms']:.1f} ms, timeouts {stats['timeouts']})")
+        st.write(
+            f"Connections created: {stats['created']} "
+            f"({stats['created_last_minute']} in the last minute, "
+            f"{stats['created_per_minute']:.2f}/min overall)"
+        )
+        reruns = rerun_count()
+        st.write(
+            f"Script reruns: {reruns} "
+            f"({stats['created'] / max(reruns, 1):.3f} connections opened per rerun)"
+        )
+        st.write(
+            f"Prepared statements: {stats['prepared_executions']} executions, "
+            f"{stats['prepares']} prepares"
+        )
+
+
+# PREPARED STATEMENTS ----------------------------------------------------------------------------------
+# MySQL errors after which a cached statement handle must be prepared again:
+# unknown statement handler (e.g. after a server restart) and table definition changed
+_REPREPARE_ERRORS = (1243, 1615)
+
+
+# Server-side prepared statements of one pooled connection, one prepared cursor per
+# distinct query text. Later calls with the same text reuse the handle, so MySQL parses
+# each template once per connection instead of on every call. The cache is dropped
+# together with its connection, so statements are re-prepared after a reconnect.
+class StatementCache:
+    def __init__(self, pool, conn, max_statements):
+        self.pool = pool
+        self.conn = conn
+        self.max_statements = max_statements
+        self._cursors = OrderedDict()  # query text -> (query, prepared cursor), in LRU order
+
+    def _cursor(self, query):
+        entry = self._cursors.get(query)
+        if entry is not None:
+            self._cursors.move_to_end(query)
+            return entry
+        # The cursor re-prepares whenever it is handed a different string object,
+        # so the first object seen for a query text is the one always passed back
+        entry = (query, self.conn.cursor(prepared=True))
+        self._cursors[query] = entry
+        with self.pool._lock:
+            self.pool.total_prepares += 1
+        if len(self._cursors) > self.max_statements:
+            _, (_, oldest) = self._cursors.popitem(last=False)
+            oldest.close()
+        return entry
+
+    def _forget(self, query):
+        _, cursor = self._cursors.pop(query)
+        try:
+            cursor.close()
+        except errors.Error:
+            pass
+
+    # Execute query with params on its prepared statement and return the cursor
+    def execute(self, query, params=()):
+        try:
+            query, cursor = self._cursor(query)
+            cursor.execute(query, params)
+        except errors.DatabaseError as err:
+            if err.errno not in _REPREPARE_ERRORS:
+                raise
+            self._forget(query)
+            query, cursor = self._cursor(query)
+            cursor.execute(query, params)
+        with self.pool._lock:
+            self.pool.total_prepared_executions += 1
+        return cursor
+
+
+# Cursor-like wrapper for a with-block whose execute() goes through the connection's
+# prepared statement cache; rowcount and lastrowid describe the last statement
+class PreparedCursor:
+    def __init__(self, conn):
+        self._cache = get_pool().statement_cache(conn)
+        self._last = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def execute(self, query, params=()):
+        self._last = self._cache.execute(query, params)
+
+    @property
+    def rowcount(self):
+        return self._last.rowcount if self._last is not None else -1
+
+    @property
+    def lastrowid(self):
+        return self._last.lastrowid if self._last is not None else None
+
+
+# Use in place of conn.cursor() for fixed INSERT/UPDATE templates
+def prepared_cursor(conn):
+    return PreparedCursor(conn)
+
+
+# Rows read by the storage engine in a session so far, from the Handler_read_* counters;
+# the difference across a statement is the number of rows it examined
+def session_rows_read(cursor):
+    cursor.execute("SHOW SESSION STATUS LIKE 'Handler_read%'")
+    return sum(int(value) for _, value in cursor.fetchall())
+
+
+# STREAMING READS --------------------------------------------------------------------------------------
+# Yield the rows of an executed cursor chunk by chunk with fetchmany()
+def iter_cursor_chunks(cursor, chunk_size=None):
+    chunk_size = chunk_size or _setting("DB_FETCH_CHUNK_SIZE", 5000)
+    while True:
+        rows = cursor.fetchmany(chunk_size)
+        if not rows:
+            return
+        yield rows
+
+
+# Run a query on a pooled, unbuffered cursor and yield (columns, rows) chunks.
+# At least one (possibly empty) chunk is yielded for every result set, so callers
+# always learn the column names; statements without a result set yield nothing.
+# When a timings dict is given, connect, execute and fetch seconds are added to it;
+# when a description list is given, it receives the cursor's column descriptions.
+def iter_query_chunks(query, params=None, chunk_size=None, timings=None, description=None):
+    timings = {} if timings is None else timings
+    pool = get_pool()
+    start = time.perf_counter()
+    conn = pool.acquire()
+    timings["Connect"] = timings.get("Connect", 0.0) + time.perf_counter() - start
+    in_result = False
+    cursor = None
+    try:
+        cursor = conn.cursor()
+        start = time.perf_counter()
+        cursor.execute(query, params)
+        timings["Execute"] = timings.get("Execute", 0.0) + time.perf_counter() - start
+        if cursor.description is None:
+            return
+        columns = [desc[0] for desc in cursor.description]
+        if description is not None:
+            description[:] = cursor.description
+
+        in_result = True
+        empty = True
+        chunks = iter_cursor_chunks(cursor, chunk_size)
+        while True:
+            start = time.perf_counter()
+            rows = next(chunks, None)
+            timings["Fetch"] = timings.get("Fetch", 0.0) + time.perf_counter() - start
+            if rows is None:
+                break
+            empty = False
+            yield columns, rows
+        if empty:
+            yield columns, []
+        in_result = False
+    finally:
+        if cursor is not None and not in_result:
+            cursor.close()
+        # A half-read unbuffered result cannot be reused, so that connection is dropped
+        pool.release(conn, discard=in_result)
+
+
+# Stream a query as one DataFrame per fetched chunk
+def iter_dataframes(query, params=None, columns=None, chunk_size=None, timings=None):
+    timings = {} if timings is None else timings
+    for result_columns, rows in iter_query_chunks(query, params, chunk_size, timings):
+        start = time.perf_counter()
+        df = pd.DataFrame(rows, columns=columns or result_columns)
+        timings["DataFrame"] = timings.get("DataFrame", 0.0) + time.perf_counter() - start
+        yield df
+
+
+# Stream a query as Arrow record batches, one per fetched chunk
+def iter_arrow_batches(query, params=None, columns=None, chunk_size=None):
+    for df in iter_dataframes(query, params, columns, chunk_size):
+        yield pa.RecordBatch.from_pandas(df, preserve_index=False)
+
+
+# Build a DataFrame chunk by chunk, so the full list of row tuples never exists at once
+def read_dataframe(query, params=None, columns=None, chunk_size=None, timings=None):
+    frames = list(iter_dataframes(query, params, columns, chunk_size, timings))
+    if not frames:
+        return pd.DataFrame(columns=columns)
+    return pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+
+
+# Render a stream of DataFrames, keeping at most max_rows of them in memory.
+# Returns the number of rows shown and whether the result was cut off.
+def show_dataframe_stream(frames, max_rows=None):
+    max_rows = max_rows or _setting("DB_DISPLAY_MAX_ROWS", 10000)
+    shown = []
+    shown_rows = 0
+    truncated = False
+    with closing(frames):
+        for df in frames:
+            if shown_rows + len(df) > max_rows:
+                df = df.iloc[: max_rows - shown_rows]
+                truncated = True
+            shown.append(df)
+            shown_rows += len(df)
+            if truncated:
+                break
+
+    if shown:
+        st.dataframe(pd.concat(shown, ignore_index=True) if len(shown) > 1 else shown[0])
+    if truncated:
+        st.info(f"Showing the first {max_rows:,} rows of a larger result.")
+    return shown_rows, truncated
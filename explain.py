@@ -0,0 +1,108 @@
+import streamlit as st
+import pandas as pd
+import json
+import query_governor
+
+
+# Walk an EXPLAIN FORMAT=JSON document and collect one row per table access.
+# Filesorts and temporary tables are reported on the operation that needs them;
+# like the tabular EXPLAIN, they are shown on the first table read beneath it.
+def _collect_tables(node, rows, pending=None):
+    pending = [] if pending is None else pending
+    if isinstance(node, list):
+        for item in node:
+            _collect_tables(item, rows, pending)
+        return
+    if not isinstance(node, dict):
+        return
+
+    if node.get("using_filesort"):
+        pending.append("filesort")
+    if node.get("using_temporary_table"):
+        pending.append("temporary table")
+
+    table = node.get("table")
+    if isinstance(table, dict) and "table_name" in table:
+        access_type = table.get("access_type", "")
+        flags = []
+        if access_type == "ALL":
+            flags.append("full table scan")
+        elif access_type == "index":
+            flags.append("full index scan")
+        flags.extend(pending)
+        pending.clear()
+        cost_info = table.get("cost_info", {})
+        rows.append(
+            {
+                "Table": table["table_name"],
+                "Access type": access_type,
+                "Possible keys": ", ".join(table.get("possible_keys", [])),
+                "Key": table.get("key", ""),
+                "Rows examined": table.get("rows_examined_per_scan"),
+                "Rows produced": table.get("rows_produced_per_join"),
+                "Filtered %": table.get("filtered"),
+                "Cost": cost_info.get("prefix_cost"),
+                "Flags": ", ".join(dict.fromkeys(flags)),
+                "Condition": table.get("attached_condition", ""),
+                "Used columns": ", ".join(table.get("used_columns", [])),
+            }
+        )
+
+    # Nested loops, unions and subqueries (including derived tables under a table entry)
+    for value in node.values():
+        _collect_tables(value, rows, pending)
+
+
+# One dict per table access of an EXPLAIN FORMAT=JSON plan (the rows of the plan table)
+def plan_tables(plan):
+    rows = []
+    _collect_tables(plan, rows)
+    return rows
+
+
+# EXPLAIN FORMAT=JSON of a single statement on an open cursor, as a parsed document
+def explain_plan(cursor, sql, params=None):
+    sql = query_governor.single_statement(sql, query_governor.EXPLAINABLE_STATEMENTS)
+    cursor.execute(f"EXPLAIN FORMAT=JSON {sql}", params or None)
+    return json.loads(cursor.fetchone()[0])
+
+
+# Run EXPLAIN FORMAT=JSON on a query in a governed read-only session and return
+# (plan DataFrame, total cost, raw JSON)
+def explain_json(sql, params=None):
+    sql = query_governor.single_statement(sql, query_governor.EXPLAINABLE_STATEMENTS)
+    with query_governor.read_only_cursor() as cursor:
+        plan = explain_plan(cursor, sql, params)
+    query_cost = plan.get("query_block", {}).get("cost_info", {}).get("query_cost")
+    return pd.DataFrame(plan_tables(plan)), query_cost, plan
+
+
+# Run EXPLAIN ANALYZE on a read-only query and return the measured plan tree as text.
+# The query is really executed, so only a single SELECT-style statement is accepted,
+# in a governed read-only session; timeout_ms (when given) replaces the governor's
+# MAX_EXECUTION_TIME.
+def explain_analyze(sql, params=None, timeout_ms=None):
+    sql = query_governor.single_statement(sql)
+    with query_governor.read_only_cursor() as cursor:
+        if timeout_ms:
+            cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {int(timeout_ms)}")
+        cursor.execute(f"EXPLAIN ANALYZE {sql}", params or None)
+        return "\n".join(row[0] for row in cursor.fetchall())
+
+
+# Plan preview: estimated rows, access type and index per table, with full scans
+# and filesorts called out before the query itself is run
+def show_plan(sql, params=None, analyze=False, timeout_ms=None):
+    plan_df, query_cost, plan = explain_json(sql, params)
+    if query_cost is not None:
+        st.write(f"Estimated query cost: **{query_cost}**")
+
+    flagged = plan_df[plan_df["Flags"] != ""] if not plan_df.empty else plan_df
+    for _, row in flagged.iterrows():
+        st.warning(f"`{row['Table']}`: {row['Flags']}")
+    st.dataframe(plan_df)
+    with st.expander("EXPLAIN FORMAT=JSON"):
+        st.json(plan)
+
+    if analyze:
+        st.code(explain_analyze(sql, params, timeout_ms), language="text")
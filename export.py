@@ -0,0 +1,162 @@
+import streamlit as st
+import pyarrow as pa
+import pyarrow.parquet as pq
+import csv
+import decimal
+import io
+import tempfile
+from mysql.connector.constants import FieldType
+from openpyxl import Workbook
+import db
+
+
+# Rows per worksheet before an XLSX export continues on a new sheet (Excel's limit
+# is 1,048,576 rows including the header)
+XLSX_MAX_ROWS = 1_048_575
+
+FORMATS = {
+    "CSV": ("csv", "text/csv"),
+    "Parquet": ("parquet", "application/vnd.apache.parquet"),
+    "Excel": ("xlsx", "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
+
+_INTEGER_TYPES = {
+    FieldType.TINY,
+    FieldType.SHORT,
+    FieldType.LONG,
+    FieldType.LONGLONG,
+    FieldType.INT24,
+    FieldType.YEAR,
+    FieldType.BIT,
+}
+
+
+# Scale of a DECIMAL result column, or None when it cannot be known. The description's
+# scale is used when the driver reports it; mysql.connector leaves it out, but MySQL
+# sends every value of a DECIMAL column with the column's scale, so any value of the
+# first chunk gives it.
+def _decimal_scale(desc, values):
+    if len(desc) > 5 and desc[5] is not None:
+        return desc[5]
+    sample = next((value for value in values if value is not None), None)
+    return -sample.as_tuple().exponent if isinstance(sample, decimal.Decimal) else None
+
+
+# Arrow type of a result column, from its description. DECIMAL columns get their exact
+# scale and a precision widened so SUM()s always fit; one whose scale is unknown (only
+# NULLs in the first chunk) is written as text rather than fail on a later value.
+def _arrow_type(desc, values):
+    type_code = desc[1]
+    if type_code in (FieldType.DECIMAL, FieldType.NEWDECIMAL):
+        scale = _decimal_scale(desc, values)
+        return pa.string() if scale is None else pa.decimal128(38, max(scale, 0))
+    if type_code in _INTEGER_TYPES:
+        return pa.int64()
+    if type_code in (FieldType.FLOAT, FieldType.DOUBLE):
+        return pa.float64()
+    if type_code in (FieldType.DATE, FieldType.NEWDATE):
+        return pa.date32()
+    if type_code in (FieldType.DATETIME, FieldType.TIMESTAMP):
+        return pa.timestamp("us")
+    if type_code == FieldType.TIME:
+        return pa.duration("us")
+    return pa.string()
+
+
+def _arrow_column(values, arrow_type):
+    if pa.types.is_string(arrow_type):
+        values = [
+            value.decode("utf-8", "replace") if isinstance(value, (bytes, bytearray))
+            else None if value is None else str(value)
+            for value in values
+        ]
+    return pa.array(values, type=arrow_type)
+
+
+def _write_csv(chunks, handle):
+    writer = csv.writer(handle)
+    for i, (columns, rows) in enumerate(chunks):
+        if i == 0:
+            writer.writerow(columns)
+        writer.writerows(rows)
+
+
+def _write_parquet(chunks, handle, description):
+    writer = None
+    try:
+        for columns, rows in chunks:
+            values = list(zip(*rows)) if rows else [[] for _ in columns]
+            if writer is None:
+                # Column types come from the server's description of the result
+                schema = pa.schema(
+                    [
+                        (column, _arrow_type(desc, column_values))
+                        for column, desc, column_values in zip(columns, description, values)
+                    ]
+                )
+                writer = pq.ParquetWriter(handle, schema, compression="zstd")
+            batch = pa.record_batch(
+                [
+                    _arrow_column(column_values, field.type)
+                    for column_values, field in zip(values, schema)
+                ],
+                schema=schema,
+            )
+            writer.write_batch(batch)
+    finally:
+        if writer is not None:
+            writer.close()
+
+
+def _write_xlsx(chunks, handle):
+    # write_only workbooks stream rows to disk instead of keeping cells in memory
+    workbook = Workbook(write_only=True)
+    sheet = None
+    sheet_rows = 0
+    for columns, rows in chunks:
+        for row in rows:
+            if sheet is None or sheet_rows >= XLSX_MAX_ROWS:
+                sheet = workbook.create_sheet(f"Sheet{len(workbook.worksheets) + 1}")
+                sheet.append(columns)
+                sheet_rows = 0
+            sheet.append(row)
+            sheet_rows += 1
+        if sheet is None:
+            sheet = workbook.create_sheet("Sheet1")
+            sheet.append(columns)
+    workbook.save(handle)
+
+
+# Stream the result of a query into a temporary file in the given format, one
+# fetchmany() chunk at a time, and return the file's bytes; the file is removed
+def export_query(query, params=None, file_format="CSV"):
+    description = []
+    chunks = db.iter_query_chunks(query, params, description=description)
+    with tempfile.TemporaryFile("w+b") as handle:
+        if file_format == "CSV":
+            text = io.TextIOWrapper(handle, newline="", encoding="utf-8", write_through=True)
+            _write_csv(chunks, text)
+            text.detach()
+        elif file_format == "Parquet":
+            _write_parquet(chunks, handle, description)
+        else:
+            _write_xlsx(chunks, handle)
+        handle.seek(0)
+        return handle.read()
+
+
+# Format picker and download button for a query. The export only runs when the
+# button is clicked, on Streamlit's download thread, so reruns never touch MySQL.
+def show_export(query, params=None, name="export", key="export"):
+    format_col, button_col = st.columns([1, 2])
+    file_format = format_col.selectbox("Export format", list(FORMATS), key=f"{key}_format")
+    extension, mime = FORMATS[file_format]
+    with button_col:
+        st.write("")
+        st.download_button(
+            f"Download {file_format}",
+            data=lambda: export_query(query, params, file_format),
+            file_name=f"{name}.{extension}",
+            mime=mime,
+            key=f"{key}_download",
+        )
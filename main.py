@@ -1,29 +1,20 @@
 import streamlit as st
-import mysql.connector
 import pandas as pd
 import requests
 import home_page
 import databasedesign_page
 import crudoperations_page
 import complexqueries_page
+import db
+import result_cache
+import schema_migrations
 
 # --- Set the Streamlit page configuration (first Streamlit command) ---
 st.set_page_config(page_title="Welcome to Hospital Management Application")
 
-# --- Use st.secrets to get the database credentials ---
-db_host = st.secrets["DB_HOST"]
-db_user = st.secrets["DB_USER"]
-db_password = st.secrets["DB_PASSWORD"]
-db_name = st.secrets["DB_NAME"]
-
-# Establish a connection to MySQL Server using credentials from st.secrets
-mydb = mysql.connector.connect(
-    host=db_host,
-    user=db_user,
-    password=db_password,
-    database=db_name
-)
-mycursor = mydb.cursor()
+# Database connections are borrowed lazily from the shared pool in db.py,
+# so a rerun of this script never opens a connection by itself
+db.record_rerun()
 
 class MultiApp:
     def __init__(self):
@@ -45,6 +36,11 @@ class MultiApp:
         st.sidebar.markdown("---")
         app["function"]()  # Call the selected function
 
+        # Shared connection pool and result cache metrics, and the schema check
+        db.show_pool_stats()
+        result_cache.show_cache_stats()
+        schema_migrations.show_schema_status()
+
 # Instantiate MultiApp
 app = MultiApp()
 
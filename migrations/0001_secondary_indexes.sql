@@ -0,0 +1,30 @@
+-- Secondary indexes used by the reports, moved here from queries.sql.
+-- idx_medicalrecord_date now targets CreateDate; MedicalRecord has no DateOfEntry column.
+
+CREATE INDEX idx_department_branch ON Department(Branch_ID);
+
+CREATE INDEX idx_patient_branch ON Patient(Branch_ID);
+CREATE INDEX idx_patient_name ON Patient(LastName);
+
+CREATE INDEX idx_doctor_department ON Doctor(DepartmentID);
+CREATE INDEX idx_doctor_branch ON Doctor(Branch_ID);
+
+CREATE INDEX idx_nurse_branch ON Nurse(Branch_ID);
+
+CREATE INDEX idx_appointment_patient ON Appointment(PatientID);
+CREATE INDEX idx_appointment_doctor ON Appointment(DoctorID);
+CREATE INDEX idx_appointment_date ON Appointment(AppointmentDate);
+
+CREATE INDEX idx_medicalrecord_patient ON MedicalRecord(PatientID);
+CREATE INDEX idx_medicalrecord_doctor ON MedicalRecord(DoctorID);
+CREATE INDEX idx_medicalrecord_date ON MedicalRecord(CreateDate);
+
+CREATE INDEX idx_room_branch ON Room(Branch_ID);
+CREATE INDEX idx_room_availability ON Room(Availability);
+
+CREATE INDEX idx_hospitalstay_patient ON HospitalStay(PatientID);
+CREATE INDEX idx_hospitalstay_room ON HospitalStay(RoomID);
+CREATE INDEX idx_hospitalstay_admitdate ON HospitalStay(AdmitDate);
+
+CREATE INDEX idx_billing_patient ON Billing(PatientID);
+CREATE INDEX idx_billing_date ON Billing(PaymentDate);
@@ -0,0 +1,6 @@
+-- optional
+-- Full-text index for the clinical search (clinical_search.py) over diagnoses and treatments.
+-- Servers without InnoDB full-text support leave this migration pending (the runner skips
+-- it when it fails and applies the later ones); the search then uses its in-app index.
+
+CREATE FULLTEXT INDEX ft_medicalrecord_clinical ON MedicalRecord(Diagnosis, Treatment);
@@ -0,0 +1,228 @@
+import streamlit as st
+import mysql.connector
+import bisect
+import re
+import threading
+import time
+import db
+import result_cache
+
+
+# Typeahead lookup of patients by the start of their last name, first name, phone or
+# email, answered from a process-wide in-memory index instead of one query per search.
+# Each field is a sorted list of (normalized value, PatientID) searched by bisection.
+# Writes made through the CRUD page and the batch operations patch the changed patients
+# in place (record_write); any other change to Patient (bulk imports, cascades from
+# Hospital_Branch, writes the index missed) makes the next lookup reload it, as does
+# reaching its maximum age, which bounds how long writes from other processes go unseen.
+# Optional PATIENT_LOOKUP_MAX_AGE setting in .streamlit/secrets.toml: seconds before
+# the index is reloaded from the database (default 600).
+def _setting(name, default):
+    return type(default)(st.secrets.get(name, default))
+
+
+FIELDS = ["LastName", "FirstName", "Phone", "Email"]
+MAX_MATCHES = 20
+# Candidates examined for a search with several words before giving up
+MAX_CANDIDATES = 2000
+
+_PATIENT_QUERY = "SELECT PatientID, FirstName, LastName, Phone, Email FROM Patient"
+_NON_DIGITS = re.compile(r"\D")
+
+
+# Phones are compared by their digits only, everything else case-insensitively
+def _normalize(field, value):
+    if field == "Phone":
+        return _NON_DIGITS.sub("", value or "")
+    return (value or "").strip().lower()
+
+
+# {"FirstName", "LastName", "Phone", "Email"} of a _PATIENT_QUERY row
+def _row(row):
+    return dict(zip(["FirstName", "LastName", "Phone", "Email"], row[1:]))
+
+
+class PatientIndex:
+    def __init__(self, version):
+        self.version = version
+        self.loaded_at = time.monotonic()
+        self.rows = {}  # PatientID -> {"FirstName", "LastName", "Phone", "Email"}
+        self.keys = {field: [] for field in FIELDS}
+
+    @classmethod
+    def load(cls, version):
+        index = cls(version)
+        for _, rows in db.iter_query_chunks(_PATIENT_QUERY):
+            for row in rows:
+                index.rows[row[0]] = _row(row)
+        for field in FIELDS:
+            index.keys[field] = sorted(
+                (_normalize(field, row[field]), patient_id)
+                for patient_id, row in index.rows.items()
+            )
+        return index
+
+    # Replace the entry of one patient; row None removes it
+    def apply(self, patient_id, row):
+        old = self.rows.pop(patient_id, None)
+        for field in FIELDS:
+            keys = self.keys[field]
+            if old is not None:
+                entry = (_normalize(field, old[field]), patient_id)
+                position = bisect.bisect_left(keys, entry)
+                if position < len(keys) and keys[position] == entry:
+                    del keys[position]
+            if row is not None:
+                bisect.insort(keys, (_normalize(field, row[field]), patient_id))
+        if row is not None:
+            self.rows[patient_id] = row
+
+    # PatientIDs whose field starts with prefix, in field order, up to limit
+    def _prefix(self, field, prefix, limit):
+        keys = self.keys[field]
+        position = bisect.bisect_left(keys, (prefix,))
+        found = []
+        while (
+            position < len(keys) and len(found) < limit and keys[position][0].startswith(prefix)
+        ):
+            found.append(keys[position][1])
+            position += 1
+        return found
+
+    def _matches_word(self, patient_id, word):
+        row = self.rows[patient_id]
+        for field in FIELDS:
+            prefix = _normalize(field, word)
+            if prefix and _normalize(field, row[field]).startswith(prefix):
+                return True
+        return False
+
+    # Patients matching every word of text, each word as the start of some field; the
+    # first word is looked up in the index and the others filter its candidates
+    def search(self, text, limit=MAX_MATCHES):
+        words = text.split()
+        if not words:
+            return []
+        scan = limit if len(words) == 1 else MAX_CANDIDATES
+        found = []
+        for field in FIELDS:
+            prefix = _normalize(field, words[0])
+            if not prefix:
+                continue
+            for patient_id in self._prefix(field, prefix, scan):
+                if len(found) == limit:
+                    break
+                if patient_id not in found and all(
+                    self._matches_word(patient_id, word) for word in words[1:]
+                ):
+                    found.append(patient_id)
+        return [dict(self.rows[patient_id], PatientID=patient_id) for patient_id in found]
+
+
+# Holder of the process's index; the lock keeps a reload and a patch from interleaving
+@st.cache_resource(show_spinner=False)
+def _holder():
+    return {"index": None, "lock": threading.Lock()}
+
+
+# The current index, loaded first when it is missing, stale or too old. The version is
+# read before loading, so a write that lands during the load triggers another one.
+def get_index():
+    holder = _holder()
+    version = result_cache.get_cache().version("Patient")
+    with holder["lock"]:
+        index = holder["index"]
+        if (
+            index is None
+            or index.version != version
+            or time.monotonic() - index.loaded_at > _setting("PATIENT_LOOKUP_MAX_AGE", 600.0)
+        ):
+            holder["index"] = index = PatientIndex.load(version)
+        return index
+
+
+def lookup(text, limit=MAX_MATCHES):
+    return get_index().search(text, limit)
+
+
+# Called after a committed write to table_name (and its cache version bump) with the IDs
+# of the written rows and the writer's connection. Patient rows are read back and patched
+# into the index, which must have seen every earlier write; otherwise it is left for the
+# next lookup to reload.
+def record_write(table_name, record_ids, conn):
+    record_ids = [int(record_id) for record_id in record_ids if str(record_id).strip().isdigit()]
+    if table_name != "Patient" or not record_ids:
+        return
+    holder = _holder()
+    version = result_cache.get_cache().version("Patient")
+    with holder["lock"]:
+        index = holder["index"]
+        if index is None or index.version != version - 1:
+            return
+        placeholders = ", ".join(["%s"] * len(record_ids))
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute(
+                    f"{_PATIENT_QUERY} WHERE PatientID IN ({placeholders})", tuple(record_ids)
+                )
+                rows = {row[0]: _row(row) for row in cursor.fetchall()}
+        except mysql.connector.Error:
+            return
+        finally:
+            # The read opened a transaction on the writer's connection (autocommit is off);
+            # end it so the writer can start its next one
+            try:
+                conn.rollback()
+            except mysql.connector.Error:
+                pass
+        for patient_id in record_ids:
+            index.apply(patient_id, rows.get(patient_id))
+        index.version = version
+
+
+# PATIENT PICKER page section -------------------------------------------------------------------------
+# Search box whose chosen patient is written into the text input with key target_key
+def show_patient_picker(target_key, key="patient_lookup"):
+    text = st.text_input(
+        "Find a patient by name, phone or email:", key=f"{key}_text", placeholder="e.g. smith j"
+    )
+    if not text.strip():
+        return
+
+    start = time.perf_counter()
+    try:
+        matches = lookup(text)
+    except mysql.connector.Error as err:
+        st.error(f"Error: {err}")
+        return
+    elapsed = time.perf_counter() - start
+    if not matches:
+        st.info("No patients match this search.")
+        return
+
+    labels = {
+        match["PatientID"]: (
+            f"{match['FirstName']} {match['LastName']}, {match['Phone']}, {match['Email']} "
+            f"(ID {match['PatientID']})"
+        )
+        for match in matches
+    }
+
+    def pick():
+        chosen = st.session_state[f"{key}_choice"]
+        if chosen is not None:
+            st.session_state[target_key] = str(chosen)
+
+    st.selectbox(
+        "Matching patients:",
+        list(labels),
+        index=None,
+        format_func=labels.get,
+        placeholder="Choose a patient",
+        key=f"{key}_choice",
+        on_change=pick,
+    )
+    st.caption(
+        f"{len(matches)}{'+' if len(matches) == MAX_MATCHES else ''} matches "
+        f"in {elapsed * 1000:.1f} ms"
+    )
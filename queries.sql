@@ -2,50 +2,17 @@ USE HospitalManagement;
 
 /*============================== DELIVERABLE #2 =======================================*/
 -- CREATE INDEXES
-/* -- create index on Department table */
-CREATE INDEX idx_department_branch ON Department(Branch_ID);
-SHOW INDEX FROM department;
-
-/* -- create index on Patient table */
-CREATE INDEX idx_patient_branch ON Patient(Branch_ID);
-CREATE INDEX idx_patient_name ON Patient(LastName);
+/* The secondary indexes are versioned migrations in migrations/ (0001_secondary_indexes.sql).
+   Apply them with: python -m schema_migrations
+   The app verifies the live index set against the migrations at startup. */
+SHOW INDEX FROM Department;
 SHOW INDEX FROM Patient;
-
-/* -- create index on Doctor table */
-CREATE INDEX idx_doctor_department ON Doctor(DepartmentID);
-CREATE INDEX idx_doctor_branch ON Doctor(Branch_ID);
 SHOW INDEX FROM Doctor;
-
-/* -- create index on Nurse table */
-CREATE INDEX idx_nurse_branch ON Nurse(Branch_ID);
 SHOW INDEX FROM Nurse;
-
-/* -- create index on Appointment table */
-CREATE INDEX idx_appointment_patient ON Appointment(PatientID);
-CREATE INDEX idx_appointment_doctor ON Appointment(DoctorID);
-CREATE INDEX idx_appointment_date ON Appointment(AppointmentDate);
 SHOW INDEX FROM Appointment;
-
-/* -- create index on MedicalRecord table */
-CREATE INDEX idx_medicalrecord_patient ON MedicalRecord(PatientID);
-CREATE INDEX idx_medicalrecord_doctor ON MedicalRecord(DoctorID);
-CREATE INDEX idx_medicalrecord_date ON MedicalRecord(DateOfEntry);
 SHOW INDEX FROM MedicalRecord;
-
-/* -- create index on Room table */
-CREATE INDEX idx_room_branch ON Room(Branch_ID);
-CREATE INDEX idx_room_availability ON Room(Availability);
 SHOW INDEX FROM Room;
-
-/* -- create index on HospitalStay table */
-CREATE INDEX idx_hospitalstay_patient ON HospitalStay(PatientID);
-CREATE INDEX idx_hospitalstay_room ON HospitalStay(RoomID);
-CREATE INDEX idx_hospitalstay_admitdate ON HospitalStay(AdmitDate);
 SHOW INDEX FROM HospitalStay;
-
-/* -- create index on Billing table */
-CREATE INDEX idx_billing_patient ON Billing(PatientID);
-CREATE INDEX idx_billing_date ON Billing(PaymentDate);
 SHOW INDEX FROM Billing;
 
 /*---------------------------------------------------------------------------------*/
@@ -0,0 +1,253 @@
+import streamlit as st
+import pandas as pd
+from mysql.connector import errors
+from mysql.connector.constants import ClientFlag
+from contextlib import contextmanager
+import atexit
+import re
+import threading
+import time
+import db
+
+
+# Optional limits for the "Other Query" custom SQL runner in .streamlit/secrets.toml:
+#   CUSTOM_QUERY_TIMEOUT        seconds a SELECT may run on the server (default 30)
+#   CUSTOM_QUERY_MAX_ROWS       rows kept from a result before it is cut off (default 10000)
+#   CUSTOM_QUERY_GLOBAL_LIMIT   custom queries running at once across all sessions (default 2)
+#   CUSTOM_QUERY_SESSION_LIMIT  custom queries running at once in one browser session (default 1)
+#   CUSTOM_QUERY_USER / CUSTOM_QUERY_PASSWORD  MySQL account for custom SQL; give it only
+#       SELECT privileges (default: the application's DB_USER / DB_PASSWORD)
+def _setting(name, default):
+    return type(default)(st.secrets.get(name, default))
+
+
+# MySQL error raised when MAX_EXECUTION_TIME is exceeded
+ER_QUERY_TIMEOUT = 3024
+
+
+# Server-side execution limit for custom SQL, in milliseconds
+def timeout_ms():
+    return int(_setting("CUSTOM_QUERY_TIMEOUT", 30.0) * 1000)
+
+
+# Raised when a custom query is refused or stopped by one of the limits above
+class GovernorError(errors.Error):
+    pass
+
+
+# Statements custom SQL may be; EXPLAIN also accepts the writes, which it does not run
+READ_STATEMENTS = ("SELECT", "WITH", "TABLE")
+EXPLAINABLE_STATEMENTS = READ_STATEMENTS + ("INSERT", "REPLACE", "UPDATE", "DELETE")
+
+# String literals, quoted identifiers and comments, in the order MySQL reads them.
+# Versioned comments (/*! ... */) are executed by MySQL and optimizer hints (/*+ ... */)
+# can set MAX_EXECUTION_TIME or session variables, so both are matched separately.
+_TOKEN = re.compile(
+    r"""'(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`(?:[^`]|``)*`"""
+    r"|(?P<versioned>/\*!)|(?P<hint>/\*\+)|/\*.*?\*/|(?:--\s|#)[^\n]*",
+    re.S,
+)
+_FILE_OUTPUT = re.compile(r"\bINTO\s+(OUTFILE|DUMPFILE)\b", re.I)
+
+
+# The one statement of a piece of SQL, without its trailing semicolon. Raises
+# GovernorError for several statements, versioned comments, optimizer hints, file
+# output or a statement that is not one of allowed.
+def single_statement(sql, allowed=READ_STATEMENTS):
+    code = []
+    end = 0  # end of the last code character in sql, past literals but not comments
+    position = 0
+    for match in list(_TOKEN.finditer(sql)) + [None]:
+        start = match.start() if match else len(sql)
+        between = sql[position:start]
+        code.append(between)
+        if between.strip().rstrip(";").strip():
+            end = position + len(between.rstrip().rstrip(";").rstrip())
+        if match is None:
+            break
+        if match.group("versioned"):
+            raise GovernorError(msg="Versioned /*! ... */ comments are not allowed.")
+        if match.group("hint"):
+            raise GovernorError(msg="Optimizer hints (/*+ ... */) are not allowed.")
+        if match.group().startswith(("/*", "--", "#")):
+            code.append(" ")
+        else:
+            code.append("''")
+            end = match.end()
+        position = match.end()
+    code = "".join(code).strip().rstrip(";").strip()
+    if ";" in code:
+        raise GovernorError(msg="Only one statement can be run at a time.")
+    first_word = re.match(r"[\s(]*(\w*)", code).group(1).upper()
+    if first_word not in allowed:
+        raise GovernorError(msg=f"Only {', '.join(allowed)} statements are allowed here.")
+    if _FILE_OUTPUT.search(code):
+        raise GovernorError(msg="Writing query results to server files is not allowed.")
+    return sql[:end].strip()
+
+
+# Pool for custom SQL and plan previews, separate from the application's so it can log
+# in as a SELECT-only account. Its connections never accept several statements in one
+# call, so nothing can be appended to a statement to change the session's limits.
+@st.cache_resource(show_spinner=False)
+def get_pool():
+    pool = db.ConnectionPool(
+        size=_setting("CUSTOM_QUERY_GLOBAL_LIMIT", 2),
+        checkout_timeout=10.0,
+        ping_on_borrow=True,
+        recycle_seconds=1800.0,
+        host=st.secrets["DB_HOST"],
+        user=st.secrets.get("CUSTOM_QUERY_USER", st.secrets["DB_USER"]),
+        password=st.secrets.get("CUSTOM_QUERY_PASSWORD", st.secrets["DB_PASSWORD"]),
+        database=st.secrets["DB_NAME"],
+        client_flags=[-ClientFlag.MULTI_STATEMENTS],
+    )
+    atexit.register(pool.close_all)
+    return pool
+
+
+# Process-wide count of running custom queries
+@st.cache_resource(show_spinner=False)
+def _global_limit():
+    return {"running": 0, "lock": threading.Lock()}
+
+
+# Reserve a slot for one custom query in this session and in the whole process
+def _reserve_slot():
+    session_limit = _setting("CUSTOM_QUERY_SESSION_LIMIT", 1)
+    global_limit = _setting("CUSTOM_QUERY_GLOBAL_LIMIT", 2)
+    if st.session_state.get("custom_queries_running", 0) >= session_limit:
+        raise GovernorError(
+            msg="A custom query is already running in this session; wait for it to finish."
+        )
+    counter = _global_limit()
+    with counter["lock"]:
+        if counter["running"] >= global_limit:
+            raise GovernorError(
+                msg=f"{global_limit} custom queries are already running; try again shortly."
+            )
+        counter["running"] += 1
+    st.session_state["custom_queries_running"] = (
+        st.session_state.get("custom_queries_running", 0) + 1
+    )
+
+
+def _release_slot():
+    counter = _global_limit()
+    with counter["lock"]:
+        counter["running"] -= 1
+    st.session_state["custom_queries_running"] = max(
+        st.session_state.get("custom_queries_running", 1) - 1, 0
+    )
+
+
+def _start_session(cursor, limit_ms):
+    cursor.execute("SET SESSION TRANSACTION READ ONLY")
+    cursor.execute(f"SET SESSION MAX_EXECUTION_TIME = {limit_ms}")
+
+
+def _end_session(cursor):
+    cursor.execute("SET SESSION MAX_EXECUTION_TIME = DEFAULT")
+    cursor.execute("SET SESSION TRANSACTION READ WRITE")
+
+
+def _timeout_error(err, limit_ms):
+    if err.errno == ER_QUERY_TIMEOUT:
+        return GovernorError(
+            msg=f"Query stopped after the {limit_ms / 1000:g} second limit.", errno=err.errno
+        )
+    return err
+
+
+# Cursor on a governed session for the duration of a with-block: a connection of the
+# custom SQL pool, read-only and under MAX_EXECUTION_TIME, counted against the
+# concurrency limits. Sessions that raised are closed rather than reused.
+@contextmanager
+def read_only_cursor():
+    limit_ms = timeout_ms()
+    _reserve_slot()
+    try:
+        pool = get_pool()
+        conn = pool.acquire()
+        discard = True
+        try:
+            with conn.cursor() as cursor:
+                _start_session(cursor, limit_ms)
+                try:
+                    yield cursor
+                except errors.Error as err:
+                    raise _timeout_error(err, limit_ms) from err
+                _end_session(cursor)
+            discard = False
+        finally:
+            pool.release(conn, discard=discard)
+    finally:
+        _release_slot()
+
+
+# Run user-supplied SQL under the governor: a single read statement, run in a read-only
+# session of the custom SQL pool, with a server-side MAX_EXECUTION_TIME, a cap on the
+# rows kept in memory and a limit on concurrent runs.
+# Returns a dict with the DataFrame, whether it was truncated, the elapsed seconds
+# and the rows scanned by the server (None when the result was cut off, because the
+# connection holding the unread rows is closed rather than queried again).
+def run_custom_query(query, timings=None):
+    timings = {} if timings is None else timings
+    limit_ms = timeout_ms()
+    max_rows = _setting("CUSTOM_QUERY_MAX_ROWS", 10000)
+    query = single_statement(query)
+
+    _reserve_slot()
+    try:
+        pool = get_pool()
+        start = time.perf_counter()
+        conn = pool.acquire()
+        timings["Connect"] = time.perf_counter() - start
+        discard = True
+        try:
+            with conn.cursor() as cursor:
+                _start_session(cursor, limit_ms)
+                rows_before = db.session_rows_read(cursor)
+
+            cursor = conn.cursor()
+            start = time.perf_counter()
+            cursor.execute(query)
+            timings["Execute"] = time.perf_counter() - start
+            columns = [desc[0] for desc in cursor.description or []]
+            rows = []
+            truncated = False
+            start = time.perf_counter()
+            if columns:
+                # Read one row past the cap to tell a full result from a cut-off one
+                for chunk in db.iter_cursor_chunks(cursor):
+                    rows.extend(chunk)
+                    if len(rows) > max_rows:
+                        del rows[max_rows:]
+                        truncated = True
+                        break
+            timings["Fetch"] = time.perf_counter() - start
+
+            rows_scanned = None
+            if not truncated:
+                cursor.close()
+                with conn.cursor() as cursor:
+                    rows_scanned = db.session_rows_read(cursor) - rows_before
+                    _end_session(cursor)
+                discard = False
+        except GovernorError:
+            raise
+        except errors.Error as err:
+            raise _timeout_error(err, limit_ms) from err
+        finally:
+            # A half-read or failed session is closed rather than handed back read-only
+            pool.release(conn, discard=discard)
+    finally:
+        _release_slot()
+
+    return {
+        "df": pd.DataFrame(rows, columns=columns),
+        "truncated": truncated,
+        "max_rows": max_rows,
+        "elapsed": sum(timings.values()),
+        "rows_scanned": rows_scanned,
+    }
@@ -0,0 +1,973 @@
+import datetime
+
+
+# Declarative catalog of the reports offered on the Complex Queries page.
+# Each report records its SQL, category, parameters, result columns, whether its
+# result may be cached, and a rough cost class ("light" or "heavy", used to start heavy
+# reports first on the dashboard) so callers can dispatch, cache, time and batch-run
+# reports with a single lookup.
+class ReportCatalog:
+    def __init__(self):
+        self.categories = []
+        self.reports = {}
+
+    def add_category(self, name, description):
+        self.categories.append({"name": name, "description": description})
+
+    # params is a list of {"name", "label", "type", "default"} dicts; the SQL refers to
+    # them as %(name)s placeholders. Supported types are "date", "text" and "int".
+    def add_report(self, title, category, sql, columns, params=None, cacheable=True, cost="light"):
+        if title in self.reports:
+            raise ValueError(f"Duplicate report title: {title}")
+        self.reports[title] = {
+            "title": title,
+            "category": category,
+            "sql": sql,
+            "columns": columns,
+            "params": params or [],
+            "cacheable": cacheable,
+            "cost": cost,
+        }
+
+    def category_names(self):
+        return [category["name"] for category in self.categories]
+
+    def description(self, category_name):
+        for category in self.categories:
+            if category["name"] == category_name:
+                return category["description"]
+        return ""
+
+    def titles(self, category_name):
+        return [
+            report["title"] for report in self.reports.values() if report["category"] == category_name
+        ]
+
+    def get(self, title):
+        return self.reports.get(title)
+
+    # Default parameter values of a report, keyed by parameter name
+    def default_params(self, title):
+        return {param["name"]: param["default"] for param in self.reports[title]["params"]}
+
+
+catalog = ReportCatalog()
+
+# Set Operations -----------------------------------------------------------------------------------
+catalog.add_category(
+    "Set Operations",
+    "**Set operations** in SQL include `UNION`, `UNION ALL`, `INTERSECT`, and `EXCEPT` (or `MINUS` in some databases). These operations are used to combine the results of two or more SELECT queries.",
+)
+
+catalog.add_report(
+    "Identify Patients Who Have Either Allergies or Chronic Conditions",
+    "Set Operations",
+    """
+        SELECT PatientID, Diagnosis
+        FROM MedicalRecord
+        WHERE
+            Diagnosis LIKE '%Allerg%'
+        UNION
+        SELECT PatientID, Diagnosis
+        FROM MedicalRecord
+        WHERE
+            Diagnosis LIKE '%Chronic%';
+    """,
+    ["PatientID", "Diagnosis"],
+)
+
+catalog.add_report(
+    "List Patients Who Have Had an Appointment but No Medical Records",
+    "Set Operations",
+    """
+        SELECT PatientID
+        FROM Appointment EXCEPT
+        SELECT PatientID
+        FROM MedicalRecord;
+    """,
+    ["PatientID"],
+)
+
+catalog.add_report(
+    "Compile a List of All Medical Personnel Involved in Patient Care",
+    "Set Operations",
+    """
+        SELECT
+            DoctorID AS StaffID,
+            CONCAT(FirstName, ' ', LastName) AS FullName,
+            'Doctor' AS Role
+        FROM Doctor
+        WHERE
+            DoctorID IN (
+                SELECT DoctorID
+                FROM MedicalRecord
+            )
+        UNION
+        SELECT
+            NurseID AS StaffID,
+            CONCAT(FirstName, ' ', LastName) AS FullName,
+            'Nurse' AS Role
+        FROM Nurse
+        WHERE
+            NurseID IN (
+                SELECT AssignedNurseID
+                FROM HospitalStay
+            );
+    """,
+    ["StaffID", "FullName", "Role"],
+)
+
+catalog.add_report(
+    "Identify Patients Who Have Both Inpatient and Outpatient Services",
+    "Set Operations",
+    """
+        SELECT PatientID FROM HospitalStay
+        INTERSECT
+        SELECT PatientID FROM Appointment;
+    """,
+    ["PatientID"],
+)
+
+
+# Set Membership -----------------------------------------------------------------------------------
+catalog.add_category(
+    "Set Membership",
+    "**Set membership** queries check if certain elements exist within a specified set, using `IN`, `NOT IN`, `EXISTS`, or `NOT EXISTS`.",
+)
+
+catalog.add_report(
+    "List patients who have appointments with doctors specializing in CARDIOLOGY",
+    "Set Membership",
+    """
+        SELECT DISTINCT p.PatientID, p.FirstName, p.LastName
+        FROM Patient p
+        WHERE p.PatientID IN (
+            SELECT a.PatientID
+            FROM Appointment a
+            JOIN Doctor d ON a.DoctorID = d.DoctorID
+            WHERE d.DepartmentID = (
+                SELECT DepartmentID FROM Department WHERE DepartmentName = 'CARDIOLOGY'
+            )
+        );
+    """,
+    ["PatientID", "FirstName", "LastName"],
+)
+
+catalog.add_report(
+    "Find Doctors Who Specialize in Digestive and Renal Health",
+    "Set Membership",
+    """
+        SELECT DoctorID, FirstName, LastName
+        FROM Doctor
+        WHERE DepartmentID IN (
+            SELECT DepartmentID FROM Department
+            WHERE DepartmentName IN ('GASTROENTEROLOGY', 'NEPHROLOGY', 'UROLOGY')
+        );
+    """,
+    ["DoctorID", "FirstName", "LastName"],
+)
+
+catalog.add_report(
+    "List Nurses Who Have Worked in ICU Rooms",
+    "Set Membership",
+    """
+        SELECT DISTINCT n.NurseID, n.FirstName, n.LastName
+        FROM Nurse n
+        WHERE n.NurseID IN (
+            SELECT hs.AssignedNurseID
+            FROM HospitalStay hs
+            JOIN Room r ON hs.RoomID = r.RoomID
+            WHERE r.RoomType = 'ICU'
+        );
+    """,
+    ["NurseID", "FirstName", "LastName"],
+)
+
+catalog.add_report(
+    "List Patients with Appointments in Multiple Departments",
+    "Set Membership",
+    """
+        SELECT DISTINCT
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientName
+        FROM Patient p
+        WHERE
+            EXISTS (
+                SELECT 1
+                FROM Appointment a1
+                    INNER JOIN Doctor d1 USING (DoctorID)
+                WHERE
+                    p.PatientID = a1.PatientID
+                    AND d1.DepartmentID != (
+                        SELECT d2.DepartmentID
+                        FROM Appointment a2
+                            INNER JOIN Doctor d2 USING (DoctorID)
+                        WHERE
+                            p.PatientID = a2.PatientID
+                        LIMIT 1
+                    )
+            );
+    """,
+    ["PatientID", "PatientName"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "List Doctors with No Appointments in a Specific Month",
+    "Set Membership",
+    """
+        SELECT doc.DoctorID, CONCAT(
+                doc.FirstName, ' ', doc.LastName
+            ) AS DoctorName
+        FROM Doctor doc
+        WHERE
+            NOT EXISTS (
+                SELECT 1
+                FROM Appointment a
+                WHERE
+                    a.DoctorID = doc.DoctorID
+                    AND a.AppointmentDate BETWEEN %(month_start)s AND %(month_end)s
+            );
+    """,
+    ["DoctorID", "DoctorName"],
+    params=[
+        {
+            "name": "month_start",
+            "label": "From",
+            "type": "date",
+            "default": datetime.date(2024, 10, 1),
+        },
+        {
+            "name": "month_end",
+            "label": "To",
+            "type": "date",
+            "default": datetime.date(2024, 10, 30),
+        },
+    ],
+)
+
+
+# Set Comparison -----------------------------------------------------------------------------------
+catalog.add_category(
+    "Set Comparison",
+    "**Set comparison**: Compares sets of rows using operations like `EXCEPT`, `INTERSECT`, or subqueries to find similarities or differences between two result sets.",
+)
+
+catalog.add_report(
+    "Find Departments That Have More Appointments Than the Average",
+    "Set Comparison",
+    """
+        SELECT d.DepartmentName, COUNT(a.AppointmentID) AS TotalAppointments
+        FROM
+            Appointment a
+            INNER JOIN Doctor doc ON a.DoctorID = doc.DoctorID
+            INNER JOIN Department d ON doc.DepartmentID = d.DepartmentID
+        GROUP BY
+            d.DepartmentName
+        HAVING
+            COUNT(a.AppointmentID) > (
+                SELECT AVG(TotalAppointments)
+                FROM (
+                        SELECT COUNT(a2.AppointmentID) AS TotalAppointments
+                        FROM
+                            Appointment a2
+                            INNER JOIN Doctor doc2 ON a2.DoctorID = doc2.DoctorID
+                            INNER JOIN Department d2 ON doc2.DepartmentID = d2.DepartmentID
+                        GROUP BY
+                            d2.DepartmentName
+                    ) AS DeptAppointmentCounts
+            );
+    """,
+    ["DepartmentName", "TotalAppointments"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Compare Availability of Rooms Across Branches",
+    "Set Comparison",
+    """
+        SELECT RoomNumber
+        FROM Room
+        WHERE Branch_ID = 1 AND Availability = TRUE
+        EXCEPT
+        SELECT RoomNumber
+        FROM Room
+        WHERE Branch_ID = 2 AND Availability = TRUE;
+    """,
+    ["RoomNumber"],
+)
+
+catalog.add_report(
+    "Find Nurses Who Have Not Been Assigned Any Patients Recently",
+    "Set Comparison",
+    """
+        SELECT NurseID, FirstName, LastName
+        FROM Nurse
+        WHERE NurseID NOT IN (
+            SELECT AssignedNurseID FROM HospitalStay
+            WHERE AdmitDate >= DATE_SUB(CURDATE(), INTERVAL 30 DAY)
+        );
+    """,
+    ["NurseID", "FirstName", "LastName"],
+)
+
+catalog.add_report(
+    "Identify Patients Who Have Consulted Multiple Specialists",
+    "Set Comparison",
+    """
+        SELECT a.PatientID, COUNT(DISTINCT d.DepartmentID) AS DepartmentCount
+        FROM Appointment a
+        JOIN Doctor doc ON a.DoctorID = doc.DoctorID
+        JOIN Department d ON doc.DepartmentID = d.DepartmentID
+        GROUP BY a.PatientID
+        HAVING COUNT(DISTINCT d.DepartmentID) > 1;
+    """,
+    ["PatientID", "DepartmentCount"],
+)
+
+catalog.add_report(
+    "Compare Appointment Schedules to Identify Overlaps",
+    "Set Comparison",
+    """
+        SELECT a1.DoctorID, a1.AppointmentDate, a1.AppointmentTime
+        FROM Appointment a1
+        JOIN Appointment a2 ON a1.DoctorID = a2.DoctorID
+        WHERE a1.AppointmentID <> a2.AppointmentID
+        AND a1.AppointmentDate = a2.AppointmentDate
+        AND a1.AppointmentTime = a2.AppointmentTime;
+    """,
+    ["DoctorID", "AppointmentDate", "AppointmentTime"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Identify Patients Who Have Changed Their Phone Numbers",
+    "Set Comparison",
+    """
+        SELECT p.PatientID, p.FirstName, p.LastName, p.Phone AS CurrentPhone, ph.Phone AS OldPhone
+        FROM Patient p
+        JOIN PatientHistory ph ON p.PatientID = ph.PatientID
+        WHERE p.Phone <> ph.Phone;
+    """,
+    ["PatientID", "FirstName", "LastName", "CurrentPhone", "OldPhone"],
+)
+
+catalog.add_report(
+    "Identify High-Risk Patients Based on Multiple Admissions",
+    "Set Comparison",
+    """
+        SELECT PatientID, COUNT(*) AS AdmissionCount
+        FROM HospitalStay
+        WHERE AdmitDate >= DATE_SUB(CURDATE(), INTERVAL 1 YEAR)
+        GROUP BY PatientID
+        HAVING COUNT(*) > 3;
+    """,
+    ["PatientID", "AdmissionCount"],
+)
+
+
+# Subqueries using the WITH clause -----------------------------------------------------------------
+catalog.add_category(
+    "Subqueries using the WITH clause",
+    "**Subquery using WITH clause**: The `WITH` clause (Common Table Expression, CTE) defines a temporary result set that can be referenced in a main query, making complex queries easier to read and maintain.",
+)
+
+catalog.add_report(
+    "Total Revenue per Branch and Department",
+    "Subqueries using the WITH clause",
+    """
+        WITH DepartmentBilling AS (
+            SELECT
+                doc.DepartmentID,
+                hb.Branch_ID,
+                SUM(b.TotalAmount) AS TotalRevenue
+            FROM
+                Billing b
+            INNER JOIN
+                Appointment a ON b.PatientID = a.PatientID
+            INNER JOIN
+                Doctor doc ON a.DoctorID = doc.DoctorID
+            INNER JOIN
+                Hospital_Branch hb ON doc.Branch_ID = hb.Branch_ID
+            GROUP BY
+                doc.DepartmentID, hb.Branch_ID
+        )
+        SELECT
+            hb.Branch_Name,
+            d.DepartmentName,
+            db.TotalRevenue
+        FROM
+            DepartmentBilling db
+        INNER JOIN
+            Department d ON db.DepartmentID = d.DepartmentID
+        INNER JOIN
+            Hospital_Branch hb ON db.Branch_ID = hb.Branch_ID
+        ORDER BY
+            hb.Branch_Name, d.DepartmentName;
+    """,
+    ["Branch_Name", "DepartmentName", "TotalRevenue"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Doctors Who Treated More Patients Than the Average per Department",
+    "Subqueries using the WITH clause",
+    """
+        WITH DepartmentAverage AS (
+            SELECT
+                DepartmentID,
+                AVG(PatientCount) AS AvgPatients
+            FROM (
+                SELECT
+                    doc.DoctorID,
+                    doc.DepartmentID,
+                    COUNT(DISTINCT mr.PatientID) AS PatientCount
+                FROM
+                    MedicalRecord mr
+                INNER JOIN
+                    Doctor doc ON mr.DoctorID = doc.DoctorID
+                GROUP BY
+                    doc.DoctorID, doc.DepartmentID
+            ) AS DoctorPatientCounts
+            GROUP BY
+                DepartmentID
+        )
+        SELECT
+            doc.DoctorID,
+            CONCAT(doc.FirstName, ' ', doc.LastName) AS DoctorName,
+            d.DepartmentName,
+            COUNT(DISTINCT mr.PatientID) AS PatientsTreated
+        FROM
+            MedicalRecord mr
+        INNER JOIN
+            Doctor doc ON mr.DoctorID = doc.DoctorID
+        INNER JOIN
+            Department d ON doc.DepartmentID = d.DepartmentID
+        INNER JOIN
+            DepartmentAverage da ON doc.DepartmentID = da.DepartmentID
+        GROUP BY
+            doc.DoctorID, doc.FirstName, doc.LastName, d.DepartmentName, da.AvgPatients
+        HAVING
+            COUNT(DISTINCT mr.PatientID) > da.AvgPatients
+        ORDER BY
+            PatientsTreated DESC;
+    """,
+    ["DoctorID", "DoctorName", "DepartmentName", "PatientsTreated"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "List the Patients with the Longest Stay per Branch",
+    "Subqueries using the WITH clause",
+    """
+        WITH PatientStayLength AS (
+            SELECT
+                hs.PatientID,
+                hs.Branch_ID,
+                DATEDIFF(hs.DischargeDate, hs.AdmitDate) AS StayLength
+            FROM
+                HospitalStay hs
+        )
+        SELECT
+            hb.Branch_Name,
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientFullName,
+            MAX(psl.StayLength) AS LongestStay
+        FROM
+            PatientStayLength psl
+        INNER JOIN
+            Patient p ON psl.PatientID = p.PatientID
+        INNER JOIN
+            Hospital_Branch hb ON psl.Branch_ID = hb.Branch_ID
+        GROUP BY
+            hb.Branch_Name, p.PatientID, p.FirstName, p.LastName
+        ORDER BY
+            hb.Branch_Name, LongestStay DESC;
+    """,
+    ["Branch_Name", "PatientID", "PatientFullName", "LongestStay"],
+)
+
+catalog.add_report(
+    "Total Number of Appointments per Patient Over the Last 6 Months",
+    "Subqueries using the WITH clause",
+    """
+        WITH RecentAppointments AS (
+            SELECT
+                a.PatientID,
+                a.AppointmentDate
+            FROM
+                Appointment a
+            WHERE
+                a.AppointmentDate BETWEEN DATE_SUB(CURDATE(), INTERVAL 6 MONTH) AND CURDATE()
+        )
+        SELECT
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientFullName,
+            COUNT(ra.AppointmentDate) AS TotalAppointments
+        FROM
+            RecentAppointments ra
+        INNER JOIN
+            Patient p ON ra.PatientID = p.PatientID
+        GROUP BY
+            p.PatientID, p.FirstName, p.LastName
+        ORDER BY
+            TotalAppointments DESC;
+    """,
+    ["PatientID", "PatientFullName", "TotalAppointments"],
+)
+
+catalog.add_report(
+    "List Nurses Who Have Assisted in More Stays Than the Average Nurse in Their Branch",
+    "Subqueries using the WITH clause",
+    """
+        WITH NurseStayCounts AS (
+            SELECT
+                hs.AssignedNurseID,
+                hs.Branch_ID,
+                COUNT(hs.StayID) AS StayCount
+            FROM
+                HospitalStay hs
+            GROUP BY
+                hs.AssignedNurseID, hs.Branch_ID
+        ),
+        BranchAverage AS (
+            SELECT
+                Branch_ID,
+                AVG(StayCount) AS AvgStayCount
+            FROM
+                NurseStayCounts
+            GROUP BY
+                Branch_ID
+        )
+        SELECT
+            n.NurseID,
+            CONCAT(n.FirstName, ' ', n.LastName) AS NurseName,
+            hb.Branch_Name,
+            nsc.StayCount
+        FROM
+            NurseStayCounts nsc
+        INNER JOIN
+            Nurse n ON n.NurseID = nsc.AssignedNurseID
+        INNER JOIN
+            Hospital_Branch hb ON nsc.Branch_ID = hb.Branch_ID
+        INNER JOIN
+            BranchAverage ba ON nsc.Branch_ID = ba.Branch_ID
+        WHERE
+            nsc.StayCount > ba.AvgStayCount
+        ORDER BY
+            nsc.StayCount DESC;
+    """,
+    ["NurseID", "NurseName", "Branch_Name", "StayCount"],
+)
+
+
+# Advanced Aggregate Functions ---------------------------------------------------------------------
+catalog.add_category(
+    "Advanced Aggregate Functions",
+    "**Advanced aggregate function**: Includes functions like `SUM()`, `AVG()`, `COUNT()`, and window functions (`ROW_NUMBER()`, `RANK()`), used for performing calculations on sets of rows for analytical purposes.",
+)
+
+catalog.add_report(
+    "Calculate the total number of rooms available by branch",
+    "Advanced Aggregate Functions",
+    """
+        SELECT hb.Branch_Name, COUNT(r.RoomID) AS AvailableRooms
+        FROM Room r
+        INNER JOIN Hospital_Branch hb USING(Branch_ID)
+        WHERE r.Availability = TRUE
+        GROUP BY hb.Branch_Name;
+    """,
+    ["Branch_Name", "AvailableRooms"],
+)
+
+catalog.add_report(
+    "Find patients who have visited multiple departments",
+    "Advanced Aggregate Functions",
+    """
+        SELECT  p.PatientID, p.FirstName, p.LastName,
+                COUNT(DISTINCT doc.DepartmentID) AS DepartmentCount
+        FROM Patient p
+        INNER JOIN Appointment a USING(PatientID)
+        INNER JOIN Doctor doc USING(DoctorID)
+        GROUP BY p.PatientID, p.FirstName, p.LastName
+        HAVING COUNT(DISTINCT doc.DepartmentID) > 1;
+    """,
+    ["PatientID", "FirstName", "LastName", "DepartmentCount"],
+)
+
+catalog.add_report(
+    "Generate a report showing total revenue per branch for the last month",
+    "Advanced Aggregate Functions",
+    """
+        SELECT hb.Branch_Name, SUM(b.TotalAmount) AS TotalRevenue
+        FROM Billing b
+        INNER JOIN Hospital_Branch hb USING(Branch_ID)
+        WHERE b.PaymentDate BETWEEN DATE_SUB(CURDATE(), INTERVAL 1 MONTH) AND CURDATE()
+        GROUP BY hb.Branch_Name;
+    """,
+    ["Branch_Name", "TotalRevenue"],
+)
+
+catalog.add_report(
+    "Total number of patients by branch and gender",
+    "Advanced Aggregate Functions",
+    """
+        SELECT
+            hb.Branch_Name,
+            p.Gender,
+            COUNT(p.PatientID) AS TotalPatients
+        FROM
+            Patient p
+        INNER JOIN
+            Hospital_Branch hb USING(Branch_ID)
+        GROUP BY
+            hb.Branch_Name, p.Gender;
+    """,
+    ["Branch_Name", "Gender", "TotalPatients"],
+)
+
+catalog.add_report(
+    "Calculate the total length of stay for each patient",
+    "Advanced Aggregate Functions",
+    """
+        SELECT
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientFullName,
+            SUM(DATEDIFF(hs.DischargeDate, hs.AdmitDate)) AS TotalStayLength
+        FROM
+            HospitalStay hs
+        INNER JOIN
+            Patient p USING(PatientID)
+        GROUP BY
+            p.PatientID, PatientFullName;
+    """,
+    ["PatientID", "PatientFullName", "TotalStayLength"],
+)
+
+catalog.add_report(
+    "Room Availability Summary by Branch",
+    "Advanced Aggregate Functions",
+    """
+        SELECT
+            hb.Branch_ID,
+            hb.Branch_Name,
+            COUNT(r.RoomID) AS TotalRooms,
+            SUM(CASE WHEN r.Availability = TRUE THEN 1 ELSE 0 END) AS AvailableRooms
+        FROM
+            Room r
+        INNER JOIN
+            Hospital_Branch hb USING(Branch_ID)
+        GROUP BY
+            hb.Branch_ID, hb.Branch_Name;
+    """,
+    ["Branch_ID", "Branch_Name", "TotalRooms", "AvailableRooms"],
+)
+
+catalog.add_report(
+    "Availability by Room Type and Branch",
+    "Advanced Aggregate Functions",
+    """
+        SELECT
+            r.RoomType,
+            hb.Branch_Name,
+            COUNT(r.RoomID) AS TotalRooms,
+            SUM(CASE WHEN r.Availability = TRUE THEN 1 ELSE 0 END) AS AvailableRooms
+        FROM
+            Room r
+        INNER JOIN
+            Hospital_Branch hb ON r.Branch_ID = hb.Branch_ID
+        GROUP BY
+            r.RoomType, hb.Branch_Name;
+    """,
+    ["RoomType", "Branch_Name", "TotalRooms", "AvailableRooms"],
+)
+
+catalog.add_report(
+    "Calculate the Number of Days Since Last Appointment",
+    "Advanced Aggregate Functions",
+    """
+        SELECT
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientFullName,
+            MAX(a.AppointmentDate) AS LastAppointmentDate,
+            DATEDIFF(CURDATE(), MAX(a.AppointmentDate)) AS DaysSinceLastAppointment
+        FROM
+            Appointment a
+        INNER JOIN
+            Patient p USING(PatientID)
+        GROUP BY
+            p.PatientID, PatientFullName
+        HAVING
+            DaysSinceLastAppointment > 0
+        ORDER BY
+            DaysSinceLastAppointment DESC;
+    """,
+    ["PatientID", "PatientFullName", "LastAppointmentDate", "DaysSinceLastAppointment"],
+)
+
+
+# OLAP ---------------------------------------------------------------------------------------------
+catalog.add_category(
+    "OLAP",
+    "**OLAP**: Online Analytical Processing functions (`ROLLUP`, `CUBE`, window functions) in SQL are used for complex data analysis, allowing multidimensional views and aggregations in reports.",
+)
+
+catalog.add_report(
+    "Calculate the next payment amount for each patient",
+    "OLAP",
+    """
+        SELECT p.PatientID, p.FirstName, p.LastName, b.PaymentDate, b.TotalAmount,
+            LEAD(b.TotalAmount, 1) OVER (PARTITION BY p.PatientID ORDER BY b.PaymentDate)
+            AS NextPaymentAmount
+        FROM Billing b
+        INNER JOIN Patient p USING(PatientID)
+        ORDER BY p.PatientID, b.PaymentDate;
+    """,
+    [
+        "PatientID",
+        "FirstName",
+        "LastName",
+        "PaymentDate",
+        "TotalAmount",
+        "NextPaymentAmount",
+    ],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Calculate the previous payment amount for each patient",
+    "OLAP",
+    """
+        SELECT p.PatientID, p.FirstName, p.LastName, b.PaymentDate, b.TotalAmount,
+            LAG(b.TotalAmount, 1) OVER (PARTITION BY p.PatientID ORDER BY b.PaymentDate)
+            AS PreviousPaymentAmount
+        FROM Billing b
+        INNER JOIN Patient p USING(PatientID)
+        ORDER BY p.PatientID, b.PaymentDate;
+    """,
+    [
+        "PatientID",
+        "FirstName",
+        "LastName",
+        "PaymentDate",
+        "TotalAmount",
+        "PreviousPaymentAmount",
+    ],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Total number of appointments per department with a grand total",
+    "OLAP",
+    """
+        SELECT
+            d.DepartmentName,
+            COUNT(a.AppointmentID) AS TotalAppointments
+        FROM
+            Appointment a
+        INNER JOIN
+            Doctor doc ON a.DoctorID = doc.DoctorID
+        INNER JOIN
+            Department d ON doc.DepartmentID = d.DepartmentID
+        GROUP BY
+            d.DepartmentName WITH ROLLUP;
+    """,
+    ["DepartmentName", "TotalAppointments"],
+)
+
+catalog.add_report(
+    "Total billing per branch with subtotals",
+    "OLAP",
+    """
+        SELECT
+            hb.Branch_Name,
+            SUM(b.TotalAmount) AS TotalBilling
+        FROM
+            Billing b
+        INNER JOIN
+            Hospital_Branch hb USING(Branch_ID)
+        GROUP BY
+            hb.Branch_Name WITH ROLLUP;
+    """,
+    ["Branch_Name", "TotalBilling"],
+)
+
+catalog.add_report(
+    "Total revenue per branch and payment method",
+    "OLAP",
+    """
+        SELECT
+            hb.Branch_Name,
+            b.PaymentMethod,
+            SUM(b.TotalAmount) AS TotalRevenue
+        FROM
+            Billing b
+        INNER JOIN
+            Hospital_Branch hb USING(Branch_ID)
+        GROUP BY
+            hb.Branch_Name, b.PaymentMethod WITH ROLLUP;
+    """,
+    ["Branch_Name", "PaymentMethod", "TotalRevenue"],
+)
+
+catalog.add_report(
+    "Total billing per payment method with subtotals",
+    "OLAP",
+    """
+        SELECT
+            PaymentMethod,
+            SUM(TotalAmount) AS TotalBilling
+        FROM
+            Billing
+        GROUP BY
+            PaymentMethod WITH ROLLUP;
+    """,
+    ["PaymentMethod", "TotalBilling"],
+)
+
+catalog.add_report(
+    "Total Billing for Each Patient (Cumulative Sum)",
+    "OLAP",
+    """
+        SELECT
+            PatientID,
+            PaymentDate,
+            TotalAmount,
+            SUM(TotalAmount) OVER (PARTITION BY PatientID ORDER BY PaymentDate)
+            AS CumulativeTotalBilling
+        FROM
+            Billing
+        ORDER BY
+            PatientID, PaymentDate;
+    """,
+    ["PatientID", "PaymentDate", "TotalAmount", "CumulativeTotalBilling"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Rank Patients Based on Total Billing Amount in Quartiles",
+    "OLAP",
+    """
+        SELECT
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientFullName,
+            SUM(b.TotalAmount) AS TotalBilling,
+            NTILE(2) OVER (ORDER BY SUM(b.TotalAmount) DESC) AS BillingNTile2,
+            NTILE(3) OVER (ORDER BY SUM(b.TotalAmount) DESC) AS BillingNTile3,
+            NTILE(4) OVER (ORDER BY SUM(b.TotalAmount) DESC) AS BillingNTile4,
+            NTILE(5) OVER (ORDER BY SUM(b.TotalAmount) DESC) AS BillingNTile5
+        FROM
+            Billing b
+        INNER JOIN
+            Patient p USING(PatientID)
+        GROUP BY
+            p.PatientID, PatientFullName
+        ORDER BY
+            TotalBilling DESC;
+    """,
+    [
+        "PatientID",
+        "PatientFullName",
+        "TotalBilling",
+        "BillingNTile2",
+        "BillingNTile3",
+        "BillingNTile4",
+        "BillingNTile5",
+    ],
+)
+
+catalog.add_report(
+    "Running Total of Appointments by Doctor",
+    "OLAP",
+    """
+        SELECT
+            doc.DoctorID,
+            CONCAT(doc.FirstName, ' ', doc.LastName) AS DoctorName,
+            a.AppointmentDate,
+            COUNT(a.AppointmentID) OVER (PARTITION BY doc.DoctorID
+            ORDER BY a.AppointmentDate ROWS BETWEEN UNBOUNDED PRECEDING AND CURRENT ROW)
+            AS RunningTotalAppointments
+        FROM
+            Appointment a
+        INNER JOIN
+            Doctor doc USING(DoctorID)
+        ORDER BY
+            doc.DoctorID, a.AppointmentDate;
+    """,
+    ["DoctorID", "DoctorName", "AppointmentDate", "RunningTotalAppointments"],
+    cost="heavy",
+)
+
+catalog.add_report(
+    "Compare Ranking Methods for Billing",
+    "OLAP",
+    """
+        SELECT
+            p.PatientID,
+            CONCAT(p.FirstName, ' ', p.LastName) AS PatientName,
+            SUM(b.TotalAmount) AS TotalBilling,
+            RANK() OVER (ORDER BY SUM(b.TotalAmount) DESC) AS RankBilling,
+            DENSE_RANK() OVER (ORDER BY SUM(b.TotalAmount) DESC) AS DenseRankBilling
+        FROM
+            Patient p
+        INNER JOIN
+            Billing b USING(PatientID)
+        GROUP BY
+            p.PatientID, p.FirstName, p.LastName
+        ORDER BY
+            RankBilling;
+    """,
+    ["PatientID", "PatientName", "TotalBilling", "RankBilling", "DenseRankBilling"],
+)
+
+catalog.add_report(
+    "Compare Ranking Methods for Appointment",
+    "OLAP",
+    """
+        SELECT
+            doc.DoctorID,
+            CONCAT(doc.FirstName, ' ', doc.LastName) AS DoctorFullName,
+            COUNT(DISTINCT a.PatientID) AS TotalPatients,
+            RANK() OVER (ORDER BY COUNT(DISTINCT a.PatientID) DESC) AS DoctorRank,
+            DENSE_RANK() OVER (ORDER BY COUNT(DISTINCT a.PatientID) DESC) AS DoctorDenseRank
+        FROM
+            Appointment a
+        INNER JOIN
+            Doctor doc USING(DoctorID)
+        GROUP BY
+            doc.DoctorID, DoctorFullName
+        ORDER BY
+            DoctorRank;
+    """,
+    ["DoctorID", "DoctorFullName", "TotalPatients", "DoctorRank", "DoctorDenseRank"],
+)
+
+catalog.add_report(
+    "Rank doctors by the number of patients they have attended",
+    "OLAP",
+    """
+        SELECT
+            doc.DoctorID,
+            CONCAT(doc.FirstName, ' ', doc.LastName) AS DoctorName,
+            COUNT(mr.PatientID) AS TotalPatientsAttended,
+            COUNT(DISTINCT mr.PatientID) AS UniquePatientsTreated,
+            RANK() OVER (ORDER BY COUNT(mr.PatientID) DESC) AS DoctorRank,
+            DENSE_RANK() OVER (ORDER BY COUNT(DISTINCT mr.PatientID) DESC) AS DenseDoctorRank
+        FROM
+            Doctor doc
+        INNER JOIN
+            MedicalRecord mr USING(DoctorID)
+        GROUP BY
+            doc.DoctorID, doc.FirstName, doc.LastName
+        ORDER BY
+            DoctorRank;
+    """,
+    [
+        "DoctorID",
+        "DoctorName",
+        "TotalPatientsAttended",
+        "UniquePatientsTreated",
+        "DoctorRank",
+        "DenseDoctorRank",
+    ],
+)
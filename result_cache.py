@@ -0,0 +1,224 @@
+import streamlit as st
+import pandas as pd
+import datetime
+import hashlib
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+import tables
+
+
+# Optional cache settings in .streamlit/secrets.toml:
+#   CACHE_TTL        seconds a cached result stays valid (default 300)
+#   CACHE_MAX_BYTES  memory budget for all cached results (default 64 MB)
+#   REPORT_CACHE_TTL seconds a cached report stays valid (default 3600)
+def _setting(name, default):
+    return type(default)(st.secrets.get(name, default))
+
+
+# Approximate memory held by a cached value
+def _size_of(value):
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, (tuple, list)):
+        return sum(_size_of(item) for item in value) + sys.getsizeof(value)
+    return sys.getsizeof(value)
+
+
+# Process-wide result cache shared by every session. Entries are tagged with the
+# version of each table they read; a write bumps the version of the written table
+# (and of every table its ON DELETE/UPDATE CASCADE foreign keys reach), which turns
+# older entries into misses. Entries also expire after a TTL and are evicted in
+# least-recently-used order once the byte budget is exceeded.
+class ResultCache:
+    def __init__(self, ttl_seconds, max_bytes):
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> (value, expires_at, size, table_versions)
+        self._versions = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def version(self, table_name):
+        with self._lock:
+            return self._versions.get(table_name, 0)
+
+    def versions(self, table_names):
+        with self._lock:
+            return tuple((name, self._versions.get(name, 0)) for name in table_names)
+
+    # Record a write to table_name; returns the tables whose cached reads were invalidated
+    def bump_table_version(self, table_name):
+        affected = tables.cascade_closure(table_name)
+        with self._lock:
+            for name in affected:
+                self._versions[name] = self._versions.get(name, 0) + 1
+            # Free the memory of entries that can no longer be hit
+            for key, entry in list(self._entries.items()):
+                if any(name in affected for name, _ in entry[3]):
+                    self._drop(key)
+                    self.invalidations += 1
+        return affected
+
+    def _drop(self, key):
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _is_current(self, entry):
+        return entry[1] > time.monotonic() and all(
+            self._versions.get(name, 0) == version for name, version in entry[3]
+        )
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._is_current(entry):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+            if entry is not None:
+                self._drop(key)
+            self.misses += 1
+            return False, None
+
+    def put(self, key, value, table_versions, ttl_seconds=None):
+        size = _size_of(value)
+        if size > self.max_bytes:
+            return
+        expires_at = time.monotonic() + (self.ttl_seconds if ttl_seconds is None else ttl_seconds)
+        with self._lock:
+            # Drop the value if a write landed while it was being loaded
+            if any(self._versions.get(name, 0) != version for name, version in table_versions):
+                return
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = (value, expires_at, size, table_versions)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+                self.evictions += 1
+
+    # Return the cached value for key, or load it and cache it against the
+    # current versions of table_names
+    def get_or_load(self, key, table_names, loader, ttl_seconds=None):
+        table_versions = self.versions(table_names)
+        full_key = (key, table_versions)
+        found, value = self.get(full_key)
+        if found:
+            return value
+        value = loader()
+        self.put(full_key, value, table_versions, ttl_seconds)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+@st.cache_resource(show_spinner=False)
+def get_cache():
+    return ResultCache(
+        ttl_seconds=_setting("CACHE_TTL", 300.0),
+        max_bytes=_setting("CACHE_MAX_BYTES", 64 * 1024 * 1024),
+    )
+
+
+# Cache a read of the given tables under key
+def cached_read(key, table_names, loader, ttl_seconds=None):
+    return get_cache().get_or_load(key, table_names, loader, ttl_seconds)
+
+
+# Called after every committed write so cached reads of the table and its cascades go stale
+def bump_table_version(table_name):
+    return get_cache().bump_table_version(table_name)
+
+
+# REPORT CACHE -----------------------------------------------------------------------------------------
+_STRING_LITERAL = re.compile(r"('(?:[^'\\]|\\.|'')*'|\"(?:[^\"\\]|\\.)*\")")
+_COMMENT = re.compile(r"--[^\n]*|#[^\n]*|/\*.*?\*/", re.S)
+# Results that depend on today's date are valid until midnight
+_DATE_FUNCTIONS = re.compile(r"\b(CURDATE|CURRENT_DATE|UTC_DATE)\b", re.I)
+# Results that change on every call are never cached
+_VOLATILE_FUNCTIONS = re.compile(
+    r"\b(NOW|SYSDATE|CURTIME|CURRENT_TIME|CURRENT_TIMESTAMP|UTC_TIMESTAMP|UTC_TIME|RAND|UUID)\b",
+    re.I,
+)
+
+
+# Canonical form of a query: comments removed, whitespace collapsed and keywords
+# upper-cased outside string literals, trailing semicolons dropped
+def normalize_sql(sql):
+    parts = _STRING_LITERAL.split(sql)
+    for i in range(0, len(parts), 2):
+        text = _COMMENT.sub(" ", parts[i])
+        parts[i] = re.sub(r"\s+", " ", text).upper()
+    return "".join(parts).strip().rstrip(";").strip()
+
+
+def sql_fingerprint(sql):
+    return hashlib.sha1(normalize_sql(sql).encode("utf-8")).hexdigest()
+
+
+# Tables a query reads, found by matching the known table names as whole words
+def referenced_tables(sql):
+    code = " ".join(_STRING_LITERAL.split(normalize_sql(sql))[::2])
+    return [
+        name for name in tables.ALL_TABLES if re.search(rf"\b{name.upper()}\b", code)
+    ]
+
+
+def _seconds_until_midnight():
+    now = datetime.datetime.now()
+    midnight = datetime.datetime.combine(now.date() + datetime.timedelta(days=1), datetime.time())
+    return (midnight - now).total_seconds()
+
+
+# Run loader through the cache under the query's fingerprint and the versions of the
+# tables it reads. Date-relative reports expire at midnight; volatile ones bypass the cache.
+def cached_report(sql, loader, params=None):
+    normalized = normalize_sql(sql)
+    if _VOLATILE_FUNCTIONS.search(normalized):
+        return loader()
+    ttl_seconds = _setting("REPORT_CACHE_TTL", 3600.0)
+    if _DATE_FUNCTIONS.search(normalized):
+        ttl_seconds = min(ttl_seconds, _seconds_until_midnight())
+    key = ("report", sql_fingerprint(sql), repr(params))
+    return cached_read(key, referenced_tables(sql), loader, ttl_seconds)
+
+
+# Sidebar panel with cache hit and miss counters
+def show_cache_stats():
+    stats = get_cache().stats()
+    with st.sidebar.expander("Result cache"):
+        st.write(
+            f"Hits: **{stats['hits']}** / misses: {stats['misses']} "
+            f"({stats['hit_rate']:.0%} hit rate)"
+        )
+        st.write(
+            f"Entries: {stats['entries']} using {stats['bytes'] / 1024 / 1024:.1f} MB "
+            f"of {stats['max_bytes'] / 1024 / 1024:.0f} MB"
+        )
+        st.write(f"Evictions: {stats['evictions']}, invalidations: {stats['invalidations']}")
+        if st.button("Clear cache", key="clear_result_cache"):
+            get_cache().clear()
@@ -4,6 +4,8 @@ CREATE DATABASE HospitalManagement;
 USE HospitalManagement;
 
 /*============================== CREATE TABLES =======================================*/
+/* Secondary indexes are not created here; after loading this file run
+   python -m schema_migrations to apply the versioned migrations in migrations/. */
 
 /* -- create table: Hospital_Branch */
 DROP TABLE IF EXISTS Hospital_Branch;
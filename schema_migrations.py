@@ -0,0 +1,298 @@
+import streamlit as st
+import mysql.connector
+import argparse
+import hashlib
+import os
+import re
+import threading
+import time
+import db
+
+
+# Versioned schema migrations. Each file in migrations/ is named NNNN_description.sql
+# and runs once, in version order; applied versions are recorded in schema_migrations.
+# CREATE INDEX and DROP INDEX statements are applied idempotently against the live
+# schema, so a database that already has some of the indexes can be migrated safely.
+# A migration whose file starts with a "-- optional" comment line may fail (e.g. on a
+# server without the feature it needs); it is then left pending and the later ones run.
+# Apply from the repository root with: python -m schema_migrations
+# Optional DB_AUTO_MIGRATE setting in .streamlit/secrets.toml: apply pending
+# migrations when the app starts (default false; the app only reports them).
+# Optional DB_SCHEMA_CHECK_RETRY setting: seconds before a failed startup check or
+# migration is tried again (default 300).
+def _setting(name, default):
+    value = st.secrets.get(name, default)
+    if isinstance(default, bool) and isinstance(value, str):
+        return value.strip().lower() in ("1", "true", "yes", "on")
+    return type(default)(value)
+
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "migrations")
+
+VERSION_TABLE = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version     INT UNSIGNED PRIMARY KEY,
+        name        VARCHAR(255) NOT NULL,
+        checksum    CHAR(64) NOT NULL,
+        applied_at  DATETIME DEFAULT CURRENT_TIMESTAMP NOT NULL
+    )
+"""
+
+_FILE_NAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+_OPTIONAL = re.compile(r"\A\s*--\s*optional\b", re.I)
+_COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+_CREATE_INDEX = re.compile(
+    r"^CREATE\s+(?:UNIQUE\s+|FULLTEXT\s+)?INDEX\s+(\w+)\s+ON\s+(\w+)\s*\(([^)]*)\)$", re.I | re.S
+)
+_DROP_INDEX = re.compile(r"^DROP\s+INDEX\s+(\w+)\s+ON\s+(\w+)$", re.I)
+
+
+# Migration files as a list of {"version", "name", "sql", "checksum", "optional"} dicts
+# in version order
+def load_migrations():
+    migrations = []
+    for file_name in os.listdir(MIGRATIONS_DIR):
+        match = _FILE_NAME.match(file_name)
+        if not match:
+            continue
+        with open(os.path.join(MIGRATIONS_DIR, file_name), encoding="utf-8") as handle:
+            sql = handle.read()
+        migrations.append(
+            {
+                "version": int(match.group(1)),
+                "name": match.group(2),
+                "sql": sql,
+                "checksum": hashlib.sha256(sql.encode()).hexdigest(),
+                "optional": bool(_OPTIONAL.match(sql)),
+            }
+        )
+    return sorted(migrations, key=lambda migration: migration["version"])
+
+
+def split_statements(sql):
+    statements = _COMMENTS.sub("", sql).split(";")
+    return [statement.strip() for statement in statements if statement.strip()]
+
+
+def _columns(column_list):
+    return [column.strip().strip("`").split("(")[0].lower() for column in column_list.split(",")]
+
+
+# Index set the migrations produce: {(table, index): [columns]}
+def expected_indexes(migrations=None):
+    indexes = {}
+    for migration in migrations or load_migrations():
+        for statement in split_statements(migration["sql"]):
+            create = _CREATE_INDEX.match(statement)
+            drop = _DROP_INDEX.match(statement)
+            if create:
+                indexes[(create.group(2), create.group(1))] = _columns(create.group(3))
+            elif drop:
+                indexes.pop((drop.group(2), drop.group(1)), None)
+    return indexes
+
+
+# Indexes of the connected database as {(lower-cased table, index): [columns]}
+def live_indexes(cursor):
+    cursor.execute(
+        "SELECT TABLE_NAME, INDEX_NAME, COLUMN_NAME FROM information_schema.STATISTICS "
+        "WHERE TABLE_SCHEMA = DATABASE() ORDER BY TABLE_NAME, INDEX_NAME, SEQ_IN_INDEX"
+    )
+    indexes = {}
+    for table_name, index_name, column_name in cursor.fetchall():
+        indexes.setdefault((table_name.lower(), index_name), []).append(column_name.lower())
+    return indexes
+
+
+# Run one statement; index statements are skipped when the schema already matches,
+# and an index with the right name but the wrong columns is rebuilt
+def _apply_statement(cursor, statement, live):
+    create = _CREATE_INDEX.match(statement)
+    drop = _DROP_INDEX.match(statement)
+    if create:
+        index_name, table_name = create.group(1), create.group(2)
+        key = (table_name.lower(), index_name)
+        if key in live:
+            if live[key] == _columns(create.group(3)):
+                return False
+            cursor.execute(f"DROP INDEX {index_name} ON {table_name}")
+        cursor.execute(statement)
+        live[key] = _columns(create.group(3))
+        return True
+    if drop:
+        key = (drop.group(2).lower(), drop.group(1))
+        if key not in live:
+            return False
+        cursor.execute(statement)
+        del live[key]
+        return True
+    cursor.execute(statement)
+    return True
+
+
+# MySQL error for a table that does not exist
+ER_NO_SUCH_TABLE = 1146
+
+
+# {version: checksum} of the applied migrations; empty before the first migration
+def applied_versions(cursor):
+    try:
+        cursor.execute("SELECT version, checksum FROM schema_migrations")
+    except mysql.connector.Error as err:
+        if err.errno == ER_NO_SUCH_TABLE:
+            return {}
+        raise
+    return dict(cursor.fetchall())
+
+
+def _label(migration):
+    return f"{migration['version']:04d}_{migration['name']}"
+
+
+# Apply every pending migration in order. Returns {"applied": [names], "skipped":
+# ["name (error)"]}, skipped being the optional migrations that failed and stay pending.
+# DDL commits implicitly in MySQL, so each statement stands on its own and a migration
+# is recorded only after all of its statements ran.
+def apply_pending(conn):
+    applied, skipped = [], []
+    with conn.cursor() as cursor:
+        cursor.execute(VERSION_TABLE)
+        versions = applied_versions(cursor)
+        live = live_indexes(cursor)
+        for migration in load_migrations():
+            if migration["version"] in versions:
+                continue
+            try:
+                for statement in split_statements(migration["sql"]):
+                    _apply_statement(cursor, statement, live)
+            except mysql.connector.Error as err:
+                if not migration["optional"]:
+                    raise
+                skipped.append(f"{_label(migration)} ({err.msg})")
+                live = live_indexes(cursor)
+                continue
+            cursor.execute(
+                "INSERT INTO schema_migrations (version, name, checksum) VALUES (%s, %s, %s)",
+                (migration["version"], migration["name"], migration["checksum"]),
+            )
+            conn.commit()
+            applied.append(_label(migration))
+    return {"applied": applied, "skipped": skipped}
+
+
+# Compare the live database with the migrations. Returns a dict of lists: pending
+# migrations, pending optional migrations, applied migrations whose file has changed
+# since, and indexes that are missing or have different columns than expected. The
+# indexes of pending optional migrations are not expected.
+def verify(conn):
+    migrations = load_migrations()
+    with conn.cursor() as cursor:
+        versions = applied_versions(cursor)
+        live = live_indexes(cursor)
+    status = {"pending": [], "optional": [], "modified": [], "missing": [], "mismatched": []}
+    for migration in migrations:
+        if migration["version"] not in versions:
+            status["optional" if migration["optional"] else "pending"].append(_label(migration))
+        elif versions[migration["version"]] != migration["checksum"]:
+            status["modified"].append(_label(migration))
+    expected = expected_indexes(
+        [
+            migration
+            for migration in migrations
+            if migration["version"] in versions or not migration["optional"]
+        ]
+    )
+    for (table_name, index_name), columns in expected.items():
+        key = (table_name.lower(), index_name)
+        if key not in live:
+            status["missing"].append(f"{index_name} ON {table_name}")
+        elif live[key] != columns:
+            status["mismatched"].append(f"{index_name} ON {table_name}")
+    return status
+
+
+# STARTUP CHECK ----------------------------------------------------------------------------------------
+# Holder of the process's startup check: its status once it succeeded, or the last
+# error and when it happened
+@st.cache_resource(show_spinner=False)
+def _startup_holder():
+    return {"status": None, "error": None, "failed_at": 0.0, "lock": threading.Lock()}
+
+
+# Verified once per process (and migrated first when DB_AUTO_MIGRATE is on). A failure
+# is kept for DB_SCHEMA_CHECK_RETRY seconds rather than retried, with its DDL, on every
+# rerun. Returns (status, error), one of them None.
+def _startup_status():
+    holder = _startup_holder()
+    with holder["lock"]:
+        if holder["status"] is None and (
+            holder["error"] is None
+            or time.monotonic() - holder["failed_at"] > _setting("DB_SCHEMA_CHECK_RETRY", 300.0)
+        ):
+            try:
+                with db.get_connection() as mydb:
+                    if _setting("DB_AUTO_MIGRATE", False):
+                        result = apply_pending(mydb)
+                    else:
+                        result = {"applied": [], "skipped": []}
+                    status = verify(mydb)
+            except mysql.connector.Error as err:
+                holder["error"], holder["failed_at"] = err, time.monotonic()
+            else:
+                holder["status"], holder["error"] = {**status, **result}, None
+        return holder["status"], holder["error"]
+
+
+# Sidebar warning when the live schema does not match the migrations
+def show_schema_status():
+    status, error = _startup_status()
+    if error is not None:
+        st.sidebar.error(f"Schema check failed: {error}")
+        return
+    if status["applied"]:
+        st.sidebar.info("Applied schema migrations: " + ", ".join(status["applied"]))
+    if status["skipped"]:
+        st.sidebar.info("Optional migrations left pending: " + ", ".join(status["skipped"]))
+    problems = [
+        f"{label}: {', '.join(status[key])}"
+        for key, label in [
+            ("pending", "Pending migrations"),
+            ("modified", "Migrations changed after they were applied"),
+            ("missing", "Missing indexes"),
+            ("mismatched", "Indexes with unexpected columns"),
+        ]
+        if status[key]
+    ]
+    if problems:
+        st.sidebar.warning(
+            "The database schema is out of date. Run `python -m schema_migrations`.\n\n"
+            + "\n\n".join(problems)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Apply or check schema migrations")
+    parser.add_argument("--status", action="store_true", help="only report, apply nothing")
+    args = parser.parse_args()
+
+    conn = mysql.connector.connect(
+        host=st.secrets["DB_HOST"],
+        user=st.secrets["DB_USER"],
+        password=st.secrets["DB_PASSWORD"],
+        database=st.secrets["DB_NAME"],
+    )
+    try:
+        if not args.status:
+            result = apply_pending(conn)
+            for name in result["applied"]:
+                print(f"Applied {name}")
+            for name in result["skipped"]:
+                print(f"Skipped optional {name}")
+        for key, items in verify(conn).items():
+            print(f"{key:>10}: {', '.join(items) if items else 'none'}")
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
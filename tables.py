@@ -0,0 +1,91 @@
+# Primary key column of every table managed by the application
+PRIMARY_KEYS = {
+    "Doctor": "DoctorID",
+    "Patient": "PatientID",
+    "Appointment": "AppointmentID",
+    "Hospital_Branch": "Branch_ID",
+    "Department": "DepartmentID",
+    "Nurse": "NurseID",
+    "MedicalRecord": "RecordID",
+    "Room": "RoomID",
+    "HospitalStay": "StayID",
+    "Billing": "BillID",
+}
+
+# Every table in schema.sql, including the trigger-maintained PatientHistory
+ALL_TABLES = list(PRIMARY_KEYS) + ["PatientHistory"]
+
+# Key column of every table, for code that handles rows of any of them
+ROW_KEYS = dict(PRIMARY_KEYS, PatientHistory="HistoryID")
+
+# Columns supplied when a record is created, in the order of the INSERT templates
+INSERT_COLUMNS = {
+    "Patient": [
+        "FirstName", "LastName", "Gender", "DateOfBirth", "Address", "Phone", "Email", "Branch_ID"
+    ],
+    "Hospital_Branch": ["Branch_Name", "Branch_Address", "Branch_Phone_Number", "State", "Zip_Code"],
+    "Department": ["DepartmentName", "Location", "Branch_ID"],
+    "Doctor": ["FirstName", "LastName", "Phone", "Email", "DepartmentID", "Branch_ID"],
+    "Nurse": ["FirstName", "LastName", "Phone", "Email", "Branch_ID"],
+    "Appointment": [
+        "PatientID", "DoctorID", "AppointmentDate", "AppointmentTime", "ReasonForVisit", "Branch_ID"
+    ],
+    "MedicalRecord": ["PatientID", "DoctorID", "Diagnosis", "Treatment", "Branch_ID"],
+    "Room": ["RoomNumber", "RoomType", "Availability", "Branch_ID"],
+    "HospitalStay": [
+        "PatientID", "RoomID", "AdmitDate", "DischargeDate", "AssignedNurseID", "Branch_ID"
+    ],
+    "Billing": ["PatientID", "TotalAmount", "PaymentDate", "PaymentMethod", "Branch_ID"],
+}
+
+# Non-text columns and the Python type they are stored as; every other column is text
+COLUMN_KINDS = {
+    "Branch_ID": "int",
+    "DepartmentID": "int",
+    "PatientID": "int",
+    "DoctorID": "int",
+    "RoomID": "int",
+    "AssignedNurseID": "int",
+    "DateOfBirth": "date",
+    "AppointmentDate": "date",
+    "AdmitDate": "date",
+    "DischargeDate": "date",
+    "PaymentDate": "date",
+    "AppointmentTime": "time",
+    "TotalAmount": "decimal",
+    "Availability": "bool",
+}
+
+# Foreign keys from schema.sql as (child table, child column, parent table).
+# Every one of them is ON DELETE CASCADE ON UPDATE CASCADE.
+FOREIGN_KEYS = [
+    ("Department", "Branch_ID", "Hospital_Branch"),
+    ("Patient", "Branch_ID", "Hospital_Branch"),
+    ("Doctor", "Branch_ID", "Hospital_Branch"),
+    ("Nurse", "Branch_ID", "Hospital_Branch"),
+    ("Appointment", "PatientID", "Patient"),
+    ("Appointment", "DoctorID", "Doctor"),
+    ("Appointment", "Branch_ID", "Hospital_Branch"),
+    ("MedicalRecord", "PatientID", "Patient"),
+    ("MedicalRecord", "DoctorID", "Doctor"),
+    ("MedicalRecord", "Branch_ID", "Hospital_Branch"),
+    ("Room", "Branch_ID", "Hospital_Branch"),
+    ("HospitalStay", "PatientID", "Patient"),
+    ("HospitalStay", "RoomID", "Room"),
+    ("HospitalStay", "AssignedNurseID", "Nurse"),
+    ("HospitalStay", "Branch_ID", "Hospital_Branch"),
+    ("Billing", "PatientID", "Patient"),
+    ("Billing", "Branch_ID", "Hospital_Branch"),
+    ("PatientHistory", "PatientID", "Patient"),
+]
+
+
+# Tables whose rows can change when a row of table_name is written,
+# i.e. the table itself plus everything reached through cascading foreign keys
+def cascade_closure(table_name):
+    reached = [table_name]
+    for parent in reached:
+        for child, _, fk_parent in FOREIGN_KEYS:
+            if fk_parent == parent and child not in reached:
+                reached.append(child)
+    return reached
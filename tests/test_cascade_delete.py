@@ -0,0 +1,98 @@
+import contextlib
+import sqlite3
+import pytest
+import streamlit as st
+import cascade_delete
+import tables
+
+
+# sqlite3 behind the parts of the mysql.connector API the chunked delete uses
+class _Cursor:
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.cursor.close()
+
+    def execute(self, sql, params=()):
+        self.cursor.execute(sql.replace("%s", "?"), list(params))
+        self.rowcount = self.cursor.rowcount
+
+    def fetchone(self):
+        return self.cursor.fetchone()
+
+    def fetchall(self):
+        return self.cursor.fetchall()
+
+
+class _Connection:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def cursor(self):
+        return _Cursor(self.conn.cursor())
+
+    def start_transaction(self):
+        pass
+
+    def commit(self):
+        self.conn.commit()
+
+    def rollback(self):
+        self.conn.rollback()
+
+
+# Every table with its key and foreign key columns; patient 1 has rows in each child
+# table, patient 2 in none, so only patient 1's rows may go
+@pytest.fixture
+def database(monkeypatch):
+    conn = sqlite3.connect(":memory:")
+    for table_name in tables.ALL_TABLES:
+        columns = [tables.ROW_KEYS[table_name]] + [
+            column for child, column, _ in tables.FOREIGN_KEYS if child == table_name
+        ]
+        conn.execute(f"CREATE TABLE {table_name} ({', '.join(columns)})")
+    conn.execute("INSERT INTO Hospital_Branch VALUES (1)")
+    conn.executemany("INSERT INTO Patient (PatientID, Branch_ID) VALUES (?, 1)", [(1,), (2,)])
+    for table_name in ["Appointment", "MedicalRecord", "HospitalStay", "Billing", "PatientHistory"]:
+        key = tables.ROW_KEYS[table_name]
+        conn.executemany(
+            f"INSERT INTO {table_name} ({key}, PatientID) VALUES (?, ?)",
+            [(row_id, 1 if row_id <= 5 else 2) for row_id in range(1, 8)],
+        )
+    conn.commit()
+
+    monkeypatch.setattr(
+        cascade_delete.db, "get_connection", lambda: contextlib.nullcontext(_Connection(conn))
+    )
+    # Chunks of two rows, so every table is deleted in several transactions
+    monkeypatch.setattr(
+        st,
+        "secrets",
+        {"BATCH_CHUNK_SIZE": 2, "BATCH_MAX_CHUNK_SIZE": 2, "BATCH_TXN_SECONDS": 60.0},
+    )
+    return conn
+
+
+def _count(conn, table_name, patient_id):
+    return conn.execute(
+        f"SELECT COUNT(*) FROM {table_name} WHERE PatientID = ?", (patient_id,)
+    ).fetchone()[0]
+
+
+def test_chunked_patient_delete_removes_history_rows(database):
+    steps = cascade_delete.plan("Patient", 1)
+    assert {step["Table"]: step["Rows"] for step in steps}["PatientHistory"] == 5
+
+    deleted = {}
+    for table_name, rows in cascade_delete.delete_in_chunks("Patient", 1, steps):
+        deleted[table_name] = deleted.get(table_name, 0) + rows
+
+    assert deleted == {step["Table"]: step["Rows"] for step in steps}
+    for table_name in ["Appointment", "MedicalRecord", "HospitalStay", "Billing", "PatientHistory"]:
+        assert _count(database, table_name, 1) == 0
+        assert _count(database, table_name, 2) == 2
+    assert database.execute("SELECT PatientID FROM Patient").fetchall() == [(2,)]
@@ -0,0 +1,21 @@
+import pytest
+import validation
+from benchmarks import generate_data
+from tests.test_seed_data import seed_rows
+
+
+# Generated rows must pass the same rules as the seed data, so records of a generated
+# database can be edited in the app
+@pytest.mark.parametrize("table_name", list(generate_data.GENERATORS))
+def test_generated_rows_pass_validation(table_name):
+    columns = generate_data.COLUMNS[table_name]
+    for row in generate_data.GENERATORS[table_name](42, generate_data.scale(300)):
+        assert validation.validate_record(table_name, dict(zip(columns, row))) == []
+
+
+def test_generated_payment_methods_match_the_seed():
+    seeded = {
+        record["PaymentMethod"] for table_name, _, record in seed_rows() if table_name == "Billing"
+    }
+    generated = {row[4] for row in generate_data._billing(42, generate_data.scale(300))}
+    assert generated == seeded
@@ -0,0 +1,34 @@
+import pytest
+import query_governor
+
+
+@pytest.mark.parametrize(
+    "sql, expected",
+    [
+        ("SELECT 1", "SELECT 1"),
+        ("SELECT 1;  ", "SELECT 1"),
+        ("SELECT 1; -- done", "SELECT 1"),
+        ("/* report */ SELECT ';' AS s", "/* report */ SELECT ';' AS s"),
+        ("SELECT '/*+ not a hint */' AS s", "SELECT '/*+ not a hint */' AS s"),
+        ("WITH t AS (SELECT 1) SELECT * FROM t", "WITH t AS (SELECT 1) SELECT * FROM t"),
+    ],
+)
+def test_single_statement_accepts_one_read(sql, expected):
+    assert query_governor.single_statement(sql) == expected
+
+
+@pytest.mark.parametrize(
+    "sql",
+    [
+        "SELECT 1; SELECT 2",
+        "SELECT 1; DROP TABLE Patient",
+        "DELETE FROM Patient",
+        "SELECT /*!50000 SLEEP(100) */ 1",
+        "SELECT /*+ MAX_EXECUTION_TIME(100000000) */ * FROM Patient",
+        "SELECT /*+ SET_VAR(max_execution_time=0) */ * FROM Patient",
+        "SELECT * FROM Patient INTO OUTFILE '/tmp/patients.csv'",
+    ],
+)
+def test_single_statement_rejects(sql):
+    with pytest.raises(query_governor.GovernorError):
+        query_governor.single_statement(sql)
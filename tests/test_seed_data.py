@@ -0,0 +1,56 @@
+import datetime
+import decimal
+import os
+import re
+import pytest
+import tables
+import validation
+
+
+# Every row of the seed data in schema.sql must pass the rules the forms and the bulk
+# import apply, or records created by the seed could not be edited in the app
+SCHEMA_SQL = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "schema.sql")
+
+_INSERT = re.compile(r"^INSERT INTO (\w+)\s*\(([^)]*)\)\s*VALUES(.*?);", re.M | re.S)
+_TOKEN = re.compile(r"'(?:[^'\\]|\\.|'')*'|NULL|TRUE|FALSE|-?\d+(?:\.\d+)?|[(),]", re.I)
+
+
+def _value(column, token):
+    if token.startswith("'"):
+        text = token[1:-1].replace("''", "'")
+        if tables.COLUMN_KINDS.get(column) == "date":
+            return datetime.date.fromisoformat(text)
+        return text
+    if token.upper() == "NULL":
+        return None
+    if token.upper() in ("TRUE", "FALSE"):
+        return token.upper() == "TRUE"
+    return decimal.Decimal(token) if "." in token else int(token)
+
+
+# (table, row number, record dict) of every seed row
+def seed_rows():
+    with open(SCHEMA_SQL, encoding="utf-8") as handle:
+        sql = handle.read()
+    rows = []
+    for table_name, column_list, values in _INSERT.findall(sql):
+        columns = [column.strip() for column in column_list.split(",")]
+        record = []
+        for token in _TOKEN.findall(values):
+            if token == "(":
+                record = []
+            elif token == ")":
+                rows.append((table_name, len(rows) + 1, dict(zip(columns, record))))
+            elif token != ",":
+                record.append(_value(columns[len(record)], token))
+    return rows
+
+
+def test_seed_data_is_parsed():
+    seeded = {table_name for table_name, _, _ in seed_rows()}
+    assert set(tables.INSERT_COLUMNS) <= seeded
+
+
+@pytest.mark.parametrize("table_name, row_number, record", seed_rows())
+def test_seed_row_passes_validation(table_name, row_number, record):
+    assert validation.validate_record(table_name, record) == []
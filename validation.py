@@ -0,0 +1,285 @@
+import pandas as pd
+import decimal
+import re
+import tables
+
+
+# Field rules shared by the create and update forms and the bulk import. Rules are
+# compiled once at import; the same rule checks a single form value or a whole
+# DataFrame column in one vectorized pass.
+# The values of the seed data in schema.sql, which ApplyDebitCardDiscount relies on
+PAYMENT_METHODS = ["Cash", "Credit Card", "Debit Card", "Insurance"]
+GENDERS = ["Male", "Female", "Other"]
+
+
+class Rule:
+    # kind is one of "alpha", "digits", "not_empty", "pattern", "positive" or "choice";
+    # an "alpha" rule also accepts the separator characters listed in allowed
+    def __init__(self, column, kind, message, pattern=None, choices=None, allowed=""):
+        self.column = column
+        self.kind = kind
+        self.message = message
+        self.pattern = pattern
+        self.regex = re.compile(pattern) if pattern else None
+        self.choices = choices
+        self.allowed = allowed
+        self.allowed_regex = f"[{re.escape(allowed)}]" if allowed else None
+
+    def check_value(self, value):
+        if self.kind == "positive":
+            number = to_number(tables.COLUMN_KINDS.get(self.column), value)
+            return number is not None and number > 0
+        if self.kind == "choice":
+            return value in self.choices
+        text = "" if value is None else str(value)
+        if self.kind == "alpha":
+            return text.translate({ord(char): None for char in self.allowed}).isalpha()
+        if self.kind == "digits":
+            return text.isdigit()
+        if self.kind == "not_empty":
+            return bool(text.strip())
+        return self.regex.fullmatch(text) is not None
+
+    # Boolean Series, True where the value passes
+    def check_series(self, series):
+        if self.kind == "positive":
+            return pd.to_numeric(series, errors="coerce").gt(0)
+        if self.kind == "choice":
+            return series.isin(self.choices)
+        text = series.astype("str").fillna("")
+        if self.kind == "alpha":
+            if self.allowed_regex:
+                text = text.str.replace(self.allowed_regex, "", regex=True)
+            passed = text.str.isalpha()
+        elif self.kind == "digits":
+            passed = text.str.isdigit()
+        elif self.kind == "not_empty":
+            passed = text.str.strip().str.len().gt(0)
+        else:
+            passed = text.str.fullmatch(self.pattern)
+        return passed.fillna(False).astype(bool)
+
+
+def _person_rules():
+    return [
+        Rule(
+            "FirstName",
+            "alpha",
+            "First name must contain only letters, spaces, hyphens and apostrophes.",
+            allowed=" -'",
+        ),
+        Rule(
+            "LastName",
+            "alpha",
+            "Last name must contain only letters, spaces, hyphens and apostrophes.",
+            allowed=" -'",
+        ),
+        Rule(
+            "Phone",
+            "pattern",
+            "Phone number must be in the format: 123-456-7890.",
+            pattern=r"\d{3}-\d{3}-\d{4}",
+        ),
+        Rule("Email", "pattern", "Invalid email format.", pattern=r"[^@]+@[^@]+\.[^@]+"),
+    ]
+
+
+RULES = {
+    "Patient": _person_rules()
+    + [Rule("Gender", "choice", "Gender must be Male, Female or Other.", choices=GENDERS)],
+    "Hospital_Branch": [
+        Rule(
+            "Branch_Name",
+            "pattern",
+            "Branch name must contain only alphabetic characters and spaces.",
+            pattern=r"[a-zA-Z\s]+",
+        ),
+        Rule(
+            "Branch_Phone_Number",
+            "pattern",
+            "Phone number must be in the format: 123-456-7891.",
+            pattern=r"\d{3}-\d{3}-\d{4}",
+        ),
+        Rule(
+            "State", "alpha", "State must contain only alphabetic characters and spaces.", allowed=" "
+        ),
+        Rule("Zip_Code", "digits", "Zip code must be numeric."),
+    ],
+    "Department": [
+        Rule(
+            "DepartmentName",
+            "pattern",
+            "Department name must contain only capital letters, spaces, commas and '&'.",
+            pattern=r"[A-Z\s,&]+",
+        ),
+        Rule(
+            "Location",
+            "alpha",
+            "Location must contain only alphabetic characters and spaces.",
+            allowed=" ",
+        ),
+    ],
+    "Doctor": _person_rules(),
+    "Nurse": _person_rules(),
+    "Appointment": [
+        Rule("PatientID", "positive", "Patient ID must be a positive number."),
+        Rule("DoctorID", "positive", "Doctor ID must be a positive number."),
+        Rule("ReasonForVisit", "not_empty", "Reason for visit cannot be empty."),
+    ],
+    "MedicalRecord": [
+        Rule("PatientID", "positive", "Patient ID must be a positive number."),
+        Rule("DoctorID", "positive", "Doctor ID must be a positive number."),
+        Rule("Diagnosis", "not_empty", "Diagnosis cannot be empty."),
+        Rule("Treatment", "not_empty", "Treatment cannot be empty."),
+    ],
+    "Room": [
+        Rule("RoomNumber", "not_empty", "Room number cannot be empty."),
+        Rule("RoomType", "alpha", "Room type must contain only alphabetic characters."),
+    ],
+    "HospitalStay": [
+        Rule("PatientID", "positive", "Patient ID must be a positive number."),
+        Rule("RoomID", "positive", "Room ID must be a positive number."),
+        Rule("AssignedNurseID", "positive", "Assigned Nurse ID must be a positive number."),
+    ],
+    "Billing": [
+        Rule("PatientID", "positive", "Patient ID must be a positive number."),
+        Rule("TotalAmount", "positive", "Total amount must be a positive number."),
+        Rule(
+            "PaymentMethod",
+            "choice",
+            "Payment method must be Cash, Credit Card, Debit Card or Insurance.",
+            choices=PAYMENT_METHODS,
+        ),
+    ],
+}
+
+_RULES_BY_COLUMN = {
+    (table_name, rule.column): rule for table_name, rules in RULES.items() for rule in rules
+}
+
+# Text the forms normalize before validating, applied to bulk rows as well
+NORMALIZE = {
+    ("Patient", "FirstName"): "capitalize",
+    ("Patient", "LastName"): "capitalize",
+    ("Doctor", "FirstName"): "capitalize",
+    ("Doctor", "LastName"): "capitalize",
+    ("Nurse", "FirstName"): "capitalize",
+    ("Nurse", "LastName"): "capitalize",
+    ("Department", "DepartmentName"): "upper",
+}
+
+DISCHARGE_MESSAGE = "Discharge date cannot be earlier than the admit date."
+
+
+# Number held by a form value or cell, or None when it is not one
+def to_number(kind, value):
+    try:
+        if kind == "int":
+            if isinstance(value, str) and not value.strip().isdigit():
+                return None
+            return int(value)
+        return decimal.Decimal(str(value).strip())
+    except (ValueError, TypeError, decimal.InvalidOperation):
+        return None
+
+
+# SINGLE FORM ------------------------------------------------------------------------------------------
+# Error message of one form field, or None when the value is valid (or has no rule)
+def field_error(table_name, column, value):
+    rule = _RULES_BY_COLUMN.get((table_name, column))
+    if rule is None or rule.check_value(value):
+        return None
+    return rule.message
+
+
+def is_valid(table_name, column, value):
+    return field_error(table_name, column, value) is None
+
+
+def message(table_name, column):
+    return _RULES_BY_COLUMN[(table_name, column)].message
+
+
+# Rule of a column, or None when the column is not checked
+def rule(table_name, column):
+    return _RULES_BY_COLUMN.get((table_name, column))
+
+
+# Error messages for a whole record (a dict of column values); empty when it is valid
+def validate_record(table_name, record):
+    errors = [
+        rule.message
+        for rule in RULES.get(table_name, [])
+        if rule.column in record and not rule.check_value(record[rule.column])
+    ]
+    stay_dates = table_name == "HospitalStay" and {"AdmitDate", "DischargeDate"} <= set(record)
+    if stay_dates and record["DischargeDate"] < record["AdmitDate"]:
+        errors.append(DISCHARGE_MESSAGE)
+    return errors
+
+
+# DATAFRAMES -------------------------------------------------------------------------------------------
+# Join the messages of failed checks per row; only failing rows are touched
+def _messages(index, failures):
+    errors = pd.Series("", index=index, dtype=object)
+    for failed, message in failures:
+        if failed.any():
+            errors[failed] = errors[failed] + message + " "
+    return errors.str.strip()
+
+
+# Type the INSERT columns of a DataFrame read from a file. Returns the typed DataFrame
+# (Python objects, ready to send to MySQL) and a Series of conversion error messages.
+def coerce_frame(table_name, df):
+    typed = pd.DataFrame(index=df.index)
+    failures = []
+    for column in tables.INSERT_COLUMNS[table_name]:
+        kind = tables.COLUMN_KINDS.get(column, "text")
+        raw = df[column]
+        if kind == "text":
+            failed = raw.isna()
+            values = raw.astype("str").fillna("")
+            mode = NORMALIZE.get((table_name, column))
+            if mode:
+                values = getattr(values.str, mode)()
+            typed[column] = values.astype(object)
+            failures.append((failed, f"{column} is not a valid text value."))
+            continue
+
+        # CSV cells arrive as text, Parquet columns may already be typed
+        text = raw.astype("str").str.strip() if raw.dtype.kind not in "biufcmM" else raw
+        if kind == "int":
+            numbers = pd.to_numeric(text, errors="coerce")
+            failed = numbers.isna() | (numbers % 1 != 0)
+            values = numbers.where(~failed, 0).astype("int64").astype(object)
+        elif kind == "decimal":
+            failed = pd.to_numeric(text, errors="coerce").isna()
+            values = text.astype("str").where(~failed, "0").map(decimal.Decimal)
+        elif kind == "date":
+            stamps = pd.to_datetime(text, format="ISO8601", errors="coerce")
+            failed = stamps.isna()
+            values = stamps.dt.date.astype(object)
+        elif kind == "time":
+            stamps = pd.to_datetime(text.astype("str"), format="mixed", errors="coerce")
+            failed = stamps.isna()
+            values = stamps.dt.time.astype(object)
+        else:
+            lowered = text.astype("str").str.lower()
+            failed = ~lowered.isin(["1", "0", "true", "false", "yes", "no"])
+            values = lowered.isin(["1", "true", "yes"]).astype(object)
+        typed[column] = values
+        failures.append((failed, f"{column} is not a valid {kind} value."))
+    return typed, _messages(df.index, failures)
+
+
+# Error messages per row of a typed DataFrame ("" for valid rows), checking every
+# rule of the table column by column
+def validate_frame(table_name, df):
+    failures = [
+        (~rule.check_series(df[rule.column]), rule.message) for rule in RULES.get(table_name, [])
+    ]
+    if table_name == "HospitalStay":
+        admit = pd.to_datetime(df["AdmitDate"], errors="coerce")
+        discharge = pd.to_datetime(df["DischargeDate"], errors="coerce")
+        failures.append((discharge < admit, DISCHARGE_MESSAGE))
+    return _messages(df.index, failures)